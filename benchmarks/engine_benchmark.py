@@ -0,0 +1,84 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from factories import FACTORIES, write_payload
+
+UTILS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "utils")
+ENGINES = ['openpyxl', 'streaming', 'xlsxwriter']
+DEFAULT_SIZES = [10000, 100000, 300000]
+SHIPMENT_GENERATORS = ["projectAnalysisChartGenerator.py", "mitraAnalysisChartGenerator.py", "mitraPerformanceChartGeneratorFormula.py"]
+SCRIPT_ARGS = {"projectAnalysisChartGenerator.py": ["formula"]}
+
+def uncached_env():
+    env = dict(os.environ, REPORT_CACHE_MAX_BYTES="0")
+    env.pop("REPORT_STAGE_CACHE_DIR", None)
+    return env
+
+def run_generator(script, input_path, output_path, engine, args=None):
+    args = SCRIPT_ARGS.get(script, []) if args is None else args
+    command = [sys.executable, script, input_path, output_path] + args + ["--engine", engine]
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=UTILS_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=uncached_env())
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    stdout = process.stdout.read().decode('utf-8')
+    process.stdout.close()
+
+    try:
+        result = json.loads(stdout.strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        result = {"success": False, "error": stdout.strip()}
+
+    return {
+        "script": script,
+        "engine": engine,
+        "success": bool(result.get("success")) and status == 0,
+        "error": result.get("error"),
+        "seconds": round(elapsed, 2),
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "output_mb": round(os.path.getsize(output_path) / (1024 * 1024), 2) if os.path.exists(output_path) else None,
+        "metrics": result.get("metrics")
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare report rendering engines on synthetic shipment data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--engines", nargs="+", default=ENGINES, choices=ENGINES)
+    parser.add_argument("--generators", nargs="+", default=SHIPMENT_GENERATORS, choices=list(FACTORIES))
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.sizes:
+            for script in args.generators:
+                input_path = os.path.join(work_dir, f"input_{size}.json")
+                write_payload(FACTORIES[script](size), input_path)
+
+                for engine in args.engines:
+                    output_path = os.path.join(work_dir, f"output_{engine}.xlsx")
+                    result = run_generator(script, input_path, output_path, engine)
+                    result["rows"] = size
+                    results.append(result)
+
+                    status = "ok" if result["success"] else f"FAILED: {result['error']}"
+                    print(f"{size:>8} {script:<42} {engine:<11} {result['seconds']:>8.2f}s "
+                          f"{result['peak_rss_mb']:>8.1f} MB  {status}", flush=True)
+
+                    if os.path.exists(output_path):
+                        os.unlink(output_path)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
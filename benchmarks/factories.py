@@ -0,0 +1,331 @@
+import json
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+MITRA_NAMES = [f"Mitra {i:03d}" for i in range(1, 241)]
+CLIENT_NAMES = ["JNE", "SiCepat", "Sayurbox", "Lazada", "Shopee", "Tokopedia", "Blibli", "AnterAja"]
+HUBS = ["Hub Jakarta Barat", "Hub Jakarta Timur", "Hub Bekasi", "Hub Tangerang", "Hub Depok", "Hub Bogor"]
+CITIES = ["Jakarta", "Bekasi", "Tangerang", "Depok", "Bogor", "Bandung", "Surabaya"]
+VEHICLES = ["Motor", "Mobil", "Van"]
+SLA_VALUES = ["Ontime", "Ontime", "Ontime", "Late"]
+PERFORMANCE_LEVELS = ["Perfect", "Excellent", "Good", "Needs Improvement"]
+MITRA_STATUSES = ["Active", "New", "Driver Training", "Registered", "Inactive", "Banned"]
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December"]
+
+class SyntheticRecords:
+    def __init__(self, build, rows, seed):
+        self.build = build
+        self.rows = rows
+        self.seed = seed
+
+    def __iter__(self):
+        return self.build(self.rows, random.Random(self.seed))
+
+    def __len__(self):
+        return self.rows
+
+def delivery_dates(rows, rng, year=2025):
+    start = date(year, 1, 1)
+    for _ in range(rows):
+        yield start + timedelta(days=rng.randint(0, 364))
+
+def _capitalized_records(rows, rng):
+    for i, day in enumerate(delivery_dates(rows, rng)):
+        yield {
+            "Mitra Name": rng.choice(MITRA_NAMES),
+            "Client Name": rng.choice(CLIENT_NAMES),
+            "Delivery Date": day.strftime("%d/%m/%Y"),
+            "Hub": rng.choice(HUBS),
+            "Drop Point": f"DP-{rng.randint(1, 400):03d}",
+            "Weekly": f"{MONTH_NAMES[day.month - 1]} W{(day.day - 1) // 7 + 1}",
+            "Order Code": f"ORD{i:08d}",
+            "Weight": str(rng.randint(1, 30)),
+            "Distance (km)": f"{rng.uniform(0.5, 45):.2f}",
+            "Cost": str(rng.randint(8, 120) * 1000),
+            "SLA": rng.choice(SLA_VALUES)
+        }
+
+def _lowercase_records(rows, rng):
+    for i, day in enumerate(delivery_dates(rows, rng)):
+        client = rng.choice(CLIENT_NAMES)
+        yield {
+            "client_name": client,
+            "project_name": client,
+            "delivery_date": day.strftime("%d/%m/%Y"),
+            "drop_point": f"DP-{rng.randint(1, 400):03d}",
+            "hub": rng.choice(HUBS),
+            "order_code": f"ORD{i:08d}",
+            "weight": str(rng.randint(1, 30)),
+            "distance_km": f"{rng.uniform(0.5, 45):.2f}",
+            "mitra_code": "MTR-001",
+            "mitra_name": MITRA_NAMES[0],
+            "receiving_date": day.strftime("%d/%m/%Y"),
+            "vehicle_type": rng.choice(VEHICLES),
+            "cost": f"Rp {rng.randint(8, 120) * 1000:,}",
+            "sla": rng.choice(SLA_VALUES),
+            "weekly": f"W{day.isocalendar()[1]}"
+        }
+
+def _location_records(rows, rng):
+    for i in range(rows):
+        total = rng.randint(20, 2000)
+        late = rng.randint(0, total // 4)
+        on_time = round((total - late) / total * 100, 2)
+        yield {
+            "Location": f"{rng.choice(CITIES)} Drop Point {i + 1:05d}",
+            "Short Name": f"DP-{i + 1:05d}",
+            "Category": rng.choice(HUBS),
+            "Total Shipments": total,
+            "Late Shipments": late,
+            "On Time Percentage": on_time,
+            "Late Percentage": round(100 - on_time, 2),
+            "Performance Level": PERFORMANCE_LEVELS[0 if late == 0 else 1 if on_time >= 95 else 2 if on_time >= 85 else 3]
+        }
+
+def _user_records(rows, rng):
+    for i in range(rows):
+        invited = rng.randint(0, 60)
+        changed_mind = rng.randint(0, 15)
+        no_response = rng.randint(0, 30)
+        eligible = rng.randint(0, 80)
+        not_eligible = rng.randint(0, 40)
+        yield {
+            "Rank": i + 1,
+            "User Name": f"User {i + 1:05d}",
+            "Total Tasks": eligible + not_eligible + invited,
+            "Eligible": eligible,
+            "Not Eligible": not_eligible,
+            "Invited": invited,
+            "Changed Mind": changed_mind,
+            "No Response": no_response,
+            "Projects": ", ".join(rng.sample(CLIENT_NAMES, rng.randint(1, 3))),
+            "Cities": ", ".join(rng.sample(CITIES, rng.randint(1, 2)))
+        }
+
+def _mitra_records(rows, rng):
+    for i in range(rows):
+        deliveries = rng.randint(10, 3000)
+        distance = round(deliveries * rng.uniform(3, 18), 2)
+        cost = deliveries * rng.randint(8, 60) * 1000
+        yield {
+            "name": f"Mitra {i + 1:05d}",
+            "totalDeliveries": deliveries,
+            "onTimeRate": round(rng.uniform(0.6, 1), 4),
+            "totalCost": cost,
+            "avgCost": round(cost / deliveries, 2),
+            "totalDistance": distance,
+            "avgDistance": round(distance / deliveries, 2),
+            "costPerKm": round(cost / distance, 2),
+            "hubs": rng.sample(CITIES, rng.randint(1, 3))
+        }
+
+def _status_counts(rng):
+    return {status: rng.randint(0, 40) for status in MITRA_STATUSES}
+
+def _period_records(rows, rng, weekly):
+    for i in range(rows):
+        year = 2020 + i // (48 if weekly else 12)
+        month = MONTH_NAMES[(i // 4 if weekly else i) % 12]
+        counts = _status_counts(rng)
+        active = rng.randint(50, 900)
+        inactive = rng.randint(0, active // 5)
+        previous = active + rng.randint(-40, 40)
+        record = {
+            "month": month,
+            "year": str(year),
+            "statusCounts": counts,
+            "total": sum(counts.values()),
+            "gettingValue": max(0, previous - inactive + counts["Active"]),
+            "retentionRate": round((active - counts["Active"]) / previous * 100, 2) if previous > 0 else None,
+            "churnRate": round(inactive / previous * 100, 2) if previous > 0 and inactive else None
+        }
+        if weekly:
+            record.update({"week": f"W{i % 4 + 1}", "activeCount": active, "inactiveCount": inactive})
+        else:
+            record.update({"riderActiveCount": active, "riderInactiveCount": inactive})
+        yield record
+
+def _weekly_records(rows, rng):
+    return _period_records(rows, rng, True)
+
+def _monthly_records(rows, rng):
+    return _period_records(rows, rng, False)
+
+def capitalized_shipments(rows, seed=42):
+    return SyntheticRecords(_capitalized_records, rows, seed)
+
+def lowercase_shipments(rows, seed=42):
+    return SyntheticRecords(_lowercase_records, rows, seed)
+
+def shipment_groups(shipments):
+    groups = {"project": set(), "mitra": set(), "hub": Counter(), "mitra_total": Counter()}
+    for record in shipments:
+        year = int(record["Delivery Date"][-4:])
+        groups["project"].add((record["Client Name"], record["Hub"], year))
+        groups["mitra"].add((record["Mitra Name"], record["Client Name"], record["Hub"], year))
+        groups["hub"][record["Hub"]] += 1
+        groups["mitra_total"][record["Mitra Name"]] += 1
+    return groups
+
+def project_analysis_payload(rows, period_type='monthly', seed=42):
+    shipments = capitalized_shipments(rows, seed)
+    groups = shipment_groups(shipments)
+
+    return {
+        "periodType": period_type,
+        "shipmentData": shipments,
+        "metadata": {"Project": "All", "Hub": "All", "Year": 2025},
+        "projectAnalysis": [{"Project": project, "Hub": hub, "Year": year} for project, hub, year in sorted(groups["project"])]
+    }
+
+def mitra_analysis_payload(rows, period_type='monthly', seed=42):
+    shipments = capitalized_shipments(rows, seed)
+    groups = shipment_groups(shipments)
+
+    return {
+        "periodType": period_type,
+        "shipmentData": shipments,
+        "metadata": {},
+        "mitraAnalysis": [{"Mitra Name": name, "Client": client, "Hub": hub, "Year": year} for name, client, hub, year in sorted(groups["mitra"])],
+        "hubAnalysis": [{"Hub": hub, "Total Deliveries": count} for hub, count in groups["hub"].most_common()],
+        "mitraSummary": [{"Mitra Name": name, "Total Deliveries": count} for name, count in groups["mitra_total"].most_common()]
+    }
+
+def mitra_performance_payload(rows, period_type='monthly', seed=42):
+    return {
+        "periodType": period_type,
+        "shipmentData": lowercase_shipments(rows, seed),
+        "profile": {"name": MITRA_NAMES[0], "code": "MTR-001"},
+        "metrics": {},
+        "trends": [{"month": name[:3], "deliveries": 100 + i} for i, name in enumerate(MONTH_NAMES)],
+        "dataQuality": {"hasValidTrends": True, "trendCount": 12},
+        "appliedFilters": {}
+    }
+
+def chart_payload(rows, period_type='monthly', seed=42):
+    locations = list(SyntheticRecords(_location_records, rows, seed))
+    total = sum(item["Total Shipments"] for item in locations)
+    late = sum(item["Late Shipments"] for item in locations)
+    by_rate = sorted(locations, key=lambda item: item["On Time Percentage"], reverse=True)
+    by_volume = sorted(locations, key=lambda item: item["Total Shipments"], reverse=True)
+
+    def insight(category, item):
+        return {
+            "Category": category,
+            "Location": item["Location"],
+            "Short Name": item["Short Name"],
+            "Value": item["Total Shipments"],
+            "Percentage": item["On Time Percentage"],
+            "Performance Level": item["Performance Level"]
+        }
+
+    return {
+        "summaryData": [
+            {"Metric": "Total Shipments", "Value": f"{total:,}", "Unit": "shipments", "Category": "Volume", "Description": "Shipments delivered in the period"},
+            {"Metric": "Late Shipments", "Value": f"{late:,}", "Unit": "shipments", "Category": "Volume", "Description": "Shipments delivered after the SLA"},
+            {"Metric": "On Time Rate", "Value": f"{(total - late) / max(total, 1) * 100:.2f}%", "Unit": "percentage", "Category": "Quality", "Description": "Share of shipments delivered on time"},
+            {"Metric": "Locations", "Value": str(len(locations)), "Unit": "locations", "Category": "Coverage", "Description": "Drop points with deliveries"}
+        ],
+        "performanceData": locations,
+        "insightsData": [insight("Top Performer", item) for item in by_rate[:10]]
+                        + [insight("Priority Area", item) for item in by_rate[-10:]]
+                        + [insight("Volume Leader", item) for item in by_volume[:10]]
+    }
+
+def task_analytics_payload(rows, period_type='monthly', seed=42):
+    users = list(SyntheticRecords(_user_records, rows, seed))
+    total_tasks = sum(user["Total Tasks"] for user in users)
+
+    def rate(user):
+        return user["Eligible"] / user["Total Tasks"] if user["Total Tasks"] else 0
+
+    def insight(category, index, issues='-'):
+        user = users[index]
+        return {
+            "Category": category,
+            "User": user["User Name"],
+            "Total Tasks": user["Total Tasks"],
+            "Eligible": user["Eligible"],
+            "Rank": user["Rank"],
+            "OriginalIndex": index,
+            "Issues": issues
+        }
+
+    ranked = sorted(range(len(users)), key=lambda index: rate(users[index]), reverse=True)
+    return {
+        "performanceData": users,
+        "summaryData": [
+            {"Metric": "Total Tasks", "Value": total_tasks, "Unit": "tasks", "Description": "Total number of tasks processed in the selected period"},
+            {"Metric": "Total Eligible", "Value": sum(user["Eligible"] for user in users), "Unit": "tasks", "Description": "Number of tasks successfully qualified as Eligible"},
+            {"Metric": "Total Not Eligible", "Value": sum(user["Not Eligible"] for user in users), "Unit": "tasks", "Description": "Number of tasks that did not meet eligibility criteria"},
+            {"Metric": "Average Tasks per User", "Value": round(total_tasks / max(len(users), 1)), "Unit": "tasks", "Description": "Average workload distribution across all users"},
+            {"Metric": "Active Users", "Value": len(users), "Unit": "users", "Description": "Number of users who processed tasks in this period"},
+            {"Metric": "Total Invited", "Value": sum(user["Invited"] for user in users), "Unit": "tasks", "Description": "Number of tasks with Invited status"},
+            {"Metric": "Total Changed Mind", "Value": sum(user["Changed Mind"] for user in users), "Unit": "tasks", "Description": "Number of tasks with Changed Mind status"},
+            {"Metric": "Total No Response", "Value": sum(user["No Response"] for user in users), "Unit": "tasks", "Description": "Number of tasks with No Response status"}
+        ],
+        "insightsData": [insight("Top Performer", index) for index in ranked[:10] if rate(users[index]) >= 0.7]
+                        + [insight("Priority Area", index, "Low success rate requires immediate coaching and process review") for index in ranked if rate(users[index]) < 0.5][:50]
+                        + [insight("Volume Leader", index) for index in range(min(10, len(users)))],
+        "dateRange": {"start": "1/1/2025", "end": "31/12/2025"}
+    }
+
+def all_mitra_performance_payload(rows, period_type='monthly', seed=42):
+    return {
+        "periodType": period_type,
+        "mitras": SyntheticRecords(_mitra_records, rows, seed)
+    }
+
+def mitra_status_payload(rows, period_type='monthly', seed=42):
+    rng = random.Random(seed)
+    counts = _status_counts(rng)
+    total = sum(counts.values())
+
+    return {
+        "summary": {"totalMitras": total, "trainingCount": counts["Driver Training"], "pendingCount": counts["Registered"]},
+        "riderMetrics": {
+            "currentActiveRiders": rng.randint(500, 900),
+            "currentInactiveRiders": rng.randint(50, 200),
+            "currentWeekActiveRiders": rng.randint(300, 700),
+            "currentWeekInactiveRiders": rng.randint(20, 100),
+            "month": "December",
+            "year": "2025",
+            "week": "W4"
+        },
+        "statusDistribution": [{"status": status, "count": count, "percentage": round(count / max(total, 1) * 100, 2)} for status, count in counts.items()],
+        "monthlyData": SyntheticRecords(_monthly_records, max(1, rows // 4), seed),
+        "weeklyData": SyntheticRecords(_weekly_records, rows, seed),
+        "appliedFilters": {}
+    }
+
+def materialize(payload):
+    return {key: list(value) if isinstance(value, SyntheticRecords) else value for key, value in payload.items()}
+
+def write_payload(payload, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{')
+        for index, (key, value) in enumerate(payload.items()):
+            f.write(', ' if index else '')
+            f.write(json.dumps(key) + ': ')
+
+            if isinstance(value, SyntheticRecords):
+                f.write('[')
+                for position, record in enumerate(value):
+                    f.write(', ' if position else '')
+                    f.write(json.dumps(record))
+                f.write(']')
+            else:
+                json.dump(value, f)
+        f.write('}')
+
+FACTORIES = {
+    "projectAnalysisChartGenerator.py": project_analysis_payload,
+    "mitraAnalysisChartGenerator.py": mitra_analysis_payload,
+    "mitraPerformanceChartGeneratorFormula.py": mitra_performance_payload,
+    "chart_generator.py": chart_payload,
+    "taskAnalyticsChartGenerator.py": task_analytics_payload,
+    "allMitraPerformanceChartGenerator.py": all_mitra_performance_payload,
+    "mitraStatusDashboardExporter.py": mitra_status_payload
+}
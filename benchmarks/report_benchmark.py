@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from factories import FACTORIES, write_payload
+from engine_benchmark import ENGINES, UTILS_DIR, run_generator
+
+DEFAULT_SIZES = [1000, 10000, 100000, 500000]
+VARIANTS = {
+    "projectAnalysisChartGenerator.py": [["static"], ["formula"]],
+    "mitraAnalysisChartGenerator.py": [["pivot"], ["countifs"]],
+    "mitraPerformanceChartGeneratorFormula.py": [["formula"], ["static"]]
+}
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.15
+MIN_TIME_DELTA = 0.5
+MIN_MEMORY_DELTA = 20
+
+def result_key(result):
+    return result["script"], result["variant"], result["engine"], result["rows"]
+
+def environment_info():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=UTILS_DIR, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+
+def benchmark(script, variant, size, engine, input_path, work_dir, repeat):
+    runs = []
+    for _ in range(repeat):
+        output_path = os.path.join(work_dir, "output.xlsx")
+        runs.append(run_generator(script, input_path, output_path, engine, variant))
+        if os.path.exists(output_path):
+            os.unlink(output_path)
+
+    result = dict(min(runs, key=lambda run: run["seconds"]))
+    result.update({
+        "variant": " ".join(variant) or "default",
+        "rows": size,
+        "success": all(run["success"] for run in runs),
+        "peak_rss_mb": max(run["peak_rss_mb"] for run in runs),
+        "input_mb": round(os.path.getsize(input_path) / (1024 * 1024), 2),
+        "runs": [run["seconds"] for run in runs]
+    })
+    return result
+
+def find_regressions(results, baseline, time_tolerance, memory_tolerance):
+    previous = {result_key(result): result for result in baseline}
+    regressions = []
+
+    for result in results:
+        base = previous.get(result_key(result))
+        if base is None:
+            continue
+
+        if base["success"] and not result["success"]:
+            regressions.append({"key": result_key(result), "metric": "success", "baseline": True, "current": False})
+            continue
+
+        checks = [
+            ("seconds", time_tolerance, MIN_TIME_DELTA),
+            ("peak_rss_mb", memory_tolerance, MIN_MEMORY_DELTA)
+        ]
+        for metric, tolerance, min_delta in checks:
+            current, reference = result.get(metric), base.get(metric)
+            if current is None or reference is None:
+                continue
+
+            if current > reference * (1 + tolerance) and current - reference > min_delta:
+                regressions.append({
+                    "key": result_key(result),
+                    "metric": metric,
+                    "baseline": reference,
+                    "current": current,
+                    "change": round(current / reference - 1, 3) if reference else None
+                })
+
+    return regressions
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+
+    return document["results"] if isinstance(document, dict) else document
+
+def main():
+    parser = argparse.ArgumentParser(description="Time and memory-profile every report generator on synthetic payloads")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--generators", nargs="+", default=list(FACTORIES), choices=list(FACTORIES))
+    parser.add_argument("--engines", nargs="+", default=[ENGINES[0]], choices=ENGINES)
+    parser.add_argument("--period", default="monthly", choices=["monthly", "weekly"])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against results stored at this path and exit non-zero on regressions")
+    parser.add_argument("--save-baseline", help="Store these results as the baseline at this path")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.sizes:
+            for script in args.generators:
+                input_path = os.path.join(work_dir, "input.json")
+                write_payload(FACTORIES[script](size, args.period), input_path)
+
+                for variant in VARIANTS.get(script, [[]]):
+                    for engine in args.engines:
+                        result = benchmark(script, variant, size, engine, input_path, work_dir, args.repeat)
+                        results.append(result)
+
+                        status = "ok" if result["success"] else f"FAILED: {result['error']}"
+                        print(f"{size:>8} {script:<42} {result['variant']:<9} {engine:<11} {result['seconds']:>8.2f}s "
+                              f"{result['peak_rss_mb']:>8.1f} MB  {status}", flush=True)
+
+    document = {"environment": environment_info(), "period": args.period, "results": results}
+
+    regressions = []
+    if args.baseline:
+        regressions = find_regressions(results, load_results(args.baseline), args.time_tolerance, args.memory_tolerance)
+        document["baseline"] = args.baseline
+        document["regressions"] = regressions
+
+        for regression in regressions:
+            script, variant, engine, rows = regression["key"]
+            print(f"REGRESSION {rows:>8} {script:<42} {variant:<9} {engine:<11} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']}", flush=True)
+        print(f"{len(regressions)} regression(s) against {args.baseline}", flush=True)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(document, f, indent=2)
+
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
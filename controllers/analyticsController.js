@@ -1,8 +1,8 @@
 const TaskManagementData = require("../models/TaskManagementData");
 const XLSX = require('xlsx');
-const { spawn } = require("child_process");
 const path = require("path");
 const fs = require("fs").promises;
+const reportWorkerService = require("../services/reportWorkerService");
 
 const TEMP_DIR = path.join(__dirname, "..", "temp");
 const PYTHON_SCRIPT = path.join(__dirname, "..", "utils", "taskAnalyticsChartGenerator.py");
@@ -30,52 +30,7 @@ const cleanupFile = async (filePath) => {
 };
 
 const executePythonScript = (inputPath, outputPath) => {
-  return new Promise((resolve, reject) => {
-    const pythonCommand = process.platform === 'win32' ? 'python' : 'python3';
-    const pythonProcess = spawn(pythonCommand, [PYTHON_SCRIPT, inputPath, outputPath], {
-      stdio: ["pipe", "pipe", "pipe"],
-      cwd: path.dirname(PYTHON_SCRIPT)
-    });
-
-    let stdout = "";
-    let stderr = "";
-
-    pythonProcess.stdout.on("data", (data) => {
-      stdout += data.toString();
-    });
-
-    pythonProcess.stderr.on("data", (data) => {
-      stderr += data.toString();
-    });
-
-    pythonProcess.on("close", (code) => {
-      console.log(`Python process exited with code: ${code}`);
-      console.log(`Python stdout: ${stdout}`);
-      console.log(`Python stderr: ${stderr}`);
-
-      if (code === 0) {
-        try {
-          const result = JSON.parse(stdout.trim());
-          resolve(result);
-        } catch (parseError) {
-          console.error('Failed to parse Python output:', parseError);
-          reject(new Error(`Failed to parse Python output: ${parseError.message}`));
-        }
-      } else {
-        reject(new Error(`Python script failed with code ${code}: ${stderr || 'Unknown error'}`));
-      }
-    });
-
-    pythonProcess.on("error", (error) => {
-      console.error('Python process error:', error);
-      reject(new Error(`Failed to start Python process: ${error.message}`));
-    });
-
-    setTimeout(() => {
-      pythonProcess.kill("SIGTERM");
-      reject(new Error("Python script timeout"));
-    }, 120000);
-  });
+  return reportWorkerService.execute(PYTHON_SCRIPT, inputPath, outputPath, [], 120000);
 };
 
 const getPerformanceAnalytics = async (req, res) => {
@@ -28,6 +28,7 @@ const blitzLoginRoutes = require("./routes/blitzLoginRoutes.js");
 const rideExperienceRoutes = require("./routes/rideExperienceRoutes.js");
 const errorHandler = require("./middleware/errorHandler");
 const { initializeLarkTokens } = require("./services/larkTokenService");
+const reportWorkerService = require("./services/reportWorkerService");
 
 const app = express();
 const port = process.env.PORT || 5000;
@@ -189,6 +190,8 @@ const startServer = async () => {
     await connectDB();
     console.log("✅ Database connected successfully");
 
+    reportWorkerService.warmUp();
+
     setTimeout(async () => {
       try {
         await initializeLarkTokens();
@@ -1,7 +1,9 @@
 const express = require("express");
-const { spawn } = require("child_process");
 const path = require("path");
 const fs = require("fs").promises;
+const { createReadStream } = require("fs");
+const { pipeline } = require("stream/promises");
+const reportWorkerService = require("../services/reportWorkerService");
 const router = express.Router();
 
 const TEMP_DIR = path.join(__dirname, "..", "temp");
@@ -31,55 +33,70 @@ const cleanupFile = async (filePath) => {
   }
 };
 
-const executePythonScript = (scriptPath, inputPath, outputPath, mode = null) => {
-  return new Promise((resolve, reject) => {
-    const pythonCommand = process.platform === 'win32' ? 'python' : 'python3';
-    const args = mode ? [scriptPath, inputPath, outputPath, mode] : [scriptPath, inputPath, outputPath];
-    
-    const pythonProcess = spawn(pythonCommand, args, {
-      stdio: ["pipe", "pipe", "pipe"],
-      cwd: path.dirname(scriptPath)
-    });
+const XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet';
 
-    let stdout = "";
-    let stderr = "";
+const sanitizeRawData = (rawData) => {
+  if (!rawData || typeof rawData !== 'object') {
+    return undefined;
+  }
 
-    pythonProcess.stdout.on("data", (data) => {
-      stdout += data.toString();
-    });
+  const { mode, maxRows, format } = rawData;
+  return { mode, maxRows, format, bundle: mode === 'external' };
+};
 
-    pythonProcess.stderr.on("data", (data) => {
-      stderr += data.toString();
-    });
+const sendReportFile = async (res, result, outputPath, fileName) => {
+  const bundlePath = result.raw_data?.bundle_path;
+  const filePath = bundlePath || outputPath;
+  const { size } = await fs.stat(filePath);
 
-    pythonProcess.on("close", (code) => {
-      console.log(`Python process exited with code: ${code}`);
-      console.log(`Python stdout: ${stdout}`);
-      console.log(`Python stderr: ${stderr}`);
-
-      if (code === 0) {
-        try {
-          const result = JSON.parse(stdout.trim());
-          resolve(result);
-        } catch (parseError) {
-          console.error('Failed to parse Python output:', parseError);
-          reject(new Error(`Failed to parse Python output: ${parseError.message}`));
-        }
-      } else {
-        reject(new Error(`Python script failed with code ${code}: ${stderr || 'Unknown error'}`));
-      }
-    });
+  res.setHeader('Content-Type', bundlePath ? 'application/zip' : XLSX_CONTENT_TYPE);
+  res.setHeader('Content-Disposition', `attachment; filename="${bundlePath ? fileName.replace(/\.xlsx$/, '.zip') : fileName}"`);
+  res.setHeader('Content-Length', size);
 
-    pythonProcess.on("error", (error) => {
-      console.error('Python process error:', error);
-      reject(new Error(`Failed to start Python process: ${error.message}`));
-    });
+  try {
+    await pipeline(createReadStream(filePath), res);
+  } catch (error) {
+    console.warn(`Failed to stream report file ${filePath}:`, error.message);
+    res.destroy(error);
+  }
+};
 
-    setTimeout(() => {
-      pythonProcess.kill("SIGTERM");
-      reject(new Error("Python script timeout"));
-    }, 180000);
-  });
+const cleanupOptionalFile = async (filePath) => {
+  try {
+    await fs.unlink(filePath);
+  } catch (error) {
+    if (error.code !== 'ENOENT') {
+      console.warn(`Failed to cleanup file ${filePath}:`, error.message);
+    }
+  }
+};
+
+const RAW_DATA_FORMATS = ['csv.gz', 'csv', 'parquet'];
+
+const reportSidecarPaths = (outputPath) => {
+  const base = outputPath.slice(0, outputPath.length - path.extname(outputPath).length);
+  return [
+    ...RAW_DATA_FORMATS.map((format) => `${base}-raw.${format}`),
+    `${base}-manifest.json`,
+    `${base}.zip`
+  ];
+};
+
+const cleanupReportFiles = (outputPath, result) => {
+  const rawData = result?.raw_data || {};
+  const sidecars = new Set([...reportSidecarPaths(outputPath), rawData.path, rawData.manifest_path, rawData.bundle_path]);
+  sidecars.delete(undefined);
+
+  setTimeout(() => {
+    cleanupFile(outputPath);
+    for (const filePath of sidecars) {
+      cleanupOptionalFile(filePath);
+    }
+  }, 5000);
+};
+
+const executePythonScript = (scriptPath, inputPath, outputPath, mode = null) => {
+  return reportWorkerService.execute(scriptPath, inputPath, outputPath, mode ? [mode] : [], 180000);
 };
 
 const validateDashboardData = (data) => {
@@ -370,12 +387,13 @@ router.post('/generate-mitra-performance', handleAsyncErrors(generateMitraPerfor
 router.post('/generate-mitra-performance-formula', handleAsyncErrors(async (req, res) => {
   let inputPath = null;
   let outputPath = null;
+  let result = null;
 
   try {
     console.log('Starting mitra performance chart generation with formulas...');
     await ensureTempDir();
 
-    const chartData = req.body;
+    const chartData = { ...req.body, rawData: sanitizeRawData(req.body?.rawData) };
 
     if (!chartData || !chartData.profile || !chartData.metrics) {
       return res.status(400).json({
@@ -423,7 +441,7 @@ router.post('/generate-mitra-performance-formula', handleAsyncErrors(async (req,
     const PYTHON_SCRIPT_FORMULA = path.join(__dirname, "..", "utils", "mitraPerformanceChartGeneratorFormula.py");
     
     console.log('Executing Python script for formula generation...');
-    const result = await executePythonScript(PYTHON_SCRIPT_FORMULA, inputPath, outputPath);
+    result = await executePythonScript(PYTHON_SCRIPT_FORMULA, inputPath, outputPath);
 
     if (!result.success) {
       throw new Error(result.error || "Chart generation failed");
@@ -435,8 +453,6 @@ router.post('/generate-mitra-performance-formula', handleAsyncErrors(async (req,
       throw new Error("Output file was not created");
     }
 
-    const fileBuffer = await fs.readFile(outputPath);
-    
     let fileName = `Mitra_Performance_Formula_${chartData.profile.name}_${new Date().toISOString().slice(0, 19).replace(/:/g, '-')}`;
     if (!hasValidTrends) {
       fileName += '_LIMITED';
@@ -444,11 +460,7 @@ router.post('/generate-mitra-performance-formula', handleAsyncErrors(async (req,
     fileName += '.xlsx';
 
     console.log('Sending file to client...');
-    res.setHeader('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet');
-    res.setHeader('Content-Disposition', `attachment; filename="${fileName}"`);
-    res.setHeader('Content-Length', fileBuffer.length);
-
-    res.send(fileBuffer);
+    await sendReportFile(res, result, outputPath, fileName);
 
   } catch (error) {
     console.error("Generate mitra performance chart with formulas error:", error);
@@ -463,7 +475,7 @@ router.post('/generate-mitra-performance-formula', handleAsyncErrors(async (req,
       setTimeout(() => cleanupFile(inputPath), 1000);
     }
     if (outputPath) {
-      setTimeout(() => cleanupFile(outputPath), 5000);
+      cleanupReportFiles(outputPath, result);
     }
   }
 }));
@@ -566,6 +578,7 @@ router.post('/generate-mitra-performance-quick', handleAsyncErrors(async (req, r
 router.post('/generate-mitra-analysis', handleAsyncErrors(async (req, res) => {
   let inputPath = null;
   let outputPath = null;
+  let result = null;
 
   try {
     console.log('Starting mitra analysis complete export...');
@@ -596,6 +609,7 @@ router.post('/generate-mitra-analysis', handleAsyncErrors(async (req, res) => {
       insightsOperational: exportData.insightsOperational || [],
       periodType: periodType,
       appliedFilters: exportData.appliedFilters || {},
+      rawData: sanitizeRawData(exportData.rawData),
       generatedAt: new Date().toISOString()
     };
 
@@ -614,7 +628,7 @@ router.post('/generate-mitra-analysis', handleAsyncErrors(async (req, res) => {
     console.log('Python script exists:', await fs.access(PYTHON_SCRIPT_MITRA_ANALYSIS).then(() => true).catch(() => false));
     
     console.log('Executing Python script for complete analysis generation...');
-    const result = await executePythonScript(PYTHON_SCRIPT_MITRA_ANALYSIS, inputPath, outputPath);
+    result = await executePythonScript(PYTHON_SCRIPT_MITRA_ANALYSIS, inputPath, outputPath);
 
     if (!result.success) {
       throw new Error(result.error || "Complete analysis generation failed");
@@ -626,16 +640,10 @@ router.post('/generate-mitra-analysis', handleAsyncErrors(async (req, res) => {
       throw new Error("Output file was not created");
     }
 
-    const fileBuffer = await fs.readFile(outputPath);
-    
     const fileName = `Mitra_Analysis_Complete_${periodType}_${new Date().toISOString().slice(0, 19).replace(/:/g, '-')}.xlsx`;
 
     console.log('✓ Sending complete analysis file to client...');
-    res.setHeader('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet');
-    res.setHeader('Content-Disposition', `attachment; filename="${fileName}"`);
-    res.setHeader('Content-Length', fileBuffer.length);
-
-    res.send(fileBuffer);
+    await sendReportFile(res, result, outputPath, fileName);
 
   } catch (error) {
     console.error("Generate complete mitra analysis error:", error);
@@ -650,7 +658,7 @@ router.post('/generate-mitra-analysis', handleAsyncErrors(async (req, res) => {
       setTimeout(() => cleanupFile(inputPath), 1000);
     }
     if (outputPath) {
-      setTimeout(() => cleanupFile(outputPath), 5000);
+      cleanupReportFiles(outputPath, result);
     }
   }
 }));
@@ -658,6 +666,7 @@ router.post('/generate-mitra-analysis', handleAsyncErrors(async (req, res) => {
 router.post('/generate-project-analysis', handleAsyncErrors(async (req, res) => {
   let inputPath = null;
   let outputPath = null;
+  let result = null;
 
   try {
     console.log('Starting project analysis export (STATIC MODE)...');
@@ -687,6 +696,7 @@ router.post('/generate-project-analysis', handleAsyncErrors(async (req, res) =>
       insightsOperational: exportData.insightsOperational || [],
       periodType: periodType,
       appliedFilters: exportData.appliedFilters || {},
+      rawData: sanitizeRawData(exportData.rawData),
       generatedAt: new Date().toISOString()
     };
 
@@ -705,7 +715,7 @@ router.post('/generate-project-analysis', handleAsyncErrors(async (req, res) =>
     console.log('Python script exists:', await fs.access(PYTHON_SCRIPT_PROJECT_ANALYSIS).then(() => true).catch(() => false));
     
     console.log('Executing Python script (STATIC MODE)...');
-    const result = await executePythonScript(PYTHON_SCRIPT_PROJECT_ANALYSIS, inputPath, outputPath, 'static');
+    result = await executePythonScript(PYTHON_SCRIPT_PROJECT_ANALYSIS, inputPath, outputPath, 'static');
 
     if (!result.success) {
       throw new Error(result.error || "Static project analysis generation failed");
@@ -717,16 +727,10 @@ router.post('/generate-project-analysis', handleAsyncErrors(async (req, res) =>
       throw new Error("Output file was not created");
     }
 
-    const fileBuffer = await fs.readFile(outputPath);
-    
     const fileName = `Project_Analysis_Static_${periodType}_${new Date().toISOString().slice(0, 19).replace(/:/g, '-')}.xlsx`;
 
     console.log('✓ Sending static project analysis file to client...');
-    res.setHeader('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet');
-    res.setHeader('Content-Disposition', `attachment; filename="${fileName}"`);
-    res.setHeader('Content-Length', fileBuffer.length);
-
-    res.send(fileBuffer);
+    await sendReportFile(res, result, outputPath, fileName);
 
   } catch (error) {
     console.error("Generate static project analysis error:", error);
@@ -741,7 +745,7 @@ router.post('/generate-project-analysis', handleAsyncErrors(async (req, res) =>
       setTimeout(() => cleanupFile(inputPath), 1000);
     }
     if (outputPath) {
-      setTimeout(() => cleanupFile(outputPath), 5000);
+      cleanupReportFiles(outputPath, result);
     }
   }
 }));
@@ -749,6 +753,7 @@ router.post('/generate-project-analysis', handleAsyncErrors(async (req, res) =>
 router.post('/generate-project-analysis-formula', handleAsyncErrors(async (req, res) => {
   let inputPath = null;
   let outputPath = null;
+  let result = null;
 
   try {
     console.log('Starting project analysis export (FORMULA MODE)...');
@@ -778,6 +783,7 @@ router.post('/generate-project-analysis-formula', handleAsyncErrors(async (req,
       insightsOperational: exportData.insightsOperational || [],
       periodType: periodType,
       appliedFilters: exportData.appliedFilters || {},
+      rawData: sanitizeRawData(exportData.rawData),
       generatedAt: new Date().toISOString()
     };
 
@@ -796,7 +802,7 @@ router.post('/generate-project-analysis-formula', handleAsyncErrors(async (req,
     console.log('Python script exists:', await fs.access(PYTHON_SCRIPT_PROJECT_ANALYSIS).then(() => true).catch(() => false));
     
     console.log('Executing Python script (FORMULA MODE)...');
-    const result = await executePythonScript(PYTHON_SCRIPT_PROJECT_ANALYSIS, inputPath, outputPath, 'formula');
+    result = await executePythonScript(PYTHON_SCRIPT_PROJECT_ANALYSIS, inputPath, outputPath, 'formula');
 
     if (!result.success) {
       throw new Error(result.error || "Formula-based project analysis generation failed");
@@ -808,16 +814,10 @@ router.post('/generate-project-analysis-formula', handleAsyncErrors(async (req,
       throw new Error("Output file was not created");
     }
 
-    const fileBuffer = await fs.readFile(outputPath);
-    
     const fileName = `Project_Analysis_Formula_${periodType}_${new Date().toISOString().slice(0, 19).replace(/:/g, '-')}.xlsx`;
 
     console.log('✓ Sending formula-based project analysis file to client...');
-    res.setHeader('Content-Type', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet');
-    res.setHeader('Content-Disposition', `attachment; filename="${fileName}"`);
-    res.setHeader('Content-Length', fileBuffer.length);
-
-    res.send(fileBuffer);
+    await sendReportFile(res, result, outputPath, fileName);
 
   } catch (error) {
     console.error("Generate formula-based project analysis error:", error);
@@ -832,7 +832,7 @@ router.post('/generate-project-analysis-formula', handleAsyncErrors(async (req,
       setTimeout(() => cleanupFile(inputPath), 1000);
     }
     if (outputPath) {
-      setTimeout(() => cleanupFile(outputPath), 5000);
+      cleanupReportFiles(outputPath, result);
     }
   }
 }));
@@ -0,0 +1,270 @@
+const { spawn } = require("child_process");
+const path = require("path");
+const readline = require("readline");
+
+const UTILS_DIR = path.join(__dirname, "..", "utils");
+const WORKER_SCRIPT = path.join(UTILS_DIR, "reportWorker.py");
+
+const WORKER_GENERATORS = new Set([
+  "chart_generator.py",
+  "taskAnalyticsChartGenerator.py",
+  "mitraPerformanceChartGeneratorFormula.py",
+  "mitraAnalysisChartGenerator.py",
+  "projectAnalysisChartGenerator.py",
+  "allMitraPerformanceChartGenerator.py",
+  "mitraStatusDashboardExporter.py"
+]);
+
+const getPythonCommand = () => (process.platform === 'win32' ? 'python' : 'python3');
+
+class ReportWorkerService {
+  constructor() {
+    this.enabled = process.env.REPORT_WORKER_ENABLED !== 'false';
+    this.poolSize = Math.max(1, parseInt(process.env.REPORT_WORKER_POOL_SIZE || '2', 10));
+    this.maxJobsPerWorker = Math.max(0, parseInt(process.env.REPORT_WORKER_MAX_JOBS || '50', 10));
+    this.workers = [];
+    this.queue = [];
+    this.jobCounter = 0;
+  }
+
+  warmUp() {
+    if (!this.enabled) {
+      return;
+    }
+
+    while (this.workers.length < this.poolSize) {
+      this.startWorker();
+    }
+  }
+
+  startWorker() {
+    const args = [WORKER_SCRIPT];
+    if (this.maxJobsPerWorker > 0) {
+      args.push('--max-jobs', String(this.maxJobsPerWorker));
+    }
+
+    const child = spawn(getPythonCommand(), args, {
+      stdio: ["pipe", "pipe", "pipe"],
+      cwd: UTILS_DIR
+    });
+
+    const worker = { process: child, ready: false, job: null, jobs: 0, stderr: "" };
+    this.workers.push(worker);
+
+    readline.createInterface({ input: child.stdout }).on("line", (line) => {
+      this.handleWorkerLine(worker, line);
+    });
+
+    child.stderr.on("data", (data) => {
+      worker.stderr += data.toString();
+    });
+
+    child.on("exit", (code, signal) => {
+      this.handleWorkerExit(worker, code, signal);
+    });
+
+    child.on("error", (error) => {
+      console.error('❌ Report worker process error:', error.message);
+    });
+
+    return worker;
+  }
+
+  handleWorkerLine(worker, line) {
+    let message;
+    try {
+      message = JSON.parse(line);
+    } catch (parseError) {
+      console.warn(`⚠️ Report worker emitted non-JSON output: ${line}`);
+      return;
+    }
+
+    if (message.ready) {
+      worker.ready = true;
+      console.log(`✅ Report worker ${worker.process.pid} ready`);
+      this.dispatch();
+      return;
+    }
+
+    const job = worker.job;
+    if (!job || message.id !== job.id) {
+      return;
+    }
+
+    if (worker.stderr) {
+      console.log(`Python stderr: ${worker.stderr}`);
+    }
+
+    worker.job = null;
+    worker.stderr = "";
+    this.settleJob(job, message.result);
+
+    if (this.exhausted(worker)) {
+      this.workers = this.workers.filter((w) => w !== worker);
+      this.warmUp();
+    }
+    this.dispatch();
+  }
+
+  exhausted(worker) {
+    return this.maxJobsPerWorker > 0 && worker.jobs >= this.maxJobsPerWorker;
+  }
+
+  handleWorkerExit(worker, code, signal) {
+    this.workers = this.workers.filter((w) => w !== worker);
+
+    if (worker.job) {
+      const job = worker.job;
+      worker.job = null;
+      job.worker = null;
+
+      if (code === 0 && !signal) {
+        this.queue.unshift(job);
+      } else {
+        this.failJob(job, new Error(`Report worker exited with code ${code}${signal ? ` (${signal})` : ''}: ${worker.stderr || 'Unknown error'}`));
+      }
+    }
+
+    if (this.queue.length > 0) {
+      this.warmUp();
+      this.dispatch();
+    }
+  }
+
+  dispatch() {
+    for (const worker of this.workers) {
+      if (this.queue.length === 0) {
+        break;
+      }
+
+      if (worker.ready && !worker.job && !this.exhausted(worker) && worker.process.exitCode === null) {
+        this.runJob(worker, this.queue.shift());
+      }
+    }
+  }
+
+  runJob(worker, job) {
+    worker.job = job;
+    worker.jobs += 1;
+    job.worker = worker;
+
+    worker.process.stdin.write(JSON.stringify({
+      id: job.id,
+      generator: path.basename(job.scriptPath),
+      input_path: job.inputPath,
+      output_path: job.outputPath,
+      args: job.args
+    }) + "\n");
+  }
+
+  settleJob(job, result) {
+    clearTimeout(job.timer);
+
+    if (result && result.success) {
+      job.resolve(result);
+    } else {
+      job.reject(new Error(`Python script failed: ${(result && result.error) || 'Unknown error'}`));
+    }
+  }
+
+  failJob(job, error) {
+    clearTimeout(job.timer);
+    job.reject(error);
+  }
+
+  execute(scriptPath, inputPath, outputPath, args = [], timeout = 120000) {
+    if (!this.enabled || !WORKER_GENERATORS.has(path.basename(scriptPath))) {
+      return this.spawnScript(scriptPath, inputPath, outputPath, args, timeout);
+    }
+
+    return new Promise((resolve, reject) => {
+      const job = {
+        id: `${process.pid}-${++this.jobCounter}`,
+        scriptPath,
+        inputPath,
+        outputPath,
+        args,
+        resolve,
+        reject,
+        worker: null
+      };
+
+      job.timer = setTimeout(() => {
+        if (job.worker) {
+          job.worker.job = null;
+          job.worker.process.kill("SIGKILL");
+        } else {
+          this.queue = this.queue.filter((queued) => queued !== job);
+        }
+        reject(new Error("Python script timeout"));
+      }, timeout);
+
+      this.queue.push(job);
+      this.warmUp();
+      this.dispatch();
+    });
+  }
+
+  spawnScript(scriptPath, inputPath, outputPath, args = [], timeout = 120000) {
+    return new Promise((resolve, reject) => {
+      const pythonProcess = spawn(getPythonCommand(), [scriptPath, inputPath, outputPath, ...args], {
+        stdio: ["pipe", "pipe", "pipe"],
+        cwd: path.dirname(scriptPath)
+      });
+
+      let stdout = "";
+      let stderr = "";
+
+      pythonProcess.stdout.on("data", (data) => {
+        stdout += data.toString();
+      });
+
+      pythonProcess.stderr.on("data", (data) => {
+        stderr += data.toString();
+      });
+
+      const timer = setTimeout(() => {
+        pythonProcess.kill("SIGTERM");
+        reject(new Error("Python script timeout"));
+      }, timeout);
+
+      pythonProcess.on("close", (code) => {
+        clearTimeout(timer);
+        console.log(`Python process exited with code: ${code}`);
+        console.log(`Python stdout: ${stdout}`);
+        console.log(`Python stderr: ${stderr}`);
+
+        if (code === 0) {
+          try {
+            const result = JSON.parse(stdout.trim());
+            resolve(result);
+          } catch (parseError) {
+            console.error('Failed to parse Python output:', parseError);
+            reject(new Error(`Failed to parse Python output: ${parseError.message}`));
+          }
+        } else {
+          reject(new Error(`Python script failed with code ${code}: ${stderr || 'Unknown error'}`));
+        }
+      });
+
+      pythonProcess.on("error", (error) => {
+        clearTimeout(timer);
+        console.error('Python process error:', error);
+        reject(new Error(`Failed to start Python process: ${error.message}`));
+      });
+    });
+  }
+
+  shutdown() {
+    for (const worker of this.workers) {
+      worker.process.kill("SIGTERM");
+    }
+    this.workers = [];
+  }
+}
+
+const reportWorkerService = new ReportWorkerService();
+
+process.once("exit", () => reportWorkerService.shutdown());
+
+module.exports = reportWorkerService;
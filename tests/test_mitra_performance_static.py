@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'utils'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+import formulas
+from openpyxl import load_workbook
+from factories import FACTORIES, materialize
+from mitraPerformanceChartGeneratorFormula import create_report
+
+ROWS = 60
+
+def fixture(period_type):
+    data = materialize(FACTORIES['mitraPerformanceChartGeneratorFormula.py'](ROWS, period_type))
+    data['shipmentData'][0]['project_name'] = 'Shop*ee'
+    data['shipmentData'][1]['hub'] = 'Hub Bekasi?'
+    return data
+
+def recalculated(path, directory):
+    model = formulas.ExcelModel().loads(path).finish()
+    model.calculate()
+    model.write(dirpath=directory)
+    return load_workbook(os.path.join(directory, os.path.basename(path).upper()), data_only=True)
+
+def same(actual, expected):
+    if isinstance(actual, (int, float)) and isinstance(expected, (int, float)):
+        return actual == pytest.approx(expected, rel=1e-9, abs=1e-9)
+    return actual == expected
+
+@pytest.mark.parametrize('period_type', ['monthly', 'weekly'])
+def test_static_values_match_recalculated_formulas(tmp_path, period_type):
+    data = fixture(period_type)
+    formula_path = str(tmp_path / 'formula.xlsx')
+    static_path = str(tmp_path / 'static.xlsx')
+    assert create_report(data, formula_path, 'formula')['success']
+    assert create_report(data, static_path, 'static')['success']
+
+    formula_book = load_workbook(formula_path)
+    static_book = load_workbook(static_path)
+    calculated = recalculated(formula_path, str(tmp_path / 'calculated'))
+    assert formula_book.sheetnames == static_book.sheetnames
+
+    checked = 0
+    mismatches = []
+    for sheet in formula_book.worksheets:
+        for row in sheet.iter_rows():
+            for cell in row:
+                if not (isinstance(cell.value, str) and cell.value.startswith('=')):
+                    continue
+
+                expected = static_book[sheet.title][cell.coordinate].value
+                if expected is None:
+                    continue
+
+                actual = calculated[sheet.title.upper()][cell.coordinate].value
+                checked += 1
+                if not same(actual, expected):
+                    mismatches.append((sheet.title, cell.coordinate, cell.value, actual, expected))
+
+    assert checked > 100
+    assert mismatches == []
@@ -0,0 +1,49 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'utils'))
+
+from openpyxl import load_workbook
+from reportStyles import Font, PatternFill
+from reportWorkbook import ENGINES, ReportWorkbook
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_multi_row_merges_keep_neighbouring_cells(tmp_path, engine):
+    wb = ReportWorkbook(engine)
+    ws = wb.create_sheet('Summary', 0)
+    ws['A1'] = 'Title'
+    ws['A1'].font = Font(bold=True)
+    ws['A1'].fill = PatternFill(start_color='1E40AF', end_color='1E40AF', fill_type='solid')
+    ws.merge_cells('A1:B3')
+    for row in range(1, 5):
+        ws.cell(row=row, column=3, value=row)
+        ws.cell(row=row, column=4, value=f'=C{row}*2')
+    ws.merge_cells('D5:E6')
+    ws['D5'] = 'Footer'
+
+    stream = wb.create_stream_sheet('Raw', 1)
+    stream.append(['Header', None])
+    stream.merge_cells('A1:B2')
+    stream.append([None, None])
+    stream.append(['Row', 3])
+
+    path = str(tmp_path / 'merged.xlsx')
+    wb.save(path)
+
+    saved = load_workbook(path)
+    summary = saved['Summary']
+    assert sorted(str(merged) for merged in summary.merged_cells.ranges) == ['A1:B3', 'D5:E6']
+    assert summary['A1'].value == 'Title'
+    assert summary['A1'].font.b
+    assert summary['A1'].fill.fgColor.rgb[-6:] == '1E40AF'
+    assert [summary.cell(row=row, column=3).value for row in range(1, 5)] == [1, 2, 3, 4]
+    assert [summary.cell(row=row, column=4).value for row in range(1, 5)] == [f'=C{row}*2' for row in range(1, 5)]
+    assert summary['D5'].value == 'Footer'
+
+    raw = saved['Raw']
+    assert [str(merged) for merged in raw.merged_cells.ranges] == ['A1:B2']
+    assert raw['A1'].value == 'Header'
+    assert [raw['A3'].value, raw['B3'].value] == ['Row', 3]
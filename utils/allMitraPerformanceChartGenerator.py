@@ -1,42 +1,22 @@
-import sys
-import json
-import os
 from datetime import datetime
-import openpyxl
 from openpyxl.chart import BarChart, LineChart, Reference, PieChart, RadarChart, AreaChart
 from openpyxl.chart.label import DataLabelList
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+from reportStyles import Font, PatternFill, Alignment, Border, Side
+from reportGenerator import ReportGenerator, SheetStage, run_cli
+from reportInput import load_report_input
 
-class AllMitraPerformanceChartGenerator:
-    def __init__(self):
-        self.primary_color = "1E3A8A"
-        self.secondary_color = "3B82F6"
-        self.success_color = "10B981"
-        self.warning_color = "F59E0B"
-        self.danger_color = "EF4444"
-        self.light_bg = "F3F4F6"
-        self.header_bg = "1E40AF"
-        
-    def create_workbook_with_charts(self, data, output_path):
-        wb = openpyxl.Workbook()
-        
-        period_type = data.get('periodType', 'monthly')
-        
-        self.create_constants_sheet(wb)
-        self.create_overview_sheet(wb, data, period_type)
-        self.create_performance_metrics_sheet(wb, data, period_type)
-        self.create_cost_analysis_sheet(wb, data, period_type)
-        self.create_top_performers_sheet(wb, data, period_type)
-        self.create_city_distribution_sheet(wb, data, period_type)
-        self.create_performance_trends_sheet(wb, data, period_type)
-        
-        if 'Sheet' in wb.sheetnames:
-            wb.remove(wb['Sheet'])
-        
-        wb.active = wb['Overview']
-        wb.save(output_path)
-        return output_path
+class AllMitraPerformanceChartGenerator(ReportGenerator):
+    stages = [
+        SheetStage('create_constants_sheet', inputs=()),
+        SheetStage('create_overview_sheet', inputs=('data', 'period_type')),
+        SheetStage('create_performance_metrics_sheet', inputs=('data', 'period_type')),
+        SheetStage('create_cost_analysis_sheet', inputs=('data', 'period_type')),
+        SheetStage('create_top_performers_sheet', inputs=('data', 'period_type')),
+        SheetStage('create_city_distribution_sheet', inputs=('data', 'period_type')),
+        SheetStage('create_performance_trends_sheet', inputs=('data', 'period_type'))
+    ]
+    active_sheet = 'Overview'
     
     def create_constants_sheet(self, wb):
         ws = wb.create_sheet("Constants", 0)
@@ -116,11 +96,7 @@ class AllMitraPerformanceChartGenerator:
         ws.merge_cells("A1:F1")
         
         headers = ["Mitra Name", "Total Deliveries", "On-Time Rate", "Avg Cost", "Avg Distance", "Cost per Km"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 3, headers)
         
         mitras = data.get('mitras', [])
         for idx, mitra in enumerate(mitras, 4):
@@ -142,11 +118,7 @@ class AllMitraPerformanceChartGenerator:
         ws.merge_cells("A1:F1")
         
         headers = ["Mitra Name", "Total Cost", "Avg Cost per Delivery", "Total Distance", "Avg Distance", "Cost per Km"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 3, headers)
         
         mitras = data.get('mitras', [])
         for idx, mitra in enumerate(mitras, 4):
@@ -168,11 +140,7 @@ class AllMitraPerformanceChartGenerator:
         ws.merge_cells("A1:F1")
         
         headers = ["Rank", "Mitra Name", "Total Deliveries", "On-Time Rate", "Total Cost", "Avg Cost"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 3, headers)
         
         mitras = data.get('mitras', [])
         top_performers = sorted(mitras, key=lambda x: x.get('totalDeliveries', 0), reverse=True)[:20]
@@ -196,11 +164,7 @@ class AllMitraPerformanceChartGenerator:
         ws.merge_cells("A1:D1")
         
         headers = ["City", "Mitra Count", "Total Deliveries", "Avg On-Time Rate"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 3, headers)
         
         mitras = data.get('mitras', [])
         city_stats = {}
@@ -240,11 +204,7 @@ class AllMitraPerformanceChartGenerator:
         ws.merge_cells("A1:F1")
         
         headers = ["Mitra Name", "Total Deliveries", "On-Time Rate", "Total Cost", "Avg Cost", "Cost per Km"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 3, headers)
         
         mitras = data.get('mitras', [])
         sorted_by_deliveries = sorted(mitras, key=lambda x: x.get('totalDeliveries', 0), reverse=True)
@@ -260,52 +220,39 @@ class AllMitraPerformanceChartGenerator:
         for col in range(1, 7):
             ws.column_dimensions[get_column_letter(col)].width = 20
 
-def main():
-    try:
-        if len(sys.argv) != 3:
-            raise ValueError("Usage: python allMitraPerformanceChartGenerator.py <input_json> <output_excel>")
-        
-        input_path = sys.argv[1]
-        output_path = sys.argv[2]
-        
-        if not os.path.exists(input_path):
-            raise FileNotFoundError(f"Input file not found: {input_path}")
-        
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        mitras = data.get('mitras', [])
-        period_type = data.get('periodType', 'monthly')
-        
-        if len(mitras) == 0:
-            print(json.dumps({
-                "success": False,
-                "error": "No mitra data available. Cannot generate report without mitra data.",
-                "details": "Please ensure mitra data is available before generating the report."
-            }))
-            sys.exit(1)
-        
-        generator = AllMitraPerformanceChartGenerator()
-        result_path = generator.create_workbook_with_charts(data, output_path)
-        
-        message = f"All mitra performance chart with {period_type} data created successfully"
-        
-        print(json.dumps({
-            "success": True,
-            "output_path": result_path,
-            "message": message,
-            "data_summary": {
-                "total_mitras": len(mitras),
-                "period_type": period_type
-            }
-        }))
+def create_report(data, output_path, engine=None):
+    mitras = data.get('mitras', [])
+    period_type = data.get('periodType', 'monthly')
     
-    except Exception as e:
-        print(json.dumps({
+    if len(mitras) == 0:
+        return {
             "success": False,
-            "error": str(e)
-        }))
-        sys.exit(1)
+            "error": "No mitra data available. Cannot generate report without mitra data.",
+            "details": "Please ensure mitra data is available before generating the report."
+        }
+    
+    generator = AllMitraPerformanceChartGenerator(engine=engine)
+    result_path = generator.create_workbook(data, output_path)
+    
+    message = f"All mitra performance chart with {period_type} data created successfully"
+    
+    return {
+        "success": True,
+        "output_path": result_path,
+        "message": message,
+        "data_summary": {
+            "total_mitras": len(mitras),
+            "period_type": period_type
+        }
+    }
+
+def generate_report(input_path, output_path, engine=None):
+    data = load_report_input(input_path)
+    
+    return create_report(data, output_path, engine)
+
+def main():
+    run_cli("allMitraPerformanceChartGenerator.py", generate_report)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
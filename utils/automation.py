@@ -123,8 +123,10 @@ class GoogleSheetsDownloader:
 
 
 class BlitzAutomation:
-    def __init__(self):
+    def __init__(self, profile_dir=None, screenshot_dir=None):
         self.driver = None
+        self.profile_dir = profile_dir
+        self.screenshot_dir = screenshot_dir or "/tmp"
         self.wait = None
         self.login_url = "https://adminpanel.rideblitz.id/login/"
         self.base_form_url = "https://adminpanel.rideblitz.id/api/bulkorderactivity/add/"
@@ -143,6 +145,8 @@ class BlitzAutomation:
         options.add_argument('--disable-gpu')
         options.add_argument('--window-size=1920,1080')
         options.add_argument('--disable-blink-features=AutomationControlled')
+        if self.profile_dir:
+            options.add_argument(f'--user-data-dir={self.profile_dir}')
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
 
@@ -201,7 +205,7 @@ class BlitzAutomation:
     def _screenshot(self, label):
         if ADMINPANEL_STATUS:
             try:
-                path = f"/tmp/blitz_{label}_{int(time.time())}.png"
+                path = os.path.join(self.screenshot_dir, f"blitz_{label}_{int(time.time())}.png")
                 self.driver.save_screenshot(path)
                 print(f"[DEBUG] Screenshot: {path}")
             except Exception as e:
@@ -1,34 +1,17 @@
-import sys
-import json
-import os
 from datetime import datetime
-import openpyxl
 from openpyxl.chart import BarChart, PieChart, Reference
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
+from reportStyles import Font, PatternFill, Border, Side, Alignment
+from reportGenerator import ReportGenerator, SheetStage, run_cli
+from reportInput import load_report_input
 
-class ExcelChartGenerator:
-    def __init__(self):
-        self.primary_color = "1E3A8A"
-        self.secondary_color = "3B82F6"
-        self.success_color = "10B981"
-        self.warning_color = "F59E0B"
-        self.danger_color = "EF4444"
-        self.light_bg = "F3F4F6"
-        self.header_bg = "1E40AF"
-        
-    def create_workbook_with_charts(self, data, output_path):
-        wb = openpyxl.Workbook()
-        self.create_cover_sheet(wb, data)
-        self.create_executive_summary(wb, data)
-        self.create_performance_sheet(wb, data)
-        self.create_insights_sheet(wb, data)
-        
-        if 'Sheet' in wb.sheetnames:
-            wb.remove(wb['Sheet'])
-        
-        wb.save(output_path)
-        return output_path
+class ExcelChartGenerator(ReportGenerator):
+    stages = [
+        SheetStage('create_cover_sheet'),
+        SheetStage('create_executive_summary'),
+        SheetStage('create_performance_sheet'),
+        SheetStage('create_insights_sheet')
+    ]
     
     def create_cover_sheet(self, wb, data):
         ws = wb.create_sheet("Dashboard Overview", 0)
@@ -506,35 +489,23 @@ class ExcelChartGenerator:
         
         ws.add_chart(chart, f"D{start_row}")
 
-def main():
-    try:
-        if len(sys.argv) != 3:
-            raise ValueError("Usage: python chart_generator.py <input_json_path> <output_excel_path>")
-        
-        input_path = sys.argv[1]
-        output_path = sys.argv[2]
-        
-        if not os.path.exists(input_path):
-            raise FileNotFoundError(f"Input file not found: {input_path}")
-        
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        generator = ExcelChartGenerator()
-        result_path = generator.create_workbook_with_charts(data, output_path)
-        
-        print(json.dumps({
-            "success": True,
-            "output_path": result_path,
-            "message": "Professional dashboard created successfully"
-        }))
+def create_report(data, output_path, engine=None):
+    generator = ExcelChartGenerator(engine=engine)
+    result_path = generator.create_workbook(data, output_path)
+    
+    return {
+        "success": True,
+        "output_path": result_path,
+        "message": "Professional dashboard created successfully"
+    }
+
+def generate_report(input_path, output_path, engine=None):
+    data = load_report_input(input_path)
     
-    except Exception as e:
-        print(json.dumps({
-            "success": False,
-            "error": str(e)
-        }))
-        sys.exit(1)
+    return create_report(data, output_path, engine)
+
+def main():
+    run_cli("chart_generator.py", generate_report)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
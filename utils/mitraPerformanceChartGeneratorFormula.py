@@ -1,72 +1,377 @@
-import sys
-import json
-import os
+import pandas as pd
 from datetime import datetime
-import openpyxl
 from openpyxl.chart import BarChart, LineChart, Reference, PieChart, RadarChart, AreaChart
 from openpyxl.chart.label import DataLabelList
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+from reportStyles import Font, PatternFill, Alignment, Border, Side
+from reportGenerator import ReportGenerator, SheetStage, run_cli, validate_choice
+from reportInput import load_report_input
+from reportFormulas import DataRange, exact_criteria
+from reportRawData import shipment_stratum
 
-class MitraPerformanceChartGeneratorFormula:
-    def __init__(self):
-        self.primary_color = "1E3A8A"
-        self.secondary_color = "3B82F6"
-        self.success_color = "10B981"
-        self.warning_color = "F59E0B"
-        self.danger_color = "EF4444"
-        self.light_bg = "F3F4F6"
-        self.header_bg = "1E40AF"
-        
-    def create_workbook_with_charts(self, data, output_path):
-        wb = openpyxl.Workbook()
-        
-        data_quality = data.get('dataQuality', {})
-        has_valid_trends = data_quality.get('hasValidTrends', False)
-        period_type = data.get('periodType', 'monthly')
-        applied_filters = data.get('appliedFilters', {})
-        
-        self.create_constants_sheet(wb)
-        self.create_data_quality_warning_sheet(wb, data_quality, data)
-        self.create_shipment_data_sheet(wb, data, period_type)
-        self.create_executive_summary_sheet(wb, data, has_valid_trends, period_type)
-        self.create_performance_metrics_with_formulas(wb, data, period_type)
-        self.create_cost_analysis_dashboard(wb, data, period_type)
-        
-        if has_valid_trends:
-            self.create_trend_analysis_with_formulas(wb, data, period_type)
+CONSTANTS = [
+    ("DELIVERY_RATE_TARGET", 95, "Target delivery success rate (95%)"),
+    ("ONTIME_RATE_TARGET", 90, "Target on-time delivery rate (90%)"),
+    ("ACTIVITY_BASELINE", 100, "Baseline for activity level calculation"),
+    ("WEIGHT_DELIVERY_RATE", 0.30, "Weight for delivery rate in score (30%)"),
+    ("WEIGHT_ONTIME_RATE", 0.25, "Weight for on-time rate in score (25%)"),
+    ("WEIGHT_ACTIVITY", 0.20, "Weight for activity level in score (20%)"),
+    ("WEIGHT_CONSISTENCY", 0.15, "Weight for consistency in score (15%)"),
+    ("WEIGHT_GROWTH", 0.10, "Weight for growth in score (10%)"),
+    ("GROWTH_BASELINE", 50, "Baseline score for growth calculation (50)"),
+    ("MAX_SCORE", 100, "Maximum performance score (100)"),
+    ("CANCEL_PENALTY_MULTIPLIER", 10, "Multiplier for cancellation penalty")
+]
+
+CONSTANT_VALUES = {name: value for name, value, _ in CONSTANTS}
+
+MODES = ['formula', 'static']
+
+MONTH_NAMES = ["", "January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December"]
+DATE_PATTERN = r'^([0-9]{1,2})/([0-9]{1,2})/([0-9]{4})\Z'
+WEEKLY_YEAR_RANGE = (1678, 2261)
+
+def extract_period_info(date_str, period_type):
+    if not date_str or date_str == '-':
+        return None, None, None, None
+    
+    try:
+        parts = date_str.split('/')
+        if len(parts) == 3:
+            day, month, year = parts
+            day_num = int(day)
+            month_num = int(month)
+            year_num = int(year)
+            
+            if period_type == 'daily':
+                display = date_str
+                return display, month_num, year_num, f"{year_num}{str(month_num).zfill(2)}{str(day_num).zfill(2)}"
+                
+            elif period_type == 'weekly':
+                date_obj = datetime(year_num, month_num, day_num)
+                week_num = date_obj.isocalendar()[1]
+                display = f"Week {week_num} - {MONTH_NAMES[month_num]} {year_num}"
+                return display, month_num, year_num, f"{year_num}{str(month_num).zfill(2)}{str(week_num).zfill(2)}"
+                
+            elif period_type == 'monthly':
+                display = f"{MONTH_NAMES[month_num]} {year_num}"
+                return display, month_num, year_num, f"{year_num}{str(month_num).zfill(2)}"
+                
+            elif period_type == 'yearly':
+                display = str(year_num)
+                return display, None, year_num, str(year_num)
+    except (AttributeError, IndexError, ValueError):
+        pass
+    
+    return None, None, None, None
+
+def clean_number(value):
+    if value is None or value == '' or value == '-':
+        return 0
+    try:
+        return float(str(value).replace(',', '.'))
+    except ValueError:
+        return 0
+
+def expand(codes, values, missing):
+    table = list(values) + [missing]
+    return [table[code] for code in codes.tolist()]
+
+def clean_numbers(series):
+    codes, uniques = pd.factorize(series.astype(str))
+    text = pd.Series(uniques, dtype=object)
+    blank = text.isin(['', '-'])
+    text = text.where(~blank, '0').str.replace(',', '.', regex=False)
+    try:
+        numbers = text.astype(float).astype(object)
+    except ValueError:
+        numbers = pd.Series([clean_number(value) for value in text], dtype=object)
+    numbers[blank] = 0
+    return expand(codes, numbers.tolist(), 0)
+
+def on_time_flags(series):
+    codes, uniques = pd.factorize(series.astype(str))
+    text = pd.Series(uniques, dtype=object).str.lower()
+    flags = text.str.contains('on time', regex=False) | text.str.contains('ontime', regex=False)
+    return expand(codes, flags.astype(int).tolist(), 0)
+
+def period_columns(dates, period_type):
+    empty = pd.Series([None] * len(dates), index=dates.index, dtype=object)
+    display, month, year, sort_key = empty.copy(), empty.copy(), empty.copy(), empty.copy()
+    
+    parts = dates.str.extract(DATE_PATTERN) if len(dates) else pd.DataFrame(columns=[0, 1, 2])
+    fast = parts[0].notna()
+    if period_type == 'weekly':
+        years = pd.to_numeric(parts[2], errors='coerce')
+        fast &= years.between(*WEEKLY_YEAR_RANGE)
+    
+    parsed = parts[fast].astype(int)
+    day_num, month_num, year_num = parsed[0], parsed[1], parsed[2]
+    year_text = year_num.astype(str)
+    month_text = month_num.astype(str).str.zfill(2)
+    month_name = month_num.map(dict(enumerate(MONTH_NAMES)))
+    valid = pd.Series(period_type in ('daily', 'monthly', 'yearly'), index=parsed.index)
+    
+    if period_type == 'daily':
+        display[valid.index] = dates[valid.index]
+        sort_key[valid.index] = year_text + month_text + day_num.astype(str).str.zfill(2)
+    elif period_type == 'weekly':
+        stamps = pd.to_datetime(dates[fast], format='%d/%m/%Y', errors='coerce')
+        valid = stamps.notna()
+        week = stamps[valid].dt.isocalendar().week.astype(int).astype(str)
+        index = valid[valid].index
+        display[index] = 'Week ' + week + ' - ' + month_name[index] + ' ' + year_text[index]
+        sort_key[index] = year_text[index] + month_text[index] + week.str.zfill(2)
+    elif period_type == 'monthly':
+        valid = month_num <= 12
+        index = valid[valid].index
+        display[index] = month_name[index] + ' ' + year_text[index]
+        sort_key[index] = year_text[index] + month_text[index]
+    elif period_type == 'yearly':
+        display[valid.index] = year_text
+        sort_key[valid.index] = year_text
+    
+    index = valid[valid].index
+    if period_type != 'yearly':
+        month[index] = month_num[index].astype(object)
+    year[index] = year_num[index].astype(object)
+    
+    return list(zip(display.tolist(), month.tolist(), year.tolist(), sort_key.tolist())), fast.tolist()
+
+class ShipmentColumns:
+    def __init__(self, shipments, period_type):
+        frame = pd.DataFrame({key: pd.Series([shipment.get(key) for shipment in shipments], dtype=object)
+                              for key in ('delivery_date', 'cost', 'distance_km', 'sla')})
+        
+        raw_dates = frame['delivery_date']
+        text = raw_dates.map(type) == str
+        codes, uniques = pd.factorize(raw_dates.where(text))
+        uniques = pd.Series(uniques, dtype=object)
+        raw_periods, fast = period_columns(uniques, period_type)
+        periods = list(raw_periods)
+        dates = uniques.tolist()
+        for position, is_fast in enumerate(fast):
+            if is_fast:
+                continue
+            raw = dates[position]
+            dates[position] = '-' if raw == '' or raw == '-' else raw.strip()
+            raw_periods[position] = extract_period_info(raw, period_type)
+            periods[position] = extract_period_info(dates[position], period_type)
+        
+        missing = (None, None, None, None)
+        self.dates = expand(codes, dates, '-')
+        self.raw_periods = expand(codes, raw_periods, missing)
+        self.periods = expand(codes, periods, missing)
+        for index in (~text & (raw_dates.to_numpy() != None)).to_numpy().nonzero()[0]:
+            self.dates[index] = str(raw_dates[index]).strip()
+            self.periods[index] = extract_period_info(self.dates[index], period_type)
+        
+        self.cost = clean_numbers(frame['cost'])
+        self.distance = clean_numbers(frame['distance_km'])
+        self.on_time = on_time_flags(frame['sla'])
+
+class ShipmentSheetStats:
+    def __init__(self, period_type):
+        self.period_type = period_type
+        self.row_count = 0
+        self.on_time = 0
+        self.cost = 0
+        self.distance = 0
+        self.positive_distance_count = 0
+        self.projects = {}
+        self.hubs = {}
+        self.periods = {}
+        self.month_years = {}
+        self.months = {}
+        self.growth_column = []
+    
+    def add(self, client_name, project_name, hub, on_time, display_period, cost, distance, month, year):
+        if client_name != '':
+            self.row_count += 1
+        
+        self.on_time += on_time
+        self.cost += cost
+        self.distance += distance
+        if distance > 0:
+            self.positive_distance_count += 1
+        
+        project = self.projects.setdefault(project_name.lower(), [0, 0, 0, 0])
+        project[0] += 1
+        project[1] += cost
+        project[2] += distance
+        project[3] += on_time
+        
+        hub_totals = self.hubs.setdefault(hub.lower(), [0, 0])
+        hub_totals[0] += 1
+        hub_totals[1] += cost
+        
+        period_totals = self.periods.setdefault(str(display_period).lower(), [0, 0])
+        period_totals[0] += 1
+        period_totals[1] += cost
+        
+        if month != '':
+            month_totals = self.months.setdefault(month, [0, 0])
+            month_totals[0] += 1
+            month_totals[1] += cost
+            
+            if year != '':
+                month_year_totals = self.month_years.setdefault((month, year), [0, 0])
+                month_year_totals[0] += 1
+                month_year_totals[1] += cost
+        
+        if self.period_type in ['daily', 'weekly']:
+            self.growth_column.append(display_period)
+        elif self.period_type == 'monthly':
+            self.growth_column.append(month)
         else:
-            self.create_limited_trend_sheet(wb, data, period_type)
-        
-        self.create_project_analysis_with_formulas(wb, data, period_type)
-        self.create_operational_insights_dashboard(wb, data, period_type)
-        self.create_performance_overview_sheet(wb, data, has_valid_trends, period_type)
-        self.create_visual_dashboard(wb, data, has_valid_trends, period_type)
-        
-        if has_valid_trends:
-            self.create_advanced_analytics_dashboard(wb, data, period_type)
-        
-        self.create_management_kpi_dashboard(wb, data, has_valid_trends, period_type)
+            self.growth_column.append(year)
+    
+    def project(self, name):
+        return self.projects.get(str(name).lower(), [0, 0, 0, 0])
+    
+    def hub(self, name):
+        return self.hubs.get(str(name).lower(), [0, 0])
+    
+    def period(self, name):
+        return self.periods.get(str(name).lower(), [0, 0])
+    
+    def month_year(self, month, year):
+        return self.month_years.get((month, year), [0, 0])
+    
+    def month(self, month):
+        return self.months.get(month, [0, 0])
+    
+    def growth_rate(self):
+        filled = sum(1 for value in self.growth_column if value != '')
+        if filled <= 1:
+            return 0
         
-        if 'Sheet' in wb.sheetnames:
-            wb.remove(wb['Sheet'])
+        latest = self.growth_column[filled] if filled < len(self.growth_column) else ''
+        first = self.growth_column[1]
         
-        wb.active = wb['Executive Summary'] if has_valid_trends else wb['Data Quality Warning']
+        try:
+            latest = 0 if latest == '' else latest
+            first = 0 if first == '' else first
+            return (first - latest) / latest
+        except (TypeError, ZeroDivisionError):
+            return 0
+
+class MitraPerformanceChartGeneratorFormula(ReportGenerator):
+    stages = [
+        SheetStage('create_constants_sheet', inputs=()),
+        SheetStage('create_data_quality_warning_sheet', inputs=('data_quality', 'data')),
+        SheetStage('create_shipment_data_sheet', inputs=('data', 'period_type'), output=('shipment_columns', 'shipment_range', 'shipment_stats')),
+        SheetStage('compute_static_cells', inputs=('data', 'shipment_stats'), output='computed_cells', sheet=False),
+        SheetStage('create_executive_summary_sheet', inputs=('data', 'has_valid_trends', 'period_type', 'computed_cells'), parallel=True),
+        SheetStage('create_performance_metrics_with_formulas', inputs=('data', 'period_type', 'shipment_range', 'computed_cells'), parallel=True),
+        SheetStage('create_cost_analysis_dashboard', inputs=('data', 'period_type', 'shipment_columns', 'shipment_range', 'shipment_stats', 'computed_cells'), parallel=True),
+        SheetStage('create_trend_analysis_with_formulas', inputs=('data', 'period_type', 'shipment_columns', 'shipment_range', 'shipment_stats'), when=lambda state: state['has_valid_trends'], parallel=True),
+        SheetStage('create_limited_trend_sheet', inputs=('data', 'period_type'), when=lambda state: not state['has_valid_trends'], parallel=True),
+        SheetStage('create_project_analysis_with_formulas', inputs=('data', 'period_type', 'shipment_columns', 'shipment_range', 'shipment_stats'), parallel=True),
+        SheetStage('create_operational_insights_dashboard', inputs=('data', 'period_type', 'shipment_columns', 'shipment_range', 'shipment_stats'), parallel=True),
+        SheetStage('create_performance_overview_sheet', inputs=('data', 'has_valid_trends', 'period_type', 'computed_cells'), parallel=True),
+        SheetStage('create_visual_dashboard', inputs=('data', 'has_valid_trends', 'period_type', 'shipment_columns', 'shipment_range', 'shipment_stats'), parallel=True),
+        SheetStage('create_advanced_analytics_dashboard', inputs=('data', 'period_type', 'shipment_columns', 'shipment_range', 'shipment_stats'), when=lambda state: state['has_valid_trends'], parallel=True),
+        SheetStage('create_management_kpi_dashboard', inputs=('data', 'has_valid_trends', 'period_type', 'computed_cells'), parallel=True)
+    ]
+    raw_data_defaults = {'mode': 'stratified'}
+    config_attributes = ('mode', 'values_only')
+    
+    def __init__(self, mode='formula', engine=None):
+        super().__init__(engine)
+        self.mode = mode
+        self.values_only = mode == 'static'
+    
+    def prepare(self, data):
+        state = super().prepare(data)
+        state['data_quality'] = data.get('dataQuality', {})
+        state['has_valid_trends'] = state['data_quality'].get('hasValidTrends', False)
+        self.values_only = self.mode == 'static' or self.raw_data.truncates(len(data.get('shipmentData', [])))
+        return state
+    
+    def active_sheet_title(self, state):
+        return 'Executive Summary' if state['has_valid_trends'] else 'Data Quality Warning'
+    
+    def formula_or_value(self, formula, value):
+        return value if self.values_only else formula
+    
+    def compute_static_cells(self, data, stats):
+        metrics = data.get('metrics', {})
+        constants = CONSTANT_VALUES
+        
+        total = stats.row_count
+        on_time_rate = stats.on_time / total if total else 0
+        avg_distance = stats.distance / stats.positive_distance_count if stats.positive_distance_count else 0
+        cancel_share = self.safe_float(metrics.get('cancelRate', 0)) / 100
+        delivery_rate = (total - cancel_share * total) / total if total else 0
+        cancel_rate = 1 - delivery_rate
+        growth_rate = stats.growth_rate()
+        
+        scores = [
+            (constants['WEIGHT_DELIVERY_RATE'], min(constants['MAX_SCORE'], (delivery_rate * 100) / constants['DELIVERY_RATE_TARGET'])),
+            (constants['WEIGHT_ONTIME_RATE'], min(constants['MAX_SCORE'], (on_time_rate * 100) / constants['ONTIME_RATE_TARGET'])),
+            (constants['WEIGHT_ACTIVITY'], min(constants['MAX_SCORE'], total / constants['ACTIVITY_BASELINE'] * 100)),
+            (constants['WEIGHT_CONSISTENCY'], max(0, constants['MAX_SCORE'] - (cancel_rate * constants['CANCEL_PENALTY_MULTIPLIER']))),
+            (constants['WEIGHT_GROWTH'], max(0, min(constants['MAX_SCORE'], constants['GROWTH_BASELINE'] + (growth_rate * 100))))
+        ]
         
-        wb.save(output_path)
-        return output_path
+        cells = {
+            'C4': total,
+            'C5': stats.on_time,
+            'C6': on_time_rate,
+            'C7': avg_distance,
+            'C8': len(stats.projects),
+            'C9': len(stats.hubs),
+            'C10': delivery_rate,
+            'C11': cancel_rate,
+            'C12': growth_rate
+        }
+        
+        total_score = 0
+        for row, (weight, score) in enumerate(scores, 18):
+            cells[f'B{row}'] = weight
+            cells[f'C{row}'] = score
+            cells[f'D{row}'] = weight * score
+            total_score += weight * score
+        cells['D23'] = total_score
+        
+        return {
+            'Performance Metrics': cells,
+            'Cost Analysis': {
+                'C6': stats.cost,
+                'C7': stats.cost / total if total else 0,
+                'C8': stats.cost / stats.distance if stats.distance else 0,
+                'C9': stats.distance,
+                'C10': total
+            }
+        }
     
-    def safe_float(self, value, default=0.0):
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return default
+    def ratio(self, numerator, denominator):
+        return numerator / denominator if denominator else 0
     
-    def safe_int(self, value, default=0):
-        try:
-            return int(float(value))
-        except (ValueError, TypeError):
-            return default
+    def trend_totals(self, stats, period_type, period_display, period_data):
+        if period_type == 'monthly':
+            return stats.month_year(period_data['month_num'], period_data['year_num'])
+        return stats.period(period_display)
+    
+    def performance_category(self, score):
+        if score >= 90:
+            return "Excellent"
+        if score >= 80:
+            return "Very Good"
+        if score >= 70:
+            return "Good"
+        return "Fair"
+    
+    def trend_status(self, growth):
+        if growth > 0.1:
+            return "↑ Increasing"
+        if growth > 0:
+            return "↗ Growth"
+        if growth < -0.1:
+            return "↓ Decreasing"
+        return "→ Stable"
     
     def create_constants_sheet(self, wb):
         ws = wb.create_sheet("Constants", 0)
@@ -79,21 +384,7 @@ class MitraPerformanceChartGeneratorFormula:
         ws.cell(row=3, column=2, value="Value").font = Font(bold=True)
         ws.cell(row=3, column=3, value="Description").font = Font(bold=True)
         
-        constants = [
-            ("DELIVERY_RATE_TARGET", 95, "Target delivery success rate (95%)"),
-            ("ONTIME_RATE_TARGET", 90, "Target on-time delivery rate (90%)"),
-            ("ACTIVITY_BASELINE", 100, "Baseline for activity level calculation"),
-            ("WEIGHT_DELIVERY_RATE", 0.30, "Weight for delivery rate in score (30%)"),
-            ("WEIGHT_ONTIME_RATE", 0.25, "Weight for on-time rate in score (25%)"),
-            ("WEIGHT_ACTIVITY", 0.20, "Weight for activity level in score (20%)"),
-            ("WEIGHT_CONSISTENCY", 0.15, "Weight for consistency in score (15%)"),
-            ("WEIGHT_GROWTH", 0.10, "Weight for growth in score (10%)"),
-            ("GROWTH_BASELINE", 50, "Baseline score for growth calculation (50)"),
-            ("MAX_SCORE", 100, "Maximum performance score (100)"),
-            ("CANCEL_PENALTY_MULTIPLIER", 10, "Multiplier for cancellation penalty")
-        ]
-        
-        for idx, (name, value, desc) in enumerate(constants, 4):
+        for idx, (name, value, desc) in enumerate(CONSTANTS, 4):
             ws.cell(row=idx, column=1, value=name).font = Font(bold=True)
             ws.cell(row=idx, column=2, value=value)
             ws.cell(row=idx, column=3, value=desc).font = Font(italic=True, size=9)
@@ -199,7 +490,7 @@ class MitraPerformanceChartGeneratorFormula:
         
         footer_row = impact_row + 20
         ws.cell(row=footer_row, column=2, value=f"Report Generated: {datetime.now().strftime('%d %B %Y, %H:%M')}").font = Font(size=9, italic=True, color="6B7280")
-        ws.cell(row=footer_row + 1, column=2, value="All calculations use Excel formulas for transparency and auditability").font = Font(size=9, italic=True, color="6B7280")
+        ws.cell(row=footer_row + 1, column=2, value=self.formula_or_value("All calculations use Excel formulas for transparency and auditability", "All calculations are precomputed from Shipment Data and written as values")).font = Font(size=9, italic=True, color="6B7280")
         
         for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']:
             ws.column_dimensions[col].width = 20
@@ -218,11 +509,7 @@ class MitraPerformanceChartGeneratorFormula:
         ws.cell(row=6, column=1, value="AVAILABLE DATA").font = Font(bold=True, size=12, color=self.primary_color)
         
         headers = ["Period", "Deliveries", "Notes"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=8, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 8, headers)
         
         for idx, trend in enumerate(trends, 9):
             ws.cell(row=idx, column=1, value=trend.get('month', 'Unknown'))
@@ -243,7 +530,7 @@ class MitraPerformanceChartGeneratorFormula:
         except:
             return date_str
     
-    def create_executive_summary_sheet(self, wb, data, has_valid_trends, period_type):
+    def create_executive_summary_sheet(self, wb, data, has_valid_trends, period_type, computed):
         ws = wb.create_sheet("Executive Summary")
         profile = data.get('profile', {})
         metrics = data.get('metrics', {})
@@ -314,6 +601,20 @@ class MitraPerformanceChartGeneratorFormula:
             "=IFERROR('Performance Metrics'!C9,0)"
         ]
         
+        kpi_values = [
+            computed['Performance Metrics']['C4'],
+            computed['Performance Metrics']['C10'] * 100,
+            computed['Performance Metrics']['C6'] * 100,
+            computed['Performance Metrics']['C7'],
+            computed['Cost Analysis']['C6'],
+            computed['Cost Analysis']['C7'],
+            computed['Cost Analysis']['C8'],
+            computed['Performance Metrics']['C11'] * 100,
+            computed['Performance Metrics']['C12'] * 100,
+            computed['Performance Metrics']['C8'],
+            computed['Performance Metrics']['C9']
+        ]
+        
         kpi_formats = [
             '#,##0',
             '0.00"%"',
@@ -328,11 +629,11 @@ class MitraPerformanceChartGeneratorFormula:
             '#,##0'
         ]
         
-        for label, formula, number_format in zip(kpi_labels, kpi_formulas, kpi_formats):
+        for label, formula, value, number_format in zip(kpi_labels, kpi_formulas, kpi_values, kpi_formats):
             ws.cell(row=kpi_row, column=2, value=label).font = Font(bold=True, size=10)
             ws.cell(row=kpi_row, column=2).fill = PatternFill(start_color=self.light_bg, end_color=self.light_bg, fill_type="solid")
             
-            value_cell = ws.cell(row=kpi_row, column=3, value=formula)
+            value_cell = ws.cell(row=kpi_row, column=3, value=self.formula_or_value(formula, value))
             value_cell.font = Font(size=12, bold=True, color=self.secondary_color)
             value_cell.alignment = Alignment(horizontal="center")
             value_cell.number_format = number_format
@@ -342,13 +643,13 @@ class MitraPerformanceChartGeneratorFormula:
         score_row = kpi_row + 2
         ws.cell(row=score_row, column=2, value="OVERALL PERFORMANCE SCORE").font = Font(bold=True, size=12, color=self.primary_color)
         ws.cell(row=score_row + 1, column=2, value="(Strategic performance assessment)").font = Font(size=9, italic=True, color="6B7280")
-        score_cell = ws.cell(row=score_row + 2, column=3, value="=IFERROR('Performance Metrics'!D21,0)")
+        score_cell = ws.cell(row=score_row + 2, column=3, value=self.formula_or_value("=IFERROR('Performance Metrics'!D21,0)", computed['Performance Metrics']['D21']))
         score_cell.font = Font(size=24, bold=True, color=self.success_color)
         score_cell.number_format = '0.00'
         score_cell.alignment = Alignment(horizontal="center")
         
         ws.cell(row=score_row + 4, column=2, value="PERFORMANCE CATEGORY").font = Font(bold=True, size=11, color=self.primary_color)
-        category_cell = ws.cell(row=score_row + 5, column=3, value="=IF(D23>=90,\"Excellent\",IF(D23>=80,\"Very Good\",IF(D23>=70,\"Good\",\"Fair\")))")
+        category_cell = ws.cell(row=score_row + 5, column=3, value=self.formula_or_value("=IF(D23>=90,\"Excellent\",IF(D23>=80,\"Very Good\",IF(D23>=70,\"Good\",\"Fair\")))", self.performance_category(ws['D23'].value or 0)))
         category_cell.font = Font(size=14, bold=True)
         category_cell.alignment = Alignment(horizontal="center")
         
@@ -387,7 +688,7 @@ class MitraPerformanceChartGeneratorFormula:
         ws.cell(row=rec_row + 4, column=2, value="Analysis Type:").font = Font(bold=True)
         ws.cell(row=rec_row + 4, column=3, value=f"{period_type.capitalize()} Strategic Analysis" if has_valid_trends else f"Limited {period_type.capitalize()} Analysis")
         ws.cell(row=rec_row + 5, column=2, value="Calculation Method:").font = Font(bold=True)
-        ws.cell(row=rec_row + 5, column=3, value="Excel formulas for transparency")
+        ws.cell(row=rec_row + 5, column=3, value="Precomputed values" if self.values_only else "Excel formulas for transparency")
         
         for col in ['A', 'B', 'C', 'D', 'E', 'F', 'G']:
             ws.column_dimensions[col].width = 20
@@ -397,70 +698,24 @@ class MitraPerformanceChartGeneratorFormula:
             return '-'
         return str(value).strip()
     
-    def clean_number(self, value):
-        if value is None or value == '' or value == '-':
-            return 0
-        try:
-            return float(str(value).replace(',', '.'))
-        except:
-            return 0
-    
-    def is_on_time(self, sla_value):
-        if not sla_value or sla_value == '-':
-            return 0
-        sla_lower = str(sla_value).lower()
-        return 1 if 'on time' in sla_lower or 'ontime' in sla_lower else 0
-    
-    def extract_period_info(self, date_str, period_type):
-        if not date_str or date_str == '-':
-            return None, None, None, None
-        
-        try:
-            parts = date_str.split('/')
-            if len(parts) == 3:
-                day, month, year = parts
-                day_num = int(day)
-                month_num = int(month)
-                year_num = int(year)
-                
-                month_names = ["", "January", "February", "March", "April", "May", "June", 
-                              "July", "August", "September", "October", "November", "December"]
-                
-                if period_type == 'daily':
-                    display = date_str
-                    return display, month_num, year_num, f"{year_num}{str(month_num).zfill(2)}{str(day_num).zfill(2)}"
-                    
-                elif period_type == 'weekly':
-                    date_obj = datetime(year_num, month_num, day_num)
-                    week_num = date_obj.isocalendar()[1]
-                    display = f"Week {week_num} - {month_names[month_num]} {year_num}"
-                    return display, month_num, year_num, f"{year_num}{str(month_num).zfill(2)}{str(week_num).zfill(2)}"
-                    
-                elif period_type == 'monthly':
-                    display = f"{month_names[month_num]} {year_num}"
-                    return display, month_num, year_num, f"{year_num}{str(month_num).zfill(2)}"
-                    
-                elif period_type == 'yearly':
-                    display = str(year_num)
-                    return display, None, year_num, str(year_num)
-        except:
-            pass
-        
-        return None, None, None, None
-    
     def create_shipment_data_sheet(self, wb, data, period_type):
-        ws = wb.create_sheet("Shipment Data", 2)
+        ws = wb.create_stream_sheet("Shipment Data", 2)
         shipment_data = data.get('shipmentData', [])
+        stats = ShipmentSheetStats(period_type)
+        shipment_range = DataRange("Shipment Data", 4, self.raw_data.rows_written(len(shipment_data)))
         
         if len(shipment_data) == 0:
-            ws.cell(row=1, column=1, value="No shipment data available").font = Font(bold=True, color="FF0000")
-            return
+            ws.append([ws.styled_cell("No shipment data available", font=Font(bold=True, color="FF0000"))])
+            return ShipmentColumns([], period_type), shipment_range, stats
         
-        title = ws.cell(row=1, column=1, value=f"RAW SHIPMENT DATA - {period_type.upper()} FILTERED (CHRONOLOGICAL)")
-        title.font = Font(bold=True, size=16, color=self.primary_color)
+        for col in range(1, 25):
+            ws.set_column_width(get_column_letter(col), 15)
+        
+        ws.append([ws.styled_cell(f"RAW SHIPMENT DATA - {period_type.upper()} FILTERED (CHRONOLOGICAL)", font=Font(bold=True, size=16, color=self.primary_color))])
         ws.merge_cells("A1:W1")
         
-        ws.cell(row=2, column=1, value="Sorted: Oldest deliveries first | All calculations reference this data").font = Font(size=9, italic=True, color="6B7280")
+        source_note = "Summary sheets use values precomputed from every shipment" if self.raw_data.truncates(len(shipment_data)) else "All calculations reference this data"
+        ws.append([ws.styled_cell(f"Sorted: Oldest deliveries first | {source_note} | Raw data: {self.raw_data.describe(len(shipment_data))}", font=Font(size=9, italic=True, color="6B7280"))])
         ws.merge_cells("A2:W2")
         
         headers = ["Client Name", "Project Name", "Delivery Date", "Drop Point", "Hub", 
@@ -468,17 +723,21 @@ class MitraPerformanceChartGeneratorFormula:
                    "Receiving Date", "Vehicle Type", "Cost", "SLA", "Weekly", "Is On-Time",
                    "Display Period", "Month", "Year", "Cost Numeric", "Distance Numeric", 
                    "Month Num", "Year Num", "Sort Key"]
+        if self.mode == 'formula':
+            headers += ["First Project", "First Hub"]
         
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        header_font = Font(bold=True, color="FFFFFF", size=10)
+        header_fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
+        header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        ws.append([ws.styled_cell(header, font=header_font, fill=header_fill, alignment=header_alignment) for header in headers])
+        
+        shipments = list(shipment_data)
+        columns = ShipmentColumns(shipments, period_type)
         
         processed_shipments = []
-        for shipment in shipment_data:
-            date_str = self.clean_string(shipment.get('delivery_date'))
-            display_period, month, year, sort_key = self.extract_period_info(date_str, period_type)
+        for index, shipment in enumerate(shipments):
+            date_str = columns.dates[index]
+            display_period, month, year, sort_key = columns.periods[index]
             
             processed_shipments.append({
                 'data': shipment,
@@ -486,98 +745,120 @@ class MitraPerformanceChartGeneratorFormula:
                 'month': month,
                 'year': year,
                 'sort_key': sort_key if sort_key else '99999999',
-                'date_str': date_str
+                'date_str': date_str,
+                'cost': columns.cost[index],
+                'distance': columns.distance[index],
+                'on_time': columns.on_time[index]
             })
         
         processed_shipments.sort(key=lambda x: x['sort_key'])
         
-        for row_idx, item in enumerate(processed_shipments, 4):
-            shipment = item['data']
-            
-            ws.cell(row=row_idx, column=1, value=self.clean_string(shipment.get('client_name')))
-            ws.cell(row=row_idx, column=2, value=self.clean_string(shipment.get('project_name')))
-            ws.cell(row=row_idx, column=3, value=item['date_str'])
-            ws.cell(row=row_idx, column=4, value=self.clean_string(shipment.get('drop_point')))
-            ws.cell(row=row_idx, column=5, value=self.clean_string(shipment.get('hub')))
-            ws.cell(row=row_idx, column=6, value=self.clean_string(shipment.get('order_code')))
-            ws.cell(row=row_idx, column=7, value=self.clean_string(shipment.get('weight')))
-            
-            distance = self.clean_number(shipment.get('distance_km'))
-            ws.cell(row=row_idx, column=8, value=distance).number_format = '0.00'
-            
-            ws.cell(row=row_idx, column=9, value=self.clean_string(shipment.get('mitra_code')))
-            ws.cell(row=row_idx, column=10, value=self.clean_string(shipment.get('mitra_name')))
-            ws.cell(row=row_idx, column=11, value=self.clean_string(shipment.get('receiving_date')))
-            ws.cell(row=row_idx, column=12, value=self.clean_string(shipment.get('vehicle_type')))
-            
-            cost_str = self.clean_string(shipment.get('cost'))
-            ws.cell(row=row_idx, column=13, value=cost_str)
-            
-            sla_value = self.clean_string(shipment.get('sla'))
-            ws.cell(row=row_idx, column=14, value=sla_value)
-            ws.cell(row=row_idx, column=15, value=self.clean_string(shipment.get('weekly')))
-            
-            is_on_time = self.is_on_time(sla_value)
-            ws.cell(row=row_idx, column=16, value=is_on_time)
-            
-            ws.cell(row=row_idx, column=17, value=item['display_period'])
-            ws.cell(row=row_idx, column=18, value=item['month'] if item['month'] else '')
-            ws.cell(row=row_idx, column=19, value=item['year'] if item['year'] else '')
-            
-            cost_numeric = self.clean_number(cost_str)
-            ws.cell(row=row_idx, column=20, value=cost_numeric).number_format = '#,##0'
-            ws.cell(row=row_idx, column=21, value=distance).number_format = '0.00'
-            ws.cell(row=row_idx, column=22, value=item['month'] if item['month'] else '')
-            ws.cell(row=row_idx, column=23, value=item['year'] if item['year'] else '')
-            ws.cell(row=row_idx, column=24, value=item['sort_key'])
+        select = self.raw_data.selector(shipments, shipment_stratum(period_type, 'hub', 'delivery_date', 'weekly'))
+        row = 4
+        with self.raw_data.sidecar(headers[:24], numeric=('Distance (km)', 'Cost Numeric', 'Distance Numeric')) as sidecar:
+            for index, item in enumerate(processed_shipments):
+                shipment = item['data']
+                
+                distance = item['distance']
+                cost_str = self.clean_string(shipment.get('cost'))
+                sla_value = self.clean_string(shipment.get('sla'))
+                month_value = item['month'] if item['month'] else ''
+                year_value = item['year'] if item['year'] else ''
+                client_name = self.clean_string(shipment.get('client_name'))
+                project_name = self.clean_string(shipment.get('project_name'))
+                hub = self.clean_string(shipment.get('hub'))
+                on_time = item['on_time']
+                cost = item['cost']
+                
+                if self.values_only:
+                    stats.add(client_name, project_name, hub, on_time, item['display_period'], cost, distance, month_value, year_value)
+                
+                selected = select(index, shipment)
+                if not selected and sidecar is None:
+                    continue
+                
+                values = [
+                    client_name,
+                    project_name,
+                    item['date_str'],
+                    self.clean_string(shipment.get('drop_point')),
+                    hub,
+                    self.clean_string(shipment.get('order_code')),
+                    self.clean_string(shipment.get('weight')),
+                    ws.styled_cell(distance, number_format='0.00'),
+                    self.clean_string(shipment.get('mitra_code')),
+                    self.clean_string(shipment.get('mitra_name')),
+                    self.clean_string(shipment.get('receiving_date')),
+                    self.clean_string(shipment.get('vehicle_type')),
+                    cost_str,
+                    sla_value,
+                    self.clean_string(shipment.get('weekly')),
+                    on_time,
+                    item['display_period'],
+                    month_value,
+                    year_value,
+                    ws.styled_cell(cost, number_format='#,##0'),
+                    ws.styled_cell(distance, number_format='0.00'),
+                    month_value,
+                    year_value,
+                    item['sort_key']
+                ]
+                self.raw_data.write_row(sidecar, values)
+                if not selected:
+                    continue
+                
+                flags = []
+                if self.mode == 'formula':
+                    flags = [
+                        shipment_range.first_occurrence_flag('B', row),
+                        shipment_range.first_occurrence_flag('E', row)
+                    ]
+                
+                ws.append(values + flags)
+                row += 1
         
-        for col in range(1, 25):
-            ws.column_dimensions[get_column_letter(col)].width = 15
+        return columns, shipment_range, stats
     
-    def create_performance_metrics_with_formulas(self, wb, data, period_type):
+    def create_performance_metrics_with_formulas(self, wb, data, period_type, shipment_range, computed):
         ws = wb.create_sheet("Performance Metrics")
         profile = data.get('profile', {})
         metrics = data.get('metrics', {})
         shipment_count = len(data.get('shipmentData', []))
-        last_data_row = 3 + shipment_count
+        source = shipment_range
         
-        title = ws.cell(row=1, column=1, value=f"PERFORMANCE METRICS - {period_type.upper()} EXCEL FORMULAS")
+        title = ws.cell(row=1, column=1, value=f"PERFORMANCE METRICS - {period_type.upper()} {self.formula_or_value('EXCEL FORMULAS', 'PRECOMPUTED VALUES')}")
         title.font = Font(bold=True, size=16, color=self.primary_color)
         ws.merge_cells("A1:F1")
         
-        ws.cell(row=2, column=1, value="All calculations use formulas referencing Shipment Data and Constants sheets").font = Font(size=9, italic=True, color="6B7280")
+        ws.cell(row=2, column=1, value=self.formula_or_value("All calculations use formulas referencing Shipment Data and Constants sheets", "All calculations are precomputed from Shipment Data and Constants")).font = Font(size=9, italic=True, color="6B7280")
         ws.merge_cells("A2:F2")
         
-        headers = ["Metric", "Formula", "Result", "Unit"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        headers = ["Metric", self.formula_or_value("Formula", "Value"), "Result", "Unit"]
+        self.write_header_row(ws, 3, headers)
         
         if shipment_count > 0:
             total_shipments_row = 4
             ws.cell(row=total_shipments_row, column=1, value="Total Deliveries").font = Font(bold=True)
-            ws.cell(row=total_shipments_row, column=2, value=f"=COUNTA('Shipment Data'!A4:A{last_data_row})").font = Font(italic=True, size=9)
-            ws.cell(row=total_shipments_row, column=3, value=f"=IFERROR(B{total_shipments_row},0)").number_format = '#,##0'
+            ws.cell(row=total_shipments_row, column=2, value=self.formula_or_value(f"=COUNTA({source.column('A')})", computed['Performance Metrics']['C4'])).font = Font(italic=True, size=9)
+            ws.cell(row=total_shipments_row, column=3, value=self.formula_or_value(f"=IFERROR(B{total_shipments_row},0)", computed['Performance Metrics']['C4'])).number_format = '#,##0'
             ws.cell(row=total_shipments_row, column=4, value="deliveries")
             
             on_time_row = 5
             ws.cell(row=on_time_row, column=1, value="On-Time Deliveries").font = Font(bold=True)
-            ws.cell(row=on_time_row, column=2, value=f"=SUM('Shipment Data'!P4:P{last_data_row})").font = Font(italic=True, size=9)
-            ws.cell(row=on_time_row, column=3, value=f"=IFERROR(B{on_time_row},0)").number_format = '#,##0'
+            ws.cell(row=on_time_row, column=2, value=self.formula_or_value(f"=SUM({source.column('P')})", computed['Performance Metrics']['C5'])).font = Font(italic=True, size=9)
+            ws.cell(row=on_time_row, column=3, value=self.formula_or_value(f"=IFERROR(B{on_time_row},0)", computed['Performance Metrics']['C5'])).number_format = '#,##0'
             ws.cell(row=on_time_row, column=4, value="deliveries")
             
             on_time_rate_row = 6
             ws.cell(row=on_time_rate_row, column=1, value="On-Time Rate").font = Font(bold=True)
-            ws.cell(row=on_time_rate_row, column=2, value=f"=IFERROR(IF(C{total_shipments_row}=0,0,C{on_time_row}/C{total_shipments_row}),0)").font = Font(italic=True, size=9)
-            ws.cell(row=on_time_rate_row, column=3, value=f"=IFERROR(B{on_time_rate_row},0)").number_format = '0.00'
+            ws.cell(row=on_time_rate_row, column=2, value=self.formula_or_value(f"=IFERROR(IF(C{total_shipments_row}=0,0,C{on_time_row}/C{total_shipments_row}),0)", computed['Performance Metrics']['C6'])).font = Font(italic=True, size=9)
+            ws.cell(row=on_time_rate_row, column=3, value=self.formula_or_value(f"=IFERROR(B{on_time_rate_row},0)", computed['Performance Metrics']['C6'])).number_format = '0.00'
             ws.cell(row=on_time_rate_row, column=4, value="percentage")
             
             avg_distance_row = 7
             ws.cell(row=avg_distance_row, column=1, value="Average Distance").font = Font(bold=True)
-            ws.cell(row=avg_distance_row, column=2, value=f"=IFERROR(IF(COUNTIF('Shipment Data'!U4:U{last_data_row},\">0\")=0,0,SUM('Shipment Data'!U4:U{last_data_row})/COUNTIF('Shipment Data'!U4:U{last_data_row},\">0\")),0)").font = Font(italic=True, size=9)
-            ws.cell(row=avg_distance_row, column=3, value=f"=IFERROR(B{avg_distance_row},0)").number_format = '0.00'
+            ws.cell(row=avg_distance_row, column=2, value=self.formula_or_value(f"=IFERROR(IF(COUNTIF({source.column('U')},\">0\")=0,0,SUM({source.column('U')})/COUNTIF({source.column('U')},\">0\")),0)", computed['Performance Metrics']['C7'])).font = Font(italic=True, size=9)
+            ws.cell(row=avg_distance_row, column=3, value=self.formula_or_value(f"=IFERROR(B{avg_distance_row},0)", computed['Performance Metrics']['C7'])).number_format = '0.00'
             ws.cell(row=avg_distance_row, column=4, value="km")
         else:
             ws.cell(row=4, column=1, value="No shipment data available").font = Font(color="FF0000")
@@ -585,46 +866,38 @@ class MitraPerformanceChartGeneratorFormula:
         
         unique_projects_row = 8
         ws.cell(row=unique_projects_row, column=1, value="Unique Projects").font = Font(bold=True)
-        ws.cell(row=unique_projects_row, column=2, value=f"=IFERROR(SUMPRODUCT(1/COUNTIF('Shipment Data'!B4:B{last_data_row},'Shipment Data'!B4:B{last_data_row}&\"\")),0)").font = Font(italic=True, size=9)
-        ws.cell(row=unique_projects_row, column=3, value=f"=IFERROR(B{unique_projects_row},0)").number_format = '#,##0'
+        ws.cell(row=unique_projects_row, column=2, value=self.formula_or_value(source.distinct_count('Y'), computed['Performance Metrics']['C8'])).font = Font(italic=True, size=9)
+        ws.cell(row=unique_projects_row, column=3, value=self.formula_or_value(f"=IFERROR(B{unique_projects_row},0)", computed['Performance Metrics']['C8'])).number_format = '#,##0'
         ws.cell(row=unique_projects_row, column=4, value="projects")
         
         unique_hubs_row = 9
         ws.cell(row=unique_hubs_row, column=1, value="Unique Hubs").font = Font(bold=True)
-        ws.cell(row=unique_hubs_row, column=2, value=f"=IFERROR(SUMPRODUCT(1/COUNTIF('Shipment Data'!E4:E{last_data_row},'Shipment Data'!E4:E{last_data_row}&\"\")),0)").font = Font(italic=True, size=9)
-        ws.cell(row=unique_hubs_row, column=3, value=f"=IFERROR(B{unique_hubs_row},0)").number_format = '#,##0'
+        ws.cell(row=unique_hubs_row, column=2, value=self.formula_or_value(source.distinct_count('Z'), computed['Performance Metrics']['C9'])).font = Font(italic=True, size=9)
+        ws.cell(row=unique_hubs_row, column=3, value=self.formula_or_value(f"=IFERROR(B{unique_hubs_row},0)", computed['Performance Metrics']['C9'])).number_format = '#,##0'
         ws.cell(row=unique_hubs_row, column=4, value="hubs")
         
         delivery_rate_row = 10
         ws.cell(row=delivery_rate_row, column=1, value="Delivery Success Rate").font = Font(bold=True)
-        ws.cell(row=delivery_rate_row, column=2, value=f"=IFERROR(IF(C{total_shipments_row}=0,0,(C{total_shipments_row}-({self.safe_float(metrics.get('cancelRate', 0))/100}*C{total_shipments_row}))/C{total_shipments_row}),0)").font = Font(italic=True, size=9)
-        ws.cell(row=delivery_rate_row, column=3, value=f"=IFERROR(B{delivery_rate_row},0)").number_format = '0.00'
+        ws.cell(row=delivery_rate_row, column=2, value=self.formula_or_value(f"=IFERROR(IF(C{total_shipments_row}=0,0,(C{total_shipments_row}-({self.safe_float(metrics.get('cancelRate', 0))/100}*C{total_shipments_row}))/C{total_shipments_row}),0)", computed['Performance Metrics']['C10'])).font = Font(italic=True, size=9)
+        ws.cell(row=delivery_rate_row, column=3, value=self.formula_or_value(f"=IFERROR(B{delivery_rate_row},0)", computed['Performance Metrics']['C10'])).number_format = '0.00'
         ws.cell(row=delivery_rate_row, column=4, value="percentage")
         
         cancel_rate_row = 11
         ws.cell(row=cancel_rate_row, column=1, value="Cancellation Rate").font = Font(bold=True)
-        ws.cell(row=cancel_rate_row, column=2, value=f"=IFERROR(1-C{delivery_rate_row},0)").font = Font(italic=True, size=9)
-        ws.cell(row=cancel_rate_row, column=3, value=f"=IFERROR(B{cancel_rate_row},0)").number_format = '0.00'
+        ws.cell(row=cancel_rate_row, column=2, value=self.formula_or_value(f"=IFERROR(1-C{delivery_rate_row},0)", computed['Performance Metrics']['C11'])).font = Font(italic=True, size=9)
+        ws.cell(row=cancel_rate_row, column=3, value=self.formula_or_value(f"=IFERROR(B{cancel_rate_row},0)", computed['Performance Metrics']['C11'])).number_format = '0.00'
         ws.cell(row=cancel_rate_row, column=4, value="percentage")
         
         growth_rate_row = 12
-        if period_type == 'daily':
-            ws.cell(row=growth_rate_row, column=1, value="Growth Rate").font = Font(bold=True)
-            ws.cell(row=growth_rate_row, column=2, value="=IFERROR(IF(COUNTA('Shipment Data'!Q4:Q1000)<=1,0,('Shipment Data'!Q5-INDEX('Shipment Data'!Q:Q,COUNTA('Shipment Data'!Q4:Q1000)+4))/INDEX('Shipment Data'!Q:Q,COUNTA('Shipment Data'!Q4:Q1000)+4)),0)").font = Font(italic=True, size=9)
-        elif period_type == 'weekly':
-            ws.cell(row=growth_rate_row, column=1, value="Growth Rate").font = Font(bold=True)
-            ws.cell(row=growth_rate_row, column=2, value="=IFERROR(IF(COUNTA('Shipment Data'!Q4:Q1000)<=1,0,('Shipment Data'!Q5-INDEX('Shipment Data'!Q:Q,COUNTA('Shipment Data'!Q4:Q1000)+4))/INDEX('Shipment Data'!Q:Q,COUNTA('Shipment Data'!Q4:Q1000)+4)),0)").font = Font(italic=True, size=9)
-        elif period_type == 'monthly':
-            ws.cell(row=growth_rate_row, column=1, value="Growth Rate").font = Font(bold=True)
-            ws.cell(row=growth_rate_row, column=2, value="=IFERROR(IF(COUNTA('Shipment Data'!R4:R1000)<=1,0,('Shipment Data'!R5-INDEX('Shipment Data'!R:R,COUNTA('Shipment Data'!R4:R1000)+4))/INDEX('Shipment Data'!R:R,COUNTA('Shipment Data'!R4:R1000)+4)),0)").font = Font(italic=True, size=9)
-        else:  # yearly
-            ws.cell(row=growth_rate_row, column=1, value="Growth Rate").font = Font(bold=True)
-            ws.cell(row=growth_rate_row, column=2, value="=IFERROR(IF(COUNTA('Shipment Data'!S4:S1000)<=1,0,('Shipment Data'!S5-INDEX('Shipment Data'!S:S,COUNTA('Shipment Data'!S4:S1000)+4))/INDEX('Shipment Data'!S:S,COUNTA('Shipment Data'!S4:S1000)+4)),0)").font = Font(italic=True, size=9)
-        
-        ws.cell(row=growth_rate_row, column=3, value=f"=IFERROR(B{growth_rate_row},0)").number_format = '+0.00;-0.00'
+        growth_column = {'daily': 'Q', 'weekly': 'Q', 'monthly': 'R'}.get(period_type, 'S')
+        growth_range = source.column(growth_column)
+        ws.cell(row=growth_rate_row, column=1, value="Growth Rate").font = Font(bold=True)
+        ws.cell(row=growth_rate_row, column=2, value=self.formula_or_value(f"=IFERROR(IF(COUNTA({growth_range})<=1,0,('Shipment Data'!{growth_column}5-INDEX({growth_range},COUNTA({growth_range})+1))/INDEX({growth_range},COUNTA({growth_range})+1)),0)", computed['Performance Metrics']['C12'])).font = Font(italic=True, size=9)
+        
+        ws.cell(row=growth_rate_row, column=3, value=self.formula_or_value(f"=IFERROR(B{growth_rate_row},0)", computed['Performance Metrics']['C12'])).number_format = '+0.00;-0.00'
         ws.cell(row=growth_rate_row, column=4, value="percentage")
         
-        ws.cell(row=15, column=1, value="PERFORMANCE SCORE CALCULATION (FORMULAS)").font = Font(bold=True, size=12, color=self.primary_color)
+        ws.cell(row=15, column=1, value=f"PERFORMANCE SCORE CALCULATION ({self.formula_or_value('FORMULAS', 'VALUES')})").font = Font(bold=True, size=12, color=self.primary_color)
         
         score_headers = ["Component", "Weight", "Score", "Weighted Score"]
         for col, header in enumerate(score_headers, 1):
@@ -644,15 +917,15 @@ class MitraPerformanceChartGeneratorFormula:
         score_row = 18
         for component, weight_formula, score_formula in score_components:
             ws.cell(row=score_row, column=1, value=component).font = Font(bold=True)
-            ws.cell(row=score_row, column=2, value=weight_formula).number_format = '0.0%'
-            ws.cell(row=score_row, column=3, value=score_formula).number_format = '0.00'
-            ws.cell(row=score_row, column=4, value=f"=IFERROR(B{score_row}*C{score_row},0)").number_format = '0.00'
+            ws.cell(row=score_row, column=2, value=self.formula_or_value(weight_formula, computed['Performance Metrics'][f'B{score_row}'])).number_format = '0.0%'
+            ws.cell(row=score_row, column=3, value=self.formula_or_value(score_formula, computed['Performance Metrics'][f'C{score_row}'])).number_format = '0.00'
+            ws.cell(row=score_row, column=4, value=self.formula_or_value(f"=IFERROR(B{score_row}*C{score_row},0)", computed['Performance Metrics'][f'D{score_row}'])).number_format = '0.00'
             score_row += 1
         
         total_score_row = 23
         ws.cell(row=total_score_row, column=1, value="TOTAL PERFORMANCE SCORE").font = Font(bold=True, size=11)
         ws.cell(row=total_score_row, column=1).fill = PatternFill(start_color="FEF3C7", end_color="FEF3C7", fill_type="solid")
-        ws.cell(row=total_score_row, column=4, value=f"=IFERROR(SUM(D18:D22),0)").font = Font(bold=True, size=12, color=self.secondary_color)
+        ws.cell(row=total_score_row, column=4, value=self.formula_or_value("=IFERROR(SUM(D18:D22),0)", computed['Performance Metrics']['D23'])).font = Font(bold=True, size=12, color=self.secondary_color)
         ws.cell(row=total_score_row, column=4).number_format = '0.00'
         
         ws.cell(row=25, column=1, value="NOTES ON CONSTANTS:").font = Font(bold=True, size=10, color=self.primary_color)
@@ -664,63 +937,59 @@ class MitraPerformanceChartGeneratorFormula:
         ws.column_dimensions['C'].width = 15
         ws.column_dimensions['D'].width = 15
     
-    def create_cost_analysis_dashboard(self, wb, data, period_type):
+    def create_cost_analysis_dashboard(self, wb, data, period_type, columns, shipment_range, stats, computed):
         ws = wb.create_sheet("Cost Analysis")
         shipment_data = data.get('shipmentData', [])
         shipment_count = len(shipment_data)
-        last_data_row = 3 + shipment_count
+        source = shipment_range
         
-        title = ws.cell(row=1, column=1, value=f"COST ANALYSIS - {period_type.upper()} EXCEL FORMULAS")
+        title = ws.cell(row=1, column=1, value=f"COST ANALYSIS - {period_type.upper()} {self.formula_or_value('EXCEL FORMULAS', 'PRECOMPUTED VALUES')}")
         title.font = Font(bold=True, size=16, color=self.primary_color)
         ws.merge_cells("A1:F1")
         
-        ws.cell(row=2, column=1, value="All cost calculations use formulas referencing Shipment Data sheet").font = Font(size=9, italic=True, color="6B7280")
+        ws.cell(row=2, column=1, value=self.formula_or_value("All cost calculations use formulas referencing Shipment Data sheet", "All cost calculations are precomputed from Shipment Data")).font = Font(size=9, italic=True, color="6B7280")
         ws.merge_cells("A2:F2")
         
-        ws.cell(row=4, column=1, value="COST METRICS (FORMULAS)").font = Font(bold=True, size=12, color=self.primary_color)
+        ws.cell(row=4, column=1, value=f"COST METRICS ({self.formula_or_value('FORMULAS', 'VALUES')})").font = Font(bold=True, size=12, color=self.primary_color)
         
-        headers = ["Metric", "Formula", "Result", "Unit"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=5, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        headers = ["Metric", self.formula_or_value("Formula", "Value"), "Result", "Unit"]
+        self.write_header_row(ws, 5, headers)
         
         if shipment_count > 0:
             total_cost_row = 6
             ws.cell(row=total_cost_row, column=1, value="Total Cost").font = Font(bold=True)
-            ws.cell(row=total_cost_row, column=2, value=f"=IFERROR(SUM('Shipment Data'!T4:T{last_data_row}),0)").font = Font(italic=True, size=9)
-            ws.cell(row=total_cost_row, column=3, value=f"=IFERROR(B{total_cost_row},0)").number_format = 'Rp #,##0'
+            ws.cell(row=total_cost_row, column=2, value=self.formula_or_value(f"=IFERROR(SUM({source.column('T')}),0)", computed['Cost Analysis']['C6'])).font = Font(italic=True, size=9)
+            ws.cell(row=total_cost_row, column=3, value=self.formula_or_value(f"=IFERROR(B{total_cost_row},0)", computed['Cost Analysis']['C6'])).number_format = 'Rp #,##0'
             ws.cell(row=total_cost_row, column=4, value="IDR")
             
             avg_cost_row = 7
             ws.cell(row=avg_cost_row, column=1, value="Average Cost per Delivery").font = Font(bold=True)
-            ws.cell(row=avg_cost_row, column=2, value=f"=IFERROR(IF(COUNTA('Shipment Data'!A4:A{last_data_row})=0,0,C{total_cost_row}/COUNTA('Shipment Data'!A4:A{last_data_row})),0)").font = Font(italic=True, size=9)
-            ws.cell(row=avg_cost_row, column=3, value=f"=IFERROR(B{avg_cost_row},0)").number_format = 'Rp #,##0'
+            ws.cell(row=avg_cost_row, column=2, value=self.formula_or_value(f"=IFERROR(IF(COUNTA({source.column('A')})=0,0,C{total_cost_row}/COUNTA({source.column('A')})),0)", computed['Cost Analysis']['C7'])).font = Font(italic=True, size=9)
+            ws.cell(row=avg_cost_row, column=3, value=self.formula_or_value(f"=IFERROR(B{avg_cost_row},0)", computed['Cost Analysis']['C7'])).number_format = 'Rp #,##0'
             ws.cell(row=avg_cost_row, column=4, value="IDR/delivery")
             
             cost_per_km_row = 8
             ws.cell(row=cost_per_km_row, column=1, value="Cost per Kilometer").font = Font(bold=True)
-            ws.cell(row=cost_per_km_row, column=2, value=f"=IFERROR(IF(SUM('Shipment Data'!U4:U{last_data_row})=0,0,C{total_cost_row}/SUM('Shipment Data'!U4:U{last_data_row})),0)").font = Font(italic=True, size=9)
-            ws.cell(row=cost_per_km_row, column=3, value=f"=IFERROR(B{cost_per_km_row},0)").number_format = 'Rp #,##0'
+            ws.cell(row=cost_per_km_row, column=2, value=self.formula_or_value(f"=IFERROR(IF(SUM({source.column('U')})=0,0,C{total_cost_row}/SUM({source.column('U')})),0)", computed['Cost Analysis']['C8'])).font = Font(italic=True, size=9)
+            ws.cell(row=cost_per_km_row, column=3, value=self.formula_or_value(f"=IFERROR(B{cost_per_km_row},0)", computed['Cost Analysis']['C8'])).number_format = 'Rp #,##0'
             ws.cell(row=cost_per_km_row, column=4, value="IDR/km")
             
             total_distance_row = 9
             ws.cell(row=total_distance_row, column=1, value="Total Distance").font = Font(bold=True)
-            ws.cell(row=total_distance_row, column=2, value=f"=IFERROR(SUM('Shipment Data'!U4:U{last_data_row}),0)").font = Font(italic=True, size=9)
-            ws.cell(row=total_distance_row, column=3, value=f"=IFERROR(B{total_distance_row},0)").number_format = '#,##0.00'
+            ws.cell(row=total_distance_row, column=2, value=self.formula_or_value(f"=IFERROR(SUM({source.column('U')}),0)", computed['Cost Analysis']['C9'])).font = Font(italic=True, size=9)
+            ws.cell(row=total_distance_row, column=3, value=self.formula_or_value(f"=IFERROR(B{total_distance_row},0)", computed['Cost Analysis']['C9'])).number_format = '#,##0.00'
             ws.cell(row=total_distance_row, column=4, value="km")
             
             total_deliveries_row = 10
             ws.cell(row=total_deliveries_row, column=1, value="Total Deliveries").font = Font(bold=True)
-            ws.cell(row=total_deliveries_row, column=2, value=f"=IFERROR(COUNTA('Shipment Data'!A4:A{last_data_row}),0)").font = Font(italic=True, size=9)
-            ws.cell(row=total_deliveries_row, column=3, value=f"=IFERROR(B{total_deliveries_row},0)").number_format = '#,##0'
+            ws.cell(row=total_deliveries_row, column=2, value=self.formula_or_value(f"=IFERROR(COUNTA({source.column('A')}),0)", computed['Cost Analysis']['C10'])).font = Font(italic=True, size=9)
+            ws.cell(row=total_deliveries_row, column=3, value=self.formula_or_value(f"=IFERROR(B{total_deliveries_row},0)", computed['Cost Analysis']['C10'])).number_format = '#,##0'
             ws.cell(row=total_deliveries_row, column=4, value="deliveries")
         else:
             ws.cell(row=6, column=1, value="No shipment data available").font = Font(color="FF0000")
             return
         
-        ws.cell(row=13, column=1, value="COST BY PROJECT (FORMULAS)").font = Font(bold=True, size=12, color=self.primary_color)
+        ws.cell(row=13, column=1, value=f"COST BY PROJECT ({self.formula_or_value('FORMULAS', 'VALUES')})").font = Font(bold=True, size=12, color=self.primary_color)
         
         project_headers = ["Project Name", "Total Cost", "Deliveries", "Avg Cost", "Share"]
         for col, header in enumerate(project_headers, 1):
@@ -730,26 +999,28 @@ class MitraPerformanceChartGeneratorFormula:
             cell.alignment = Alignment(horizontal="center", vertical="center")
         
         projects = {}
-        for shipment in shipment_data:
+        for index, shipment in enumerate(shipment_data):
             project = self.clean_string(shipment.get('project_name'))
             if project != '-':
                 if project not in projects:
                     projects[project] = {'cost': 0, 'count': 0}
-                projects[project]['cost'] += self.clean_number(shipment.get('cost'))
+                projects[project]['cost'] += columns.cost[index]
                 projects[project]['count'] += 1
         
         sorted_projects = sorted(projects.items(), key=lambda x: x[1]['cost'], reverse=True)[:10]
         
+        total_cost = computed['Cost Analysis']['C6']
         project_row = 15
         for project_name, project_data in sorted_projects:
+            sheet_count, sheet_cost = stats.project(project_name)[:2] if self.values_only else (0, 0)
             ws.cell(row=project_row, column=1, value=project_name).font = Font(bold=True, size=9)
-            ws.cell(row=project_row, column=2, value=f"=IFERROR(SUMIF('Shipment Data'!B:B,A{project_row},'Shipment Data'!T:T),0)").number_format = 'Rp #,##0'
-            ws.cell(row=project_row, column=3, value=f"=IFERROR(COUNTIF('Shipment Data'!B:B,A{project_row}),0)").number_format = '#,##0'
-            ws.cell(row=project_row, column=4, value=f"=IFERROR(IF(C{project_row}=0,0,B{project_row}/C{project_row}),0)").number_format = 'Rp #,##0'
-            ws.cell(row=project_row, column=5, value=f"=IFERROR(B{project_row}/C{total_cost_row},0)").number_format = '0.0%'
+            ws.cell(row=project_row, column=2, value=self.formula_or_value(f"=IFERROR(SUMIF({source.column('B')},{exact_criteria(f'A{project_row}')},{source.column('T')}),0)", sheet_cost)).number_format = 'Rp #,##0'
+            ws.cell(row=project_row, column=3, value=self.formula_or_value(f"=IFERROR(COUNTIF({source.column('B')},{exact_criteria(f'A{project_row}')}),0)", sheet_count)).number_format = '#,##0'
+            ws.cell(row=project_row, column=4, value=self.formula_or_value(f"=IFERROR(IF(C{project_row}=0,0,B{project_row}/C{project_row}),0)", self.ratio(sheet_cost, sheet_count))).number_format = 'Rp #,##0'
+            ws.cell(row=project_row, column=5, value=self.formula_or_value(f"=IFERROR(B{project_row}/C{total_cost_row},0)", self.ratio(sheet_cost, total_cost))).number_format = '0.0%'
             project_row += 1
         
-        ws.cell(row=project_row + 2, column=1, value="COST BY HUB (FORMULAS)").font = Font(bold=True, size=12, color=self.primary_color)
+        ws.cell(row=project_row + 2, column=1, value=f"COST BY HUB ({self.formula_or_value('FORMULAS', 'VALUES')})").font = Font(bold=True, size=12, color=self.primary_color)
         
         hub_headers = ["Hub Name", "Total Cost", "Deliveries", "Avg Cost", "Share"]
         hub_header_row = project_row + 3
@@ -760,23 +1031,24 @@ class MitraPerformanceChartGeneratorFormula:
             cell.alignment = Alignment(horizontal="center", vertical="center")
         
         hubs = {}
-        for shipment in shipment_data:
+        for index, shipment in enumerate(shipment_data):
             hub = self.clean_string(shipment.get('hub'))
             if hub != '-':
                 if hub not in hubs:
                     hubs[hub] = {'cost': 0, 'count': 0}
-                hubs[hub]['cost'] += self.clean_number(shipment.get('cost'))
+                hubs[hub]['cost'] += columns.cost[index]
                 hubs[hub]['count'] += 1
         
         sorted_hubs = sorted(hubs.items(), key=lambda x: x[1]['cost'], reverse=True)[:10]
         
         hub_row = hub_header_row + 1
         for hub_name, hub_data in sorted_hubs:
+            sheet_count, sheet_cost = stats.hub(hub_name) if self.values_only else (0, 0)
             ws.cell(row=hub_row, column=1, value=hub_name).font = Font(bold=True, size=9)
-            ws.cell(row=hub_row, column=2, value=f"=IFERROR(SUMIF('Shipment Data'!E:E,A{hub_row},'Shipment Data'!T:T),0)").number_format = 'Rp #,##0'
-            ws.cell(row=hub_row, column=3, value=f"=IFERROR(COUNTIF('Shipment Data'!E:E,A{hub_row}),0)").number_format = '#,##0'
-            ws.cell(row=hub_row, column=4, value=f"=IFERROR(IF(C{hub_row}=0,0,B{hub_row}/C{hub_row}),0)").number_format = 'Rp #,##0'
-            ws.cell(row=hub_row, column=5, value=f"=IFERROR(B{hub_row}/C{total_cost_row},0)").number_format = '0.0%'
+            ws.cell(row=hub_row, column=2, value=self.formula_or_value(f"=IFERROR(SUMIF({source.column('E')},{exact_criteria(f'A{hub_row}')},{source.column('T')}),0)", sheet_cost)).number_format = 'Rp #,##0'
+            ws.cell(row=hub_row, column=3, value=self.formula_or_value(f"=IFERROR(COUNTIF({source.column('E')},{exact_criteria(f'A{hub_row}')}),0)", sheet_count)).number_format = '#,##0'
+            ws.cell(row=hub_row, column=4, value=self.formula_or_value(f"=IFERROR(IF(C{hub_row}=0,0,B{hub_row}/C{hub_row}),0)", self.ratio(sheet_cost, sheet_count))).number_format = 'Rp #,##0'
+            ws.cell(row=hub_row, column=5, value=self.formula_or_value(f"=IFERROR(B{hub_row}/C{total_cost_row},0)", self.ratio(sheet_cost, total_cost))).number_format = '0.0%'
             hub_row += 1
         
         ws.column_dimensions['A'].width = 30
@@ -785,20 +1057,20 @@ class MitraPerformanceChartGeneratorFormula:
         ws.column_dimensions['D'].width = 20
         ws.column_dimensions['E'].width = 15
     
-    def create_trend_analysis_with_formulas(self, wb, data, period_type):
+    def create_trend_analysis_with_formulas(self, wb, data, period_type, columns, shipment_range, stats):
         ws = wb.create_sheet("Delivery Trends")
         shipment_data = data.get('shipmentData', [])
         shipment_count = len(shipment_data)
-        last_data_row = 3 + shipment_count
+        source = shipment_range
         
-        title = ws.cell(row=1, column=1, value=f"DELIVERY TRENDS - {period_type.upper()} FORMULAS (CHRONOLOGICAL)")
+        title = ws.cell(row=1, column=1, value=f"DELIVERY TRENDS - {period_type.upper()} {self.formula_or_value('FORMULAS', 'VALUES')} (CHRONOLOGICAL)")
         title.font = Font(bold=True, size=14, color=self.primary_color)
         ws.merge_cells("A1:F1")
         
-        ws.cell(row=2, column=1, value="All trends calculated using formulas from Shipment Data | Sorted: Oldest first").font = Font(size=9, italic=True, color="6B7280")
+        ws.cell(row=2, column=1, value=self.formula_or_value("All trends calculated using formulas from Shipment Data | Sorted: Oldest first", "All trends precomputed from Shipment Data | Sorted: Oldest first")).font = Font(size=9, italic=True, color="6B7280")
         ws.merge_cells("A2:F2")
         
-        ws.cell(row=4, column=1, value=f"{period_type.upper()} TREND DATA (FORMULAS)").font = Font(bold=True, size=11, color=self.primary_color)
+        ws.cell(row=4, column=1, value=f"{period_type.upper()} TREND DATA ({self.formula_or_value('FORMULAS', 'VALUES')})").font = Font(bold=True, size=11, color=self.primary_color)
         
         trend_headers = ["Period", "Deliveries", "Cost", "Cumulative", "Growth", "Status"]
         
@@ -809,8 +1081,8 @@ class MitraPerformanceChartGeneratorFormula:
             cell.alignment = Alignment(horizontal="center", vertical="center")
         
         periods_dict = {}
-        for shipment in shipment_data:
-            display_period, month_num, year_num, sort_key = self.extract_period_info(shipment.get('delivery_date'), period_type)
+        for index, shipment in enumerate(shipment_data):
+            display_period, month_num, year_num, sort_key = columns.raw_periods[index]
             if display_period and sort_key:
                 if display_period not in periods_dict:
                     periods_dict[display_period] = {
@@ -820,37 +1092,43 @@ class MitraPerformanceChartGeneratorFormula:
                         'month_num': month_num,
                         'year_num': year_num
                     }
-                periods_dict[display_period]['cost'] += self.clean_number(shipment.get('cost'))
+                periods_dict[display_period]['cost'] += columns.cost[index]
                 periods_dict[display_period]['count'] += 1
         
         sorted_periods = sorted(periods_dict.items(), key=lambda x: x[1]['sort_key'])
         
         row_num = 6
+        cumulative = 0
+        previous_count = 0
         for idx, (period_display, period_data) in enumerate(sorted_periods):
             ws.cell(row=row_num, column=1, value=period_display)
+            sheet_count, sheet_cost = self.trend_totals(stats, period_type, period_display, period_data) if self.values_only else (0, 0)
+            cumulative += sheet_count
             
             if period_type == 'monthly':
                 month_num = period_data['month_num']
                 year_num = period_data['year_num']
-                ws.cell(row=row_num, column=2, value=f"=IFERROR(SUMPRODUCT(('Shipment Data'!$V:$V={month_num})*('Shipment Data'!$W:$W={year_num})*1),0)").number_format = '#,##0'
-                ws.cell(row=row_num, column=3, value=f"=IFERROR(SUMIFS('Shipment Data'!$T:$T,'Shipment Data'!$V:$V,{month_num},'Shipment Data'!$W:$W,{year_num}),0)").number_format = 'Rp #,##0'
+                ws.cell(row=row_num, column=2, value=self.formula_or_value(f"=IFERROR(SUMPRODUCT(({source.column('V')}={month_num})*({source.column('W')}={year_num})*1),0)", sheet_count)).number_format = '#,##0'
+                ws.cell(row=row_num, column=3, value=self.formula_or_value(f"=IFERROR(SUMIFS({source.column('T')},{source.column('V')},{month_num},{source.column('W')},{year_num}),0)", sheet_cost)).number_format = 'Rp #,##0'
             else:
-                ws.cell(row=row_num, column=2, value=f"=IFERROR(COUNTIF('Shipment Data'!Q:Q,A{row_num}),0)").number_format = '#,##0'
-                ws.cell(row=row_num, column=3, value=f"=IFERROR(SUMIF('Shipment Data'!Q:Q,A{row_num},'Shipment Data'!T:T),0)").number_format = 'Rp #,##0'
+                ws.cell(row=row_num, column=2, value=self.formula_or_value(f"=IFERROR(COUNTIF({source.column('Q')},A{row_num}),0)", sheet_count)).number_format = '#,##0'
+                ws.cell(row=row_num, column=3, value=self.formula_or_value(f"=IFERROR(SUMIF({source.column('Q')},A{row_num},{source.column('T')}),0)", sheet_cost)).number_format = 'Rp #,##0'
             
-            ws.cell(row=row_num, column=4, value=f"=IFERROR(SUM($B$6:B{row_num}),0)").number_format = '#,##0'
+            ws.cell(row=row_num, column=4, value=self.formula_or_value(f"=IFERROR(SUM($B$6:B{row_num}),0)", cumulative)).number_format = '#,##0'
             
             if idx > 0:
-                ws.cell(row=row_num, column=5, value=f"=IFERROR(IF(B{row_num-1}=0,0,(B{row_num}-B{row_num-1})/B{row_num-1}),0)").number_format = '+0.0%;-0.0%;0.0%'
-                ws.cell(row=row_num, column=6, value=f'=IF(E{row_num}>0.1,"↑ Increasing",IF(E{row_num}>0,"↗ Growth",IF(E{row_num}<-0.1,"↓ Decreasing","→ Stable")))')
+                growth = self.ratio(sheet_count - previous_count, previous_count)
+                ws.cell(row=row_num, column=5, value=self.formula_or_value(f"=IFERROR(IF(B{row_num-1}=0,0,(B{row_num}-B{row_num-1})/B{row_num-1}),0)", growth)).number_format = '+0.0%;-0.0%;0.0%'
+                ws.cell(row=row_num, column=6, value=self.formula_or_value(f'=IF(E{row_num}>0.1,"↑ Increasing",IF(E{row_num}>0,"↗ Growth",IF(E{row_num}<-0.1,"↓ Decreasing","→ Stable")))', self.trend_status(growth)))
             else:
                 ws.cell(row=row_num, column=5, value=0).number_format = '0.0%'
                 ws.cell(row=row_num, column=6, value="Baseline")
             
+            previous_count = sheet_count
             row_num += 1
         
         project_start = row_num + 3
-        ws.cell(row=project_start, column=1, value="TOP PROJECTS BY DELIVERY VOLUME (FORMULAS)").font = Font(bold=True, size=11, color=self.primary_color)
+        ws.cell(row=project_start, column=1, value=f"TOP PROJECTS BY DELIVERY VOLUME ({self.formula_or_value('FORMULAS', 'VALUES')})").font = Font(bold=True, size=11, color=self.primary_color)
         
         project_headers = ["Rank", "Project Name", "Deliveries", "Total Cost", "Percentage"]
         for col, header in enumerate(project_headers, 1):
@@ -860,23 +1138,26 @@ class MitraPerformanceChartGeneratorFormula:
             cell.alignment = Alignment(horizontal="center", vertical="center")
         
         projects = {}
-        for shipment in shipment_data:
+        for index, shipment in enumerate(shipment_data):
             project = self.clean_string(shipment.get('project_name'))
             if project != '-':
                 if project not in projects:
                     projects[project] = {'count': 0, 'cost': 0}
                 projects[project]['count'] += 1
-                projects[project]['cost'] += self.clean_number(shipment.get('cost'))
+                projects[project]['cost'] += columns.cost[index]
         
         sorted_projects = sorted(projects.items(), key=lambda x: x[1]['count'], reverse=True)[:10]
         
         project_row = project_start + 2
         total_range_start = project_row
+        project_counts = []
         for idx, (project_name, project_data) in enumerate(sorted_projects, 1):
+            sheet_count, sheet_cost = stats.project(project_name)[:2] if self.values_only else (0, 0)
+            project_counts.append(sheet_count)
             ws.cell(row=project_row, column=1, value=idx).alignment = Alignment(horizontal="center")
             ws.cell(row=project_row, column=2, value=project_name).font = Font(bold=True, size=9)
-            ws.cell(row=project_row, column=3, value=f"=IFERROR(COUNTIF('Shipment Data'!B:B,B{project_row}),0)").number_format = '#,##0'
-            ws.cell(row=project_row, column=4, value=f"=SUMIF('Shipment Data'!B:B,B{project_row},'Shipment Data'!T:T)").number_format = 'Rp #,##0'
+            ws.cell(row=project_row, column=3, value=self.formula_or_value(f"=IFERROR(COUNTIF({source.column('B')},{exact_criteria(f'B{project_row}')}),0)", sheet_count)).number_format = '#,##0'
+            ws.cell(row=project_row, column=4, value=self.formula_or_value(f"=SUMIF({source.column('B')},{exact_criteria(f'B{project_row}')},{source.column('T')})", sheet_cost)).number_format = 'Rp #,##0'
             
             if idx <= 3:
                 ws.cell(row=project_row, column=2).fill = PatternFill(start_color="D1FAE5", end_color="D1FAE5", fill_type="solid")
@@ -884,97 +1165,95 @@ class MitraPerformanceChartGeneratorFormula:
             project_row += 1
         
         total_range_end = project_row - 1
-        for row_idx in range(total_range_start, total_range_end + 1):
-            ws.cell(row=row_idx, column=5, value=f"=IF(SUM($C${total_range_start}:$C${total_range_end})=0,0,C{row_idx}/SUM($C${total_range_start}:$C${total_range_end}))").number_format = '0.0%'
+        for row_idx, sheet_count in zip(range(total_range_start, total_range_end + 1), project_counts):
+            ws.cell(row=row_idx, column=5, value=self.formula_or_value(f"=IF(SUM($C${total_range_start}:$C${total_range_end})=0,0,C{row_idx}/SUM($C${total_range_start}:$C${total_range_end}))", self.ratio(sheet_count, sum(project_counts)))).number_format = '0.0%'
         
         for col in range(1, 9):
             ws.column_dimensions[get_column_letter(col)].width = 20
     
-    def create_project_analysis_with_formulas(self, wb, data, period_type):
+    def create_project_analysis_with_formulas(self, wb, data, period_type, columns, shipment_range, stats):
         ws = wb.create_sheet("Project Analysis")
         shipment_data = data.get('shipmentData', [])
+        source = shipment_range
         shipment_count = len(shipment_data)
         
         if shipment_count == 0:
             ws.cell(row=1, column=1, value="NO SHIPMENT DATA AVAILABLE").font = Font(bold=True, size=16, color="FF0000")
             return
         
-        title = ws.cell(row=1, column=1, value=f"PROJECT ANALYSIS - {period_type.upper()} FORMULAS")
+        title = ws.cell(row=1, column=1, value=f"PROJECT ANALYSIS - {period_type.upper()} {self.formula_or_value('FORMULAS', 'VALUES')}")
         title.font = Font(bold=True, size=16, color=self.primary_color)
         ws.merge_cells("A1:G1")
         
-        ws.cell(row=2, column=1, value="All project metrics calculated using formulas from Shipment Data").font = Font(size=9, italic=True, color="6B7280")
+        ws.cell(row=2, column=1, value=self.formula_or_value("All project metrics calculated using formulas from Shipment Data", "All project metrics precomputed from Shipment Data")).font = Font(size=9, italic=True, color="6B7280")
         ws.merge_cells("A2:G2")
         
         headers = ["Project Name", "Total Deliveries", "Total Cost", "Avg Cost", "Avg Distance", "On-Time Count", "On-Time Rate"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=4, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 4, headers)
         
         projects = {}
-        for shipment in shipment_data:
+        for index, shipment in enumerate(shipment_data):
             project = self.clean_string(shipment.get('project_name'))
             if project != '-':
                 if project not in projects:
                     projects[project] = {'count': 0, 'cost': 0, 'distance': 0, 'on_time': 0}
                 projects[project]['count'] += 1
-                projects[project]['cost'] += self.clean_number(shipment.get('cost'))
-                projects[project]['distance'] += self.clean_number(shipment.get('distance_km'))
-                projects[project]['on_time'] += self.is_on_time(shipment.get('sla'))
+                projects[project]['cost'] += columns.cost[index]
+                projects[project]['distance'] += columns.distance[index]
+                projects[project]['on_time'] += columns.on_time[index]
         
         sorted_projects = sorted(projects.items(), key=lambda x: x[1]['count'], reverse=True)[:20]
         
         project_row = 5
         for project_name, project_data in sorted_projects:
+            sheet_count, sheet_cost, sheet_distance, sheet_on_time = stats.project(project_name) if self.values_only else (0, 0, 0, 0)
             ws.cell(row=project_row, column=1, value=project_name).font = Font(bold=True, size=9)
-            ws.cell(row=project_row, column=2, value=f"=COUNTIF('Shipment Data'!B:B,A{project_row})").number_format = '#,##0'
-            ws.cell(row=project_row, column=3, value=f"=SUMIF('Shipment Data'!B:B,A{project_row},'Shipment Data'!T:T)").number_format = 'Rp #,##0'
-            ws.cell(row=project_row, column=4, value=f"=IF(B{project_row}=0,0,C{project_row}/B{project_row})").number_format = 'Rp #,##0'
-            ws.cell(row=project_row, column=5, value=f"=IF(B{project_row}=0,0,SUMIF('Shipment Data'!B:B,A{project_row},'Shipment Data'!U:U)/B{project_row})").number_format = '0.00'
-            ws.cell(row=project_row, column=6, value=f"=SUMIFS('Shipment Data'!P:P,'Shipment Data'!B:B,A{project_row})").number_format = '#,##0'
-            ws.cell(row=project_row, column=7, value=f"=IF(B{project_row}=0,0,F{project_row}/B{project_row})").number_format = '0.0%'
+            ws.cell(row=project_row, column=2, value=self.formula_or_value(f"=COUNTIF({source.column('B')},{exact_criteria(f'A{project_row}')})", sheet_count)).number_format = '#,##0'
+            ws.cell(row=project_row, column=3, value=self.formula_or_value(f"=SUMIF({source.column('B')},{exact_criteria(f'A{project_row}')},{source.column('T')})", sheet_cost)).number_format = 'Rp #,##0'
+            ws.cell(row=project_row, column=4, value=self.formula_or_value(f"=IF(B{project_row}=0,0,C{project_row}/B{project_row})", self.ratio(sheet_cost, sheet_count))).number_format = 'Rp #,##0'
+            ws.cell(row=project_row, column=5, value=self.formula_or_value(f"=IF(B{project_row}=0,0,SUMIF({source.column('B')},{exact_criteria(f'A{project_row}')},{source.column('U')})/B{project_row})", self.ratio(sheet_distance, sheet_count))).number_format = '0.00'
+            ws.cell(row=project_row, column=6, value=self.formula_or_value(f"=SUMIFS({source.column('P')},{source.column('B')},{exact_criteria(f'A{project_row}')})", sheet_on_time)).number_format = '#,##0'
+            ws.cell(row=project_row, column=7, value=self.formula_or_value(f"=IF(B{project_row}=0,0,F{project_row}/B{project_row})", self.ratio(sheet_on_time, sheet_count))).number_format = '0.0%'
             project_row += 1
         
         for col in range(1, 8):
             ws.column_dimensions[get_column_letter(col)].width = 20
     
-    def create_performance_overview_sheet(self, wb, data, has_valid_trends, period_type):
+    def create_performance_overview_sheet(self, wb, data, has_valid_trends, period_type, computed):
         ws = wb.create_sheet("Performance Overview")
         
         ws.sheet_view.showGridLines = False
         
-        title = ws.cell(row=1, column=1, value=f"📊 PERFORMANCE OVERVIEW - {period_type.upper()} FORMULA-DRIVEN")
+        title = ws.cell(row=1, column=1, value=f"📊 PERFORMANCE OVERVIEW - {period_type.upper()} {self.formula_or_value('FORMULA-DRIVEN', 'PRECOMPUTED')}")
         title.font = Font(bold=True, size=18, color=self.primary_color)
         title.alignment = Alignment(horizontal="center", vertical="center")
         ws.merge_cells("A1:P1")
         ws.row_dimensions[1].height = 30
         
-        subtitle = ws.cell(row=2, column=1, value="All KPIs calculated using Excel formulas")
+        subtitle = ws.cell(row=2, column=1, value=self.formula_or_value("All KPIs calculated using Excel formulas", "All KPIs precomputed from Shipment Data"))
         subtitle.font = Font(size=11, color="6B7280", italic=True)
         subtitle.alignment = Alignment(horizontal="center")
         ws.merge_cells("A2:P2")
         
         current_row = 4
         
-        ws.cell(row=current_row, column=2, value="KEY PERFORMANCE METRICS (FORMULAS)").font = Font(bold=True, size=14, color=self.primary_color)
+        ws.cell(row=current_row, column=2, value=f"KEY PERFORMANCE METRICS ({self.formula_or_value('FORMULAS', 'VALUES')})").font = Font(bold=True, size=14, color=self.primary_color)
         ws.merge_cells(f"B{current_row}:H{current_row}")
         current_row += 2
         
         kpi_metrics = [
-            ("Total Deliveries", "='Performance Metrics'!C4", "🚚", "E3F2FD", '#,##0'),
-            ("Success Rate", "='Performance Metrics'!C10*100", "✅", "E8F5E9", '0.0"%"'),
-            ("On-Time Rate", "='Performance Metrics'!C6*100", "⏰", "FFF3E0", '0.0"%"'),
-            ("Total Cost", "='Cost Analysis'!C6", "💰", "FFF4E6", 'Rp #,##0'),
-            ("Avg Cost/Delivery", "='Cost Analysis'!C7", "💵", "F3E5F5", 'Rp #,##0'),
-            ("Cost per Km", "='Cost Analysis'!C8", "📏", "E1F5FE", 'Rp #,##0')
+            ("Total Deliveries", "='Performance Metrics'!C4", computed['Performance Metrics']['C4'], "🚚", "E3F2FD", '#,##0'),
+            ("Success Rate", "='Performance Metrics'!C10*100", computed['Performance Metrics']['C10'] * 100, "✅", "E8F5E9", '0.0"%"'),
+            ("On-Time Rate", "='Performance Metrics'!C6*100", computed['Performance Metrics']['C6'] * 100, "⏰", "FFF3E0", '0.0"%"'),
+            ("Total Cost", "='Cost Analysis'!C6", computed['Cost Analysis']['C6'], "💰", "FFF4E6", 'Rp #,##0'),
+            ("Avg Cost/Delivery", "='Cost Analysis'!C7", computed['Cost Analysis']['C7'], "💵", "F3E5F5", 'Rp #,##0'),
+            ("Cost per Km", "='Cost Analysis'!C8", computed['Cost Analysis']['C8'], "📏", "E1F5FE", 'Rp #,##0')
         ]
         
         kpi_row = current_row
         col_offset = 2
         
-        for idx, (label, formula, icon, bg_color, num_format) in enumerate(kpi_metrics):
+        for idx, (label, formula, value, icon, bg_color, num_format) in enumerate(kpi_metrics):
             if idx % 3 == 0 and idx > 0:
                 kpi_row += 5
                 col_offset = 2
@@ -988,7 +1267,7 @@ class MitraPerformanceChartGeneratorFormula:
             ws.cell(row=kpi_row+1, column=col_offset).alignment = Alignment(horizontal="center")
             ws.merge_cells(f"{get_column_letter(col_offset)}{kpi_row+1}:{get_column_letter(col_offset+1)}{kpi_row+1}")
             
-            value_cell = ws.cell(row=kpi_row+2, column=col_offset, value=formula)
+            value_cell = ws.cell(row=kpi_row+2, column=col_offset, value=self.formula_or_value(formula, value))
             value_cell.font = Font(bold=True, size=14, color=self.secondary_color)
             value_cell.alignment = Alignment(horizontal="center", vertical="center")
             value_cell.number_format = num_format
@@ -999,24 +1278,25 @@ class MitraPerformanceChartGeneratorFormula:
         current_row = kpi_row + 8
         
         footer_row = current_row + 2
-        ws.cell(row=footer_row, column=2, value=f"Performance Overview: {datetime.now().strftime('%d %B %Y, %H:%M')} | {period_type.upper()} formulas").font = Font(size=9, italic=True, color="6B7280")
+        ws.cell(row=footer_row, column=2, value=f"Performance Overview: {datetime.now().strftime('%d %B %Y, %H:%M')} | {period_type.upper()} {self.formula_or_value('formulas', 'precomputed values')}").font = Font(size=9, italic=True, color="6B7280")
         
         for col in range(1, 20):
             ws.column_dimensions[get_column_letter(col)].width = 4
     
-    def create_operational_insights_dashboard(self, wb, data, period_type):
+    def create_operational_insights_dashboard(self, wb, data, period_type, columns, shipment_range, stats):
         ws = wb.create_sheet("Operational Insights")
         shipment_data = data.get('shipmentData', [])
+        source = shipment_range
         
         ws.sheet_view.showGridLines = False
         
-        title = ws.cell(row=1, column=1, value=f"⚙️ OPERATIONAL INSIGHTS - {period_type.upper()} FORMULAS")
+        title = ws.cell(row=1, column=1, value=f"⚙️ OPERATIONAL INSIGHTS - {period_type.upper()} {self.formula_or_value('FORMULAS', 'VALUES')}")
         title.font = Font(bold=True, size=18, color=self.primary_color)
         title.alignment = Alignment(horizontal="center", vertical="center")
         ws.merge_cells("A1:P1")
         ws.row_dimensions[1].height = 30
         
-        subtitle = ws.cell(row=2, column=1, value="Operational Metrics with Excel Formulas")
+        subtitle = ws.cell(row=2, column=1, value=self.formula_or_value("Operational Metrics with Excel Formulas", "Operational Metrics with Precomputed Values"))
         subtitle.font = Font(size=11, color="6B7280", italic=True)
         subtitle.alignment = Alignment(horizontal="center")
         ws.merge_cells("A2:P2")
@@ -1024,16 +1304,16 @@ class MitraPerformanceChartGeneratorFormula:
         current_row = 4
         
         if len(shipment_data) > 0:
-            ws.cell(row=current_row, column=1, value=f"📍 HUB COST PERFORMANCE ({period_type.upper()} FORMULAS)").font = Font(bold=True, size=13, color=self.secondary_color)
+            ws.cell(row=current_row, column=1, value=f"📍 HUB COST PERFORMANCE ({period_type.upper()} {self.formula_or_value('FORMULAS', 'VALUES')})").font = Font(bold=True, size=13, color=self.secondary_color)
             current_row += 1
             
             hubs = {}
-            for shipment in shipment_data:
+            for index, shipment in enumerate(shipment_data):
                 hub = self.clean_string(shipment.get('hub'))
                 if hub != '-':
                     if hub not in hubs:
                         hubs[hub] = {'cost': 0, 'count': 0}
-                    hubs[hub]['cost'] += self.clean_number(shipment.get('cost'))
+                    hubs[hub]['cost'] += columns.cost[index]
                     hubs[hub]['count'] += 1
             
             sorted_hubs = sorted(hubs.items(), key=lambda x: x[1]['cost'], reverse=True)[:10]
@@ -1046,12 +1326,13 @@ class MitraPerformanceChartGeneratorFormula:
             hub_ws.cell(row=1, column=3, value="Deliveries")
             
             for idx, (hub_name, hub_data) in enumerate(sorted_hubs, 2):
+                sheet_count, sheet_cost = stats.hub(hub_name) if self.values_only else (0, 0)
                 hub_ws.cell(row=idx, column=1, value=hub_name)
-                hub_ws.cell(row=idx, column=2, value=f"=SUMIF('Shipment Data'!E:E,'Hub Cost Data'!A{idx},'Shipment Data'!T:T)")
-                hub_ws.cell(row=idx, column=3, value=f"=COUNTIF('Shipment Data'!E:E,'Hub Cost Data'!A{idx})")
+                hub_ws.cell(row=idx, column=2, value=self.formula_or_value(f"=SUMIF({source.column('E')},{exact_criteria(f'A{idx}')},{source.column('T')})", sheet_cost))
+                hub_ws.cell(row=idx, column=3, value=self.formula_or_value(f"=COUNTIF({source.column('E')},{exact_criteria(f'A{idx}')})", sheet_count))
             
             hub_chart = BarChart()
-            hub_chart.title = f"Hub Cost Distribution ({period_type.capitalize()} Formula-Based)"
+            hub_chart.title = f"Hub Cost Distribution ({period_type.capitalize()} {self.formula_or_value('Formula-Based', 'Precomputed')})"
             hub_chart.type = "col"
             hub_chart.style = 11
             hub_chart.y_axis.title = "Total Cost (IDR)"
@@ -1071,24 +1352,25 @@ class MitraPerformanceChartGeneratorFormula:
             current_row += 28
         
         footer_row = current_row + 2
-        ws.cell(row=footer_row, column=1, value=f"Operational Insights: {datetime.now().strftime('%d %B %Y, %H:%M')} | {period_type.upper()} Formula-driven").font = Font(size=9, italic=True, color="6B7280")
+        ws.cell(row=footer_row, column=1, value=f"Operational Insights: {datetime.now().strftime('%d %B %Y, %H:%M')} | {period_type.upper()} {self.formula_or_value('Formula-driven', 'Precomputed')}").font = Font(size=9, italic=True, color="6B7280")
         
         for col in range(1, 33):
             ws.column_dimensions[get_column_letter(col)].width = 3
     
-    def create_visual_dashboard(self, wb, data, has_valid_trends, period_type):
+    def create_visual_dashboard(self, wb, data, has_valid_trends, period_type, columns, shipment_range, stats):
         ws = wb.create_sheet("Visual Charts")
         shipment_data = data.get('shipmentData', [])
+        source = shipment_range
         
         ws.sheet_view.showGridLines = False
         
-        title = ws.cell(row=1, column=1, value=f"📊 VISUAL CHARTS - {period_type.upper()} FORMULA-DRIVEN")
+        title = ws.cell(row=1, column=1, value=f"📊 VISUAL CHARTS - {period_type.upper()} {self.formula_or_value('FORMULA-DRIVEN', 'PRECOMPUTED')}")
         title.font = Font(bold=True, size=18, color=self.primary_color)
         title.alignment = Alignment(horizontal="center", vertical="center")
         ws.merge_cells("A1:P1")
         ws.row_dimensions[1].height = 30
         
-        subtitle_text = f"Interactive Charts with {period_type.capitalize()} Formula Calculations" if has_valid_trends else f"⚠️ Limited Charts - Trend Analysis Unavailable"
+        subtitle_text = f"Interactive Charts with {period_type.capitalize()} {self.formula_or_value('Formula Calculations', 'Precomputed Values')}" if has_valid_trends else f"⚠️ Limited Charts - Trend Analysis Unavailable"
         subtitle = ws.cell(row=2, column=1, value=subtitle_text)
         subtitle.font = Font(size=11, color="6B7280" if has_valid_trends else self.warning_color, italic=True, bold=not has_valid_trends)
         subtitle.alignment = Alignment(horizontal="center")
@@ -1098,8 +1380,8 @@ class MitraPerformanceChartGeneratorFormula:
         
         if has_valid_trends and len(shipment_data) > 1:
             periods_dict = {}
-            for shipment in shipment_data:
-                display_period, month_num, year_num, sort_key = self.extract_period_info(shipment.get('delivery_date'), period_type)
+            for index, shipment in enumerate(shipment_data):
+                display_period, month_num, year_num, sort_key = columns.raw_periods[index]
                 if display_period and sort_key:
                     if display_period not in periods_dict:
                         periods_dict[display_period] = {
@@ -1109,11 +1391,11 @@ class MitraPerformanceChartGeneratorFormula:
                             'month_num': month_num,
                             'year_num': year_num
                         }
-                    periods_dict[display_period]['cost'] += self.clean_number(shipment.get('cost'))
+                    periods_dict[display_period]['cost'] += columns.cost[index]
                     periods_dict[display_period]['count'] += 1
             
             if len(periods_dict) >= 2:
-                ws.cell(row=current_row, column=1, value=f"📈 {period_type.upper()} DELIVERY & COST TREND (FORMULAS)").font = Font(bold=True, size=13, color=self.secondary_color)
+                ws.cell(row=current_row, column=1, value=f"📈 {period_type.upper()} DELIVERY & COST TREND ({self.formula_or_value('FORMULAS', 'VALUES')})").font = Font(bold=True, size=13, color=self.secondary_color)
                 current_row += 1
                 
                 trend_ws = wb.create_sheet("Trend Chart Data")
@@ -1129,21 +1411,22 @@ class MitraPerformanceChartGeneratorFormula:
                 
                 for idx, (period_display, period_data) in enumerate(sorted_periods, 2):
                     trend_ws.cell(row=idx, column=1, value=period_display)
+                    sheet_count, sheet_cost = self.trend_totals(stats, period_type, period_display, period_data) if self.values_only else (0, 0)
                     
                     if period_type == 'monthly':
                         month_num = period_data['month_num']
                         year_num = period_data['year_num']
-                        trend_ws.cell(row=idx, column=2, value=f"=IFERROR(SUMPRODUCT(('Shipment Data'!$V:$V={month_num})*('Shipment Data'!$W:$W={year_num})*1),0)")
-                        trend_ws.cell(row=idx, column=3, value=f"=IFERROR(SUMIFS('Shipment Data'!$T:$T,'Shipment Data'!$V:$V,{month_num},'Shipment Data'!$W:$W,{year_num}),0)")
+                        trend_ws.cell(row=idx, column=2, value=self.formula_or_value(f"=IFERROR(SUMPRODUCT(({source.column('V')}={month_num})*({source.column('W')}={year_num})*1),0)", sheet_count))
+                        trend_ws.cell(row=idx, column=3, value=self.formula_or_value(f"=IFERROR(SUMIFS({source.column('T')},{source.column('V')},{month_num},{source.column('W')},{year_num}),0)", sheet_cost))
                     else:
-                        trend_ws.cell(row=idx, column=2, value=f"=IFERROR(COUNTIF('Shipment Data'!Q:Q,A{idx}),0)")
-                        trend_ws.cell(row=idx, column=3, value=f"=IFERROR(SUMIF('Shipment Data'!Q:Q,A{idx},'Shipment Data'!T:T),0)")
+                        trend_ws.cell(row=idx, column=2, value=self.formula_or_value(f"=IFERROR(COUNTIF({source.column('Q')},A{idx}),0)", sheet_count))
+                        trend_ws.cell(row=idx, column=3, value=self.formula_or_value(f"=IFERROR(SUMIF({source.column('Q')},A{idx},{source.column('T')}),0)", sheet_cost))
                     
                     trend_ws.cell(row=idx, column=4, value=period_data.get('month_num', ''))
                     trend_ws.cell(row=idx, column=5, value=period_data.get('year_num', ''))
                 
                 line_chart = LineChart()
-                line_chart.title = f"{period_type.capitalize()} Delivery Volume (Formula-Based)"
+                line_chart.title = f"{period_type.capitalize()} Delivery Volume ({self.formula_or_value('Formula-Based', 'Precomputed')})"
                 line_chart.style = 12
                 line_chart.y_axis.title = "Number of Deliveries"
                 line_chart.x_axis.title = "Period"
@@ -1162,7 +1445,7 @@ class MitraPerformanceChartGeneratorFormula:
                 ws.add_chart(line_chart, f"A{current_row}")
                 
                 cost_chart = LineChart()
-                cost_chart.title = f"{period_type.capitalize()} Cost Trend (Formula-Based)"
+                cost_chart.title = f"{period_type.capitalize()} Cost Trend ({self.formula_or_value('Formula-Based', 'Precomputed')})"
                 cost_chart.style = 12
                 cost_chart.y_axis.title = "Total Cost (IDR)"
                 cost_chart.x_axis.title = "Period"
@@ -1183,8 +1466,8 @@ class MitraPerformanceChartGeneratorFormula:
             ws.cell(row=current_row, column=1, value="⚠️ TREND CHARTS UNAVAILABLE").font = Font(bold=True, size=13, color=self.warning_color)
             current_row += 1
             periods_dict = {}
-            for shipment in shipment_data:
-                display_period, _, _, sort_key = self.extract_period_info(shipment.get('delivery_date'), period_type)
+            for index, shipment in enumerate(shipment_data):
+                display_period, _, _, sort_key = columns.raw_periods[index]
                 if display_period and sort_key:
                     periods_dict[display_period] = sort_key
             period_count = len(periods_dict)
@@ -1193,25 +1476,26 @@ class MitraPerformanceChartGeneratorFormula:
             current_row += 3
         
         footer_row = current_row + 2
-        analysis_type = f"{period_type.capitalize()} Formula-Based Analysis" if has_valid_trends else f"Limited {period_type.capitalize()} Analysis"
+        analysis_type = f"{period_type.capitalize()} {self.formula_or_value('Formula-Based', 'Precomputed')} Analysis" if has_valid_trends else f"Limited {period_type.capitalize()} Analysis"
         ws.cell(row=footer_row, column=1, value=f"Charts Generated: {datetime.now().strftime('%d %B %Y, %H:%M')} | Type: {analysis_type}").font = Font(size=9, italic=True, color="6B7280")
         
         for col in range(1, 33):
             ws.column_dimensions[get_column_letter(col)].width = 3
     
-    def create_advanced_analytics_dashboard(self, wb, data, period_type):
+    def create_advanced_analytics_dashboard(self, wb, data, period_type, columns, shipment_range, stats):
         ws = wb.create_sheet("Advanced Analytics")
         shipment_data = data.get('shipmentData', [])
+        source = shipment_range
         
         ws.sheet_view.showGridLines = False
         
-        title = ws.cell(row=1, column=1, value=f"📊 ADVANCED ANALYTICS - {period_type.upper()} FORMULAS")
+        title = ws.cell(row=1, column=1, value=f"📊 ADVANCED ANALYTICS - {period_type.upper()} {self.formula_or_value('FORMULAS', 'VALUES')}")
         title.font = Font(bold=True, size=18, color=self.primary_color)
         title.alignment = Alignment(horizontal="center", vertical="center")
         ws.merge_cells("A1:P1")
         ws.row_dimensions[1].height = 30
         
-        subtitle = ws.cell(row=2, column=1, value="Deep Dive Analysis with Excel Formulas")
+        subtitle = ws.cell(row=2, column=1, value=self.formula_or_value("Deep Dive Analysis with Excel Formulas", "Deep Dive Analysis with Precomputed Values"))
         subtitle.font = Font(size=11, color="6B7280", italic=True)
         subtitle.alignment = Alignment(horizontal="center")
         ws.merge_cells("A2:P2")
@@ -1219,8 +1503,8 @@ class MitraPerformanceChartGeneratorFormula:
         current_row = 4
         
         periods_dict = {}
-        for shipment in shipment_data:
-            display_period, month_num, year_num, sort_key = self.extract_period_info(shipment.get('delivery_date'), period_type)
+        for index, shipment in enumerate(shipment_data):
+            display_period, month_num, year_num, sort_key = columns.raw_periods[index]
             if display_period and sort_key:
                 if display_period not in periods_dict:
                     periods_dict[display_period] = {
@@ -1230,11 +1514,11 @@ class MitraPerformanceChartGeneratorFormula:
                         'month_num': month_num,
                         'year_num': year_num
                     }
-                periods_dict[display_period]['cost'] += self.clean_number(shipment.get('cost'))
+                periods_dict[display_period]['cost'] += columns.cost[index]
                 periods_dict[display_period]['count'] += 1
         
         if len(periods_dict) > 1:
-            ws.cell(row=current_row, column=1, value=f"📈 COST EFFICIENCY TREND ({period_type.upper()} FORMULAS)").font = Font(bold=True, size=13, color=self.secondary_color)
+            ws.cell(row=current_row, column=1, value=f"📈 COST EFFICIENCY TREND ({period_type.upper()} {self.formula_or_value('FORMULAS', 'VALUES')})").font = Font(bold=True, size=13, color=self.secondary_color)
             current_row += 1
             
             efficiency_ws = wb.create_sheet("Efficiency Data")
@@ -1251,9 +1535,11 @@ class MitraPerformanceChartGeneratorFormula:
                 if period_type == 'monthly':
                     month_num = period_data['month_num']
                     year_num = period_data['year_num']
-                    efficiency_ws.cell(row=idx, column=2, value=f"=IF(COUNTIF('Shipment Data'!V:V,{month_num})=0,0,SUMIFS('Shipment Data'!T:T,'Shipment Data'!V:V,{month_num})/COUNTIF('Shipment Data'!V:V,{month_num}))")
+                    sheet_count, sheet_cost = stats.month(month_num) if self.values_only else (0, 0)
+                    efficiency_ws.cell(row=idx, column=2, value=self.formula_or_value(f"=IF(COUNTIF({source.column('V')},{month_num})=0,0,SUMIFS({source.column('T')},{source.column('V')},{month_num})/COUNTIF({source.column('V')},{month_num}))", self.ratio(sheet_cost, sheet_count)))
                 else:
-                    efficiency_ws.cell(row=idx, column=2, value=f"=IF(COUNTIF('Shipment Data'!Q:Q,A{idx})=0,0,SUMIF('Shipment Data'!Q:Q,A{idx},'Shipment Data'!T:T)/COUNTIF('Shipment Data'!Q:Q,A{idx})")
+                    sheet_count, sheet_cost = stats.period(period_display) if self.values_only else (0, 0)
+                    efficiency_ws.cell(row=idx, column=2, value=self.formula_or_value(f"=IF(COUNTIF({source.column('Q')},A{idx})=0,0,SUMIF({source.column('Q')},A{idx},{source.column('T')})/COUNTIF({source.column('Q')},A{idx}))", self.ratio(sheet_cost, sheet_count)))
             
             efficiency_chart = LineChart()
             efficiency_chart.title = f"Cost Efficiency Trend ({period_type.capitalize()} Formula-Calculated)"
@@ -1275,46 +1561,46 @@ class MitraPerformanceChartGeneratorFormula:
             current_row += 28
         
         footer_row = current_row + 2
-        ws.cell(row=footer_row, column=1, value=f"Advanced Analytics: {datetime.now().strftime('%d %B %Y, %H:%M')} | {period_type.upper()} formulas").font = Font(size=9, italic=True, color="6B7280")
+        ws.cell(row=footer_row, column=1, value=f"Advanced Analytics: {datetime.now().strftime('%d %B %Y, %H:%M')} | {period_type.upper()} {self.formula_or_value('formulas', 'precomputed values')}").font = Font(size=9, italic=True, color="6B7280")
         
         for col in range(1, 33):
             ws.column_dimensions[get_column_letter(col)].width = 3
     
-    def create_management_kpi_dashboard(self, wb, data, has_valid_trends, period_type):
+    def create_management_kpi_dashboard(self, wb, data, has_valid_trends, period_type, computed):
         ws = wb.create_sheet("Management KPI")
         
         ws.sheet_view.showGridLines = False
         
-        title = ws.cell(row=1, column=1, value=f"📊 MANAGEMENT KPI - {period_type.upper()} FORMULAS")
+        title = ws.cell(row=1, column=1, value=f"📊 MANAGEMENT KPI - {period_type.upper()} {self.formula_or_value('FORMULAS', 'VALUES')}")
         title.font = Font(bold=True, size=18, color=self.primary_color)
         title.alignment = Alignment(horizontal="center", vertical="center")
         ws.merge_cells("A1:P1")
         ws.row_dimensions[1].height = 30
         
-        subtitle = ws.cell(row=2, column=1, value="Executive Summary with Formula-Based Calculations")
+        subtitle = ws.cell(row=2, column=1, value=self.formula_or_value("Executive Summary with Formula-Based Calculations", "Executive Summary with Precomputed Calculations"))
         subtitle.font = Font(size=11, color="6B7280", italic=True)
         subtitle.alignment = Alignment(horizontal="center")
         ws.merge_cells("A2:P2")
         
         current_row = 4
         
-        ws.cell(row=current_row, column=2, value="KEY PERFORMANCE INDICATORS (FORMULAS)").font = Font(bold=True, size=14, color=self.primary_color)
+        ws.cell(row=current_row, column=2, value=f"KEY PERFORMANCE INDICATORS ({self.formula_or_value('FORMULAS', 'VALUES')})").font = Font(bold=True, size=14, color=self.primary_color)
         ws.merge_cells(f"B{current_row}:H{current_row}")
         current_row += 2
         
         kpi_data = [
-            ("Total Deliveries", "='Performance Metrics'!C4", "🚚", "E3F2FD", "Volume", '#,##0'),
-            ("Success Rate", "='Performance Metrics'!C10*100", "✅", "E8F5E9", "Quality", '0.0"%"'),
-            ("On-Time Rate", "='Performance Metrics'!C6*100", "⏰", "FFF3E0", "Efficiency", '0.0"%"'),
-            ("Total Cost", "='Cost Analysis'!C6", "💰", "FFF4E6", "Financial", 'Rp #,##0'),
-            ("Avg Cost/Delivery", "='Cost Analysis'!C7", "💵", "F3E5F5", "Cost Efficiency", 'Rp #,##0'),
-            ("Cost per Km", "='Cost Analysis'!C8", "📏", "E1F5FE", "Distance Cost", 'Rp #,##0')
+            ("Total Deliveries", "='Performance Metrics'!C4", computed['Performance Metrics']['C4'], "🚚", "E3F2FD", "Volume", '#,##0'),
+            ("Success Rate", "='Performance Metrics'!C10*100", computed['Performance Metrics']['C10'] * 100, "✅", "E8F5E9", "Quality", '0.0"%"'),
+            ("On-Time Rate", "='Performance Metrics'!C6*100", computed['Performance Metrics']['C6'] * 100, "⏰", "FFF3E0", "Efficiency", '0.0"%"'),
+            ("Total Cost", "='Cost Analysis'!C6", computed['Cost Analysis']['C6'], "💰", "FFF4E6", "Financial", 'Rp #,##0'),
+            ("Avg Cost/Delivery", "='Cost Analysis'!C7", computed['Cost Analysis']['C7'], "💵", "F3E5F5", "Cost Efficiency", 'Rp #,##0'),
+            ("Cost per Km", "='Cost Analysis'!C8", computed['Cost Analysis']['C8'], "📏", "E1F5FE", "Distance Cost", 'Rp #,##0')
         ]
         
         kpi_row = current_row
         col_offset = 2
         
-        for idx, (label, formula, icon, bg_color, category, num_format) in enumerate(kpi_data):
+        for idx, (label, formula, value, icon, bg_color, category, num_format) in enumerate(kpi_data):
             if idx % 3 == 0 and idx > 0:
                 kpi_row += 6
                 col_offset = 2
@@ -1328,7 +1614,7 @@ class MitraPerformanceChartGeneratorFormula:
             ws.cell(row=kpi_row+1, column=col_offset).alignment = Alignment(horizontal="center")
             ws.merge_cells(f"{get_column_letter(col_offset)}{kpi_row+1}:{get_column_letter(col_offset+1)}{kpi_row+1}")
             
-            value_cell = ws.cell(row=kpi_row+2, column=col_offset, value=formula)
+            value_cell = ws.cell(row=kpi_row+2, column=col_offset, value=self.formula_or_value(formula, value))
             value_cell.font = Font(bold=True, size=16, color=self.secondary_color)
             value_cell.alignment = Alignment(horizontal="center", vertical="center")
             value_cell.number_format = num_format
@@ -1359,72 +1645,63 @@ class MitraPerformanceChartGeneratorFormula:
             current_row += 1
         
         footer_row = current_row + 2
-        ws.cell(row=footer_row, column=2, value=f"Management KPI Dashboard: {datetime.now().strftime('%d %B %Y, %H:%M')} | {period_type.upper()} formulas").font = Font(size=9, italic=True, color="6B7280")
+        ws.cell(row=footer_row, column=2, value=f"Management KPI Dashboard: {datetime.now().strftime('%d %B %Y, %H:%M')} | {period_type.upper()} {self.formula_or_value('formulas', 'precomputed values')}").font = Font(size=9, italic=True, color="6B7280")
         
         for col in range(1, 20):
             ws.column_dimensions[get_column_letter(col)].width = 4
 
-def main():
-    try:
-        if len(sys.argv) != 3:
-            raise ValueError("Usage: python mitraPerformanceChartGeneratorFormula.py <input_json> <output_excel>")
-        
-        input_path = sys.argv[1]
-        output_path = sys.argv[2]
-        
-        if not os.path.exists(input_path):
-            raise FileNotFoundError(f"Input file not found: {input_path}")
-        
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        shipment_data = data.get('shipmentData', [])
-        period_type = data.get('periodType', 'monthly')
-        
-        if len(shipment_data) == 0:
-            print(json.dumps({
-                "success": False,
-                "error": "No shipment data available. Cannot generate report without shipment data.",
-                "details": "Please ensure delivery data is available before generating the report."
-            }))
-            sys.exit(1)
-        
-        generator = MitraPerformanceChartGeneratorFormula()
-        result_path = generator.create_workbook_with_charts(data, output_path)
-        
-        data_quality = data.get('dataQuality', {})
-        has_valid_trends = data_quality.get('hasValidTrends', False)
-        trend_count = data_quality.get('trendCount', 0)
-        
-        message = f"Mitra performance chart with {period_type} Excel formulas created successfully"
-        if not has_valid_trends:
-            message = f"Limited analysis report created (only {trend_count} period available). Add more delivery periods for full features."
-        
-        print(json.dumps({
-            "success": True,
-            "output_path": result_path,
-            "message": message,
-            "data_quality": {
-                "has_valid_trends": has_valid_trends,
-                "trend_count": trend_count,
-                "shipment_count": len(shipment_data),
-                "period_type": period_type
-            },
-            "formula_info": {
-                "all_calculations_use_formulas": True,
-                "constants_sheet": "Constants (hidden)",
-                "source_data_sheet": "Shipment Data",
-                "period_filter": period_type,
-                "note": f"All metrics are calculated dynamically using Excel formulas for transparency and auditability with {period_type} period filtering"
-            }
-        }))
+def create_report(data, output_path, mode='formula', engine=None):
+    validate_choice(mode, MODES)
+    
+    shipment_data = data.get('shipmentData', [])
+    period_type = data.get('periodType', 'monthly')
     
-    except Exception as e:
-        print(json.dumps({
+    if len(shipment_data) == 0:
+        return {
             "success": False,
-            "error": str(e)
-        }))
-        sys.exit(1)
+            "error": "No shipment data available. Cannot generate report without shipment data.",
+            "details": "Please ensure delivery data is available before generating the report."
+        }
+    
+    generator = MitraPerformanceChartGeneratorFormula(mode=mode, engine=engine)
+    result_path = generator.create_workbook(data, output_path)
+    
+    data_quality = data.get('dataQuality', {})
+    has_valid_trends = data_quality.get('hasValidTrends', False)
+    trend_count = data_quality.get('trendCount', 0)
+    
+    message = f"Mitra performance chart with {period_type} {'precomputed values' if generator.values_only else 'Excel formulas'} created successfully"
+    if not has_valid_trends:
+        message = f"Limited analysis report created (only {trend_count} period available). Add more delivery periods for full features."
+    
+    return {
+        "success": True,
+        "output_path": result_path,
+        "message": message,
+        "mode": mode,
+        "raw_data": generator.raw_data.summary(len(shipment_data), result_path),
+        "data_quality": {
+            "has_valid_trends": has_valid_trends,
+            "trend_count": trend_count,
+            "shipment_count": len(shipment_data),
+            "period_type": period_type
+        },
+        "formula_info": {
+            "all_calculations_use_formulas": not generator.values_only,
+            "constants_sheet": "Constants (hidden)",
+            "source_data_sheet": "Shipment Data",
+            "period_filter": period_type,
+            "note": f"All metrics are precomputed from Shipment Data and written as values with {period_type} period filtering" if generator.values_only else f"All metrics are calculated dynamically using Excel formulas for transparency and auditability with {period_type} period filtering"
+        }
+    }
+
+def generate_report(input_path, output_path, mode='formula', engine=None):
+    data = load_report_input(input_path)
+    
+    return create_report(data, output_path, mode, engine)
+
+def main():
+    run_cli("mitraPerformanceChartGeneratorFormula.py", generate_report, MODES)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
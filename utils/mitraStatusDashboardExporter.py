@@ -1,38 +1,20 @@
-import sys
-import json
-import os
 from datetime import datetime
-import openpyxl
 from openpyxl.chart import BarChart, LineChart, PieChart, Reference
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
+from reportStyles import Font, PatternFill, Alignment, Border, Side
+from reportGenerator import ReportGenerator, SheetStage, run_cli
+from reportInput import load_report_input
 
-class MitraStatusDashboardExporter:
-    def __init__(self):
-        self.primary_color = "1E3A8A"
-        self.secondary_color = "3B82F6"
-        self.success_color = "10B981"
-        self.warning_color = "F59E0B"
-        self.danger_color = "EF4444"
-        self.light_bg = "F3F4F6"
-        self.header_bg = "1E40AF"
-        
-    def create_workbook_with_data(self, data, output_path):
-        wb = openpyxl.Workbook()
-        
-        self.create_executive_summary(wb, data)
-        self.create_status_distribution_sheet(wb, data)
-        self.create_monthly_trends_sheet(wb, data)
-        self.create_weekly_trends_sheet(wb, data)
-        self.create_rider_metrics_sheet(wb, data)
-        self.create_visual_charts(wb, data)
-        
-        if 'Sheet' in wb.sheetnames:
-            wb.remove(wb['Sheet'])
-        
-        wb.active = wb['Executive Summary']
-        wb.save(output_path)
-        return output_path
+class MitraStatusDashboardExporter(ReportGenerator):
+    stages = [
+        SheetStage('create_executive_summary'),
+        SheetStage('create_status_distribution_sheet'),
+        SheetStage('create_monthly_trends_sheet'),
+        SheetStage('create_weekly_trends_sheet'),
+        SheetStage('create_rider_metrics_sheet'),
+        SheetStage('create_visual_charts')
+    ]
+    active_sheet = 'Executive Summary'
     
     def create_executive_summary(self, wb, data):
         ws = wb.create_sheet("Executive Summary", 0)
@@ -105,11 +87,7 @@ class MitraStatusDashboardExporter:
         ws.merge_cells("A1:E1")
         
         headers = ["Status", "Count", "Percentage", "Category", "Notes"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 3, headers)
         
         sorted_status = sorted(status_dist, key=lambda x: x.get('count', 0), reverse=True)
         
@@ -152,11 +130,7 @@ class MitraStatusDashboardExporter:
             "Retention %", "Churn %", "Growth Rate", "Status"
         ]
         
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        self.write_header_row(ws, 3, headers, wrap_text=True)
         
         for idx, item in enumerate(monthly_data, 4):
             ws.cell(row=idx, column=1, value=item.get('month', ''))
@@ -219,11 +193,7 @@ class MitraStatusDashboardExporter:
             "New Joining", "Retention %", "Churn %", "Week Status", "Performance"
         ]
         
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=3, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        self.write_header_row(ws, 3, headers, wrap_text=True)
         
         for idx, item in enumerate(weekly_data, 4):
             ws.cell(row=idx, column=1, value=item.get('week', ''))
@@ -375,35 +345,23 @@ class MitraStatusDashboardExporter:
         for col in range(1, 33):
             ws.column_dimensions[get_column_letter(col)].width = 3
 
-def main():
-    try:
-        if len(sys.argv) != 3:
-            raise ValueError("Usage: python mitraStatusDashboardExporter.py <input_json> <output_excel>")
-        
-        input_path = sys.argv[1]
-        output_path = sys.argv[2]
-        
-        if not os.path.exists(input_path):
-            raise FileNotFoundError(f"Input file not found: {input_path}")
-        
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        exporter = MitraStatusDashboardExporter()
-        result_path = exporter.create_workbook_with_data(data, output_path)
-        
-        print(json.dumps({
-            "success": True,
-            "output_path": result_path,
-            "message": "Mitra status dashboard exported successfully"
-        }))
+def create_report(data, output_path, engine=None):
+    exporter = MitraStatusDashboardExporter(engine=engine)
+    result_path = exporter.create_workbook(data, output_path)
+    
+    return {
+        "success": True,
+        "output_path": result_path,
+        "message": "Mitra status dashboard exported successfully"
+    }
+
+def generate_report(input_path, output_path, engine=None):
+    data = load_report_input(input_path)
     
-    except Exception as e:
-        print(json.dumps({
-            "success": False,
-            "error": str(e)
-        }))
-        sys.exit(1)
+    return create_report(data, output_path, engine)
+
+def main():
+    run_cli("mitraStatusDashboardExporter.py", generate_report)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,16 +1,133 @@
 import os
 import sys
+import json
+import time
+import shutil
 import argparse
-import requests
-from pymongo import MongoClient
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
 import tempfile
+from reportStyles import Font, Alignment, PatternFill
+
+DEFAULT_SYNC_WORKERS = int(os.getenv("BLITZ_SYNC_WORKERS", "1"))
+ORDER_FIELDS = [
+    "merchant_order_id", "weight", "width", "height", "length",
+    "payment_type", "cod_amount", "sender_name", "sender_phone",
+    "pickup_instructions", "consignee_name", "consignee_phone",
+    "destination_district", "destination_city", "destination_province",
+    "destination_postalcode", "destination_address", "dropoff_lat",
+    "dropoff_long", "dropoff_instructions", "item_value", "product_details",
+    "assigned_to_driver_id", "assignment_status"
+]
+DRIVER_PROJECTION = {"_id": 0, "createdAt": 0, "updatedAt": 0, "__v": 0}
+DRIVER_CACHE_TTL = int(os.getenv("BLITZ_DRIVER_CACHE_TTL", "0"))
+DRIVER_CACHE_PATH = os.getenv("BLITZ_DRIVER_CACHE_PATH", os.path.join(tempfile.gettempdir(), "blitz-driver-cache.json"))
+VALIDATION_FIELDS = ["sender_name", "business", "city", "service_type", "business_hub", "location"]
+VALIDATION_INDEXES = ["sender_name", "updatedAt"]
+VALIDATION_CACHE_TTL = int(os.getenv("BLITZ_VALIDATION_CACHE_TTL", "60"))
+
+
+class DriverCache:
+    def __init__(self, path=DRIVER_CACHE_PATH, ttl=DRIVER_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+
+    @property
+    def enabled(self):
+        return bool(self.path) and self.ttl > 0
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
+
+    def fetch(self, project, driver_ids):
+        if not self.enabled:
+            return {}
+
+        now = time.time()
+        entries = self._load().get(project, {})
+        return {
+            driver_id: entries[driver_id]["driver"]
+            for driver_id in driver_ids
+            if driver_id in entries and now - entries[driver_id]["fetched_at"] < self.ttl
+        }
+
+    def store(self, project, drivers):
+        if not self.enabled or not drivers:
+            return False
+
+        now = time.time()
+        entries = self._load()
+        project_entries = {
+            driver_id: entry for driver_id, entry in entries.get(project, {}).items()
+            if now - entry["fetched_at"] < self.ttl
+        }
+        project_entries.update({driver_id: {"fetched_at": now, "driver": driver} for driver_id, driver in drivers.items()})
+        entries[project] = project_entries
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f, default=str)
+                os.replace(temp_path, self.path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        except OSError:
+            return False
+
+        return True
+
+
+class ValidationCache:
+    def __init__(self, ttl=VALIDATION_CACHE_TTL):
+        self.ttl = ttl
+        self.entries = None
+        self.version = None
+        self.checked_at = 0
+
+    def version_of(self, collection):
+        latest = next(iter(collection.find({}, {"_id": 0, "updatedAt": 1}).sort("updatedAt", -1).limit(1)), {})
+        return collection.estimated_document_count(), latest.get("updatedAt")
+
+    def lookup(self, collection):
+        now = time.time()
+        if self.entries is not None and now - self.checked_at < self.ttl:
+            return self.entries
+
+        version = self.version_of(collection)
+        if self.entries is None or version != self.version:
+            projection = {"_id": 0, **{field: 1 for field in VALIDATION_FIELDS}}
+            self.entries = {entry["sender_name"]: entry for entry in collection.find({}, projection)}
+            self.version = version
+
+        self.checked_at = now
+        return self.entries
+
+    def invalidate(self):
+        self.entries = None
+        self.version = None
 
 
 class PMSBlitzIntegration:
-    def __init__(self, pms_api_url="http://localhost:5000/api"):
-        self.pms_api_url = pms_api_url
+    def __init__(self, workers=None, driver_cache=None, validation_cache=None):
+        self.workers = DEFAULT_SYNC_WORKERS if workers is None else workers
+        self.driver_cache = DriverCache() if driver_cache is None else driver_cache
+        self.validation_cache = ValidationCache() if validation_cache is None else validation_cache
         self.blitz_username = os.getenv("BLITZ_USERNAME")
         self.blitz_password = os.getenv("BLITZ_PASSWORD")
         self.mongo_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
@@ -19,25 +136,48 @@ class PMSBlitzIntegration:
         if not self.blitz_username or not self.blitz_password:
             raise ValueError("BLITZ_USERNAME and BLITZ_PASSWORD environment variables are required")
 
+        if self.workers < 1:
+            raise ValueError("Sync workers must be at least 1")
+
         self._mongo_client = None
+        self._mongo_lock = threading.Lock()
+        self._validation_lock = threading.Lock()
+        self._validation_index_checked = False
 
     def _get_db(self):
-        if self._mongo_client is None:
-            self._mongo_client = MongoClient(self.mongo_uri)
+        with self._mongo_lock:
+            if self._mongo_client is None:
+                self._mongo_client = MongoClient(self.mongo_uri)
         return self._mongo_client[self.mongo_db]
 
+    def _validation_collection(self):
+        collection = self._get_db()["adminpanel_validations"]
+
+        if not self._validation_index_checked:
+            self._validation_index_checked = True
+            try:
+                leading = {index["key"][0][0] for index in collection.index_information().values()}
+                for field in VALIDATION_INDEXES:
+                    if field not in leading:
+                        collection.create_index(field, name=f"{field}_1")
+                        print(f"✅ Created {field} index on adminpanel_validations")
+            except PyMongoError as e:
+                print(f"⚠ Could not ensure indexes on adminpanel_validations: {e}")
+
+        return collection
+
+    def _validation_map(self):
+        with self._validation_lock:
+            return self.validation_cache.lookup(self._validation_collection())
+
     def validate_sender(self, sender_name):
-        db = self._get_db()
-        entry = db["adminpanel_validations"].find_one({"sender_name": sender_name})
-        return entry
+        return self._validation_map().get(sender_name)
 
     def validate_senders_for_orders(self, orders):
         unique_sender_names = list({o.get("sender_name") for o in orders if o.get("sender_name")})
-        db = self._get_db()
-
-        entries = db["adminpanel_validations"].find({"sender_name": {"$in": unique_sender_names}})
-        validation_map = {e["sender_name"]: e for e in entries}
+        entries = self._validation_map()
 
+        validation_map = {name: entries[name] for name in unique_sender_names if name in entries}
         invalid = [name for name in unique_sender_names if name not in validation_map]
 
         return validation_map, invalid
@@ -46,35 +186,26 @@ class PMSBlitzIntegration:
         print(f"\n📦 Fetching assigned orders from PMS for project: {project}")
 
         try:
-            response = requests.get(
-                f"{self.pms_api_url}/merchant-orders/{project}/all",
-                timeout=30
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            if not data.get("success"):
-                print(f"❌ Failed to fetch orders: {data.get('message')}")
-                return []
-
-            all_orders = data.get("data", [])
-            assigned_orders = [o for o in all_orders if o.get("assignment_status") == "assigned"]
-
+            query = {"assignment_status": "assigned"}
             if driver_ids:
-                assigned_orders = [o for o in assigned_orders if o.get("assigned_to_driver_id") in driver_ids]
+                query["assigned_to_driver_id"] = {"$in": list(driver_ids)}
                 print(f"   Filtered by drivers: {', '.join(driver_ids)}")
 
-            print(f"✅ Found {len(assigned_orders)} assigned orders out of {len(all_orders)} total")
+            collection = self._get_db()[f"{project}_merchant_orders"]
+            projection = {field: 1 for field in ORDER_FIELDS}
+            assigned_orders = list(collection.find(query, projection).sort("createdAt", -1))
+
+            print(f"✅ Found {len(assigned_orders)} assigned orders")
             return assigned_orders
 
         except Exception as e:
             print(f"❌ Error fetching orders: {e}")
             return []
 
-    def create_excel_from_orders(self, orders):
+    def create_excel_from_orders(self, orders, directory=None):
         print(f"\n📝 Creating Excel file from {len(orders)} orders")
 
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx")
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx", dir=directory)
         temp_path = temp_file.name
         temp_file.close()
 
@@ -92,13 +223,14 @@ class PMSBlitzIntegration:
 
         header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
         header_font = Font(bold=True, color="FFFFFF", size=10, name="Calibri")
+        header_alignment = Alignment(horizontal="center", vertical="center")
 
         for col_num, header in enumerate(headers, 1):
             cell = ws.cell(row=1, column=col_num)
             cell.value = header
             cell.fill = header_fill
             cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+            cell.alignment = header_alignment
 
         for row_idx, order in enumerate(orders, 2):
             ws.cell(row=row_idx, column=1).value = order.get("merchant_order_id", "")
@@ -132,35 +264,37 @@ class PMSBlitzIntegration:
 
         return temp_path
 
-    def get_driver_info(self, project, driver_id):
-        print(f"\n👤 Fetching driver info for driver_id: {driver_id}")
+    def get_drivers_info(self, project, driver_ids):
+        driver_ids = list(dict.fromkeys(str(driver_id) for driver_id in driver_ids))
+        print(f"\n👤 Fetching driver info for {len(driver_ids)} driver(s)")
 
-        try:
-            response = requests.get(
-                f"{self.pms_api_url}/delivery/{project}/all",
-                timeout=30
-            )
-            response.raise_for_status()
+        drivers = self.driver_cache.fetch(project, driver_ids)
+        missing = [driver_id for driver_id in driver_ids if driver_id not in drivers]
+        if drivers:
+            print(f"   {len(drivers)} driver(s) served from cache")
 
-            data = response.json()
-            if not data.get("success"):
-                return None
+        if missing:
+            try:
+                collection = self._get_db()[f"{project}_delivery"]
+                fetched = {driver["driver_id"]: driver for driver in collection.find({"driver_id": {"$in": missing}}, DRIVER_PROJECTION)}
+                self.driver_cache.store(project, fetched)
+                drivers.update(fetched)
+            except Exception as e:
+                print(f"❌ Error fetching driver info: {e}")
 
-            drivers = data.get("data", [])
-            driver = next((d for d in drivers if d.get("driver_id") == str(driver_id)), None)
+        return drivers
 
-            if driver:
-                print(f"✅ Found driver: {driver.get('driver_name')}")
-            else:
-                print(f"⚠ Driver {driver_id} not found")
+    def get_driver_info(self, project, driver_id):
+        driver = self.get_drivers_info(project, [driver_id]).get(str(driver_id))
 
-            return driver
+        if driver:
+            print(f"✅ Found driver: {driver.get('driver_name')}")
+        else:
+            print(f"⚠ Driver {driver_id} not found")
 
-        except Exception as e:
-            print(f"❌ Error fetching driver info: {e}")
-            return None
+        return driver
 
-    def run_blitz_automation(self, excel_file, driver_id, validation_entry, driver_lat=None, driver_lon=None):
+    def run_blitz_automation(self, excel_file, driver_id, validation_entry, driver_lat=None, driver_lon=None, work_dir=None):
         business = validation_entry.get("business", 12)
         city = validation_entry.get("city", 9)
         service_type = validation_entry.get("service_type", 2)
@@ -183,7 +317,10 @@ class PMSBlitzIntegration:
             sys.path.insert(0, script_dir)
             from automation import BlitzAutomation
 
-            automation = BlitzAutomation()
+            automation = BlitzAutomation(
+                profile_dir=os.path.join(work_dir, "profile") if work_dir else None,
+                screenshot_dir=work_dir
+            )
             batch_id = automation.run(
                 username=self.blitz_username,
                 password=self.blitz_password,
@@ -210,43 +347,88 @@ class PMSBlitzIntegration:
             traceback.print_exc()
             return None
 
+    def _batch_number(self, batch_id):
+        try:
+            number = float(batch_id)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid batch_id: {batch_id}")
+        return int(number) if number.is_integer() else number
+
+    def bulk_update_status(self, project, order_ids, status, batch_id=None):
+        results = {}
+        object_ids = {}
+        for order_id in order_ids:
+            try:
+                object_ids[order_id] = ObjectId(order_id)
+            except (InvalidId, TypeError):
+                results[order_id] = "invalid_id"
+
+        if not object_ids:
+            return results
+
+        try:
+            update = {"assignment_status": status, "updatedAt": datetime.now(timezone.utc)}
+            if batch_id is not None:
+                update["batch_id"] = self._batch_number(batch_id)
+
+            collection = self._get_db()[f"{project}_merchant_orders"]
+            existing = {doc["_id"] for doc in collection.find({"_id": {"$in": list(object_ids.values())}}, {"_id": 1})}
+
+            pending = []
+            for order_id, object_id in object_ids.items():
+                if object_id in existing:
+                    pending.append(order_id)
+                else:
+                    results[order_id] = "not_found"
+
+            if not pending:
+                return results
+
+            operations = [UpdateOne({"_id": object_ids[order_id]}, {"$set": update}) for order_id in pending]
+            failed = {}
+            try:
+                collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                failed = {error["index"]: error.get("errmsg", "write error") for error in e.details.get("writeErrors", [])}
+
+            for index, order_id in enumerate(pending):
+                results[order_id] = f"error: {failed[index]}" if index in failed else "updated"
+
+        except (PyMongoError, ValueError) as e:
+            for order_id in object_ids:
+                results.setdefault(order_id, f"error: {e}")
+
+        return results
+
     def update_to_created_status(self, project, order_ids, batch_id):
         print(f"\n💾 Updating orders to 'created' status with batch_id: {batch_id}")
 
+        results = self.bulk_update_status(project, order_ids, "created", batch_id)
         for order_id in order_ids:
-            try:
-                response = requests.put(
-                    f"{self.pms_api_url}/merchant-orders/{project}/{order_id}",
-                    json={"batch_id": batch_id, "assignment_status": "created"},
-                    timeout=30
-                )
-                if response.status_code == 200:
-                    print(f"   ✅ Updated {order_id} to 'created' status")
-                else:
-                    print(f"   ⚠ Failed to update {order_id}")
-            except Exception as e:
-                print(f"   ❌ Error updating {order_id}: {e}")
+            result = results[order_id]
+            if result == "updated":
+                print(f"   ✅ Updated {order_id} to 'created' status")
+            elif result.startswith("error"):
+                print(f"   ❌ Error updating {order_id}: {result[7:]}")
+            else:
+                print(f"   ⚠ Failed to update {order_id} ({result})")
+
+        return results
 
     def update_order_status(self, project, order_ids, batch_id=None):
         print(f"\n🔒 Locking orders with batch_id: {batch_id}")
 
+        results = self.bulk_update_status(project, order_ids, "in_progress", batch_id or None)
         for order_id in order_ids:
-            try:
-                update_data = {"assignment_status": "in_progress"}
-                if batch_id:
-                    update_data["batch_id"] = batch_id
-
-                response = requests.put(
-                    f"{self.pms_api_url}/merchant-orders/{project}/{order_id}",
-                    json=update_data,
-                    timeout=30
-                )
-                if response.status_code == 200:
-                    print(f"   ✅ Locked {order_id}")
-                else:
-                    print(f"   ⚠ Failed to lock {order_id}")
-            except Exception as e:
-                print(f"   ❌ Error locking {order_id}: {e}")
+            result = results[order_id]
+            if result == "updated":
+                print(f"   ✅ Locked {order_id}")
+            elif result.startswith("error"):
+                print(f"   ❌ Error locking {order_id}: {result[7:]}")
+            else:
+                print(f"   ⚠ Failed to lock {order_id} ({result})")
+
+        return results
 
     def _process_sender_group(self, project, sender_name, orders, validation_entry, driver_id, driver_info):
         coordinates = validation_entry.get("location", {}).get("coordinates", [])
@@ -257,9 +439,19 @@ class PMSBlitzIntegration:
         print(f"   business={validation_entry.get('business')}, city={validation_entry.get('city')}, service_type={validation_entry.get('service_type')}, hub_id={validation_entry.get('business_hub')}")
         print(f"{'='*70}")
 
-        excel_file = self.create_excel_from_orders(orders)
+        result = {
+            "driver_id": driver_id,
+            "sender_name": sender_name,
+            "orders": len(orders),
+            "batch_id": None,
+            "updated": 0,
+            "success": False
+        }
+        work_dir = tempfile.mkdtemp(prefix="blitz_sync_")
 
         try:
+            excel_file = self.create_excel_from_orders(orders, work_dir)
+
             driver_lat = coordinates[1] if len(coordinates) >= 2 else (driver_info.get("lat") if driver_info else -6.212149256431801)
             driver_lon = coordinates[0] if len(coordinates) >= 2 else (driver_info.get("lon") if driver_info else 106.91958799124394)
 
@@ -268,7 +460,8 @@ class PMSBlitzIntegration:
                 driver_id=int(driver_id),
                 validation_entry=validation_entry,
                 driver_lat=driver_lat,
-                driver_lon=driver_lon
+                driver_lon=driver_lon,
+                work_dir=work_dir
             )
 
             if batch_id:
@@ -278,17 +471,67 @@ class PMSBlitzIntegration:
                 print(f"{'='*70}")
 
                 order_ids = [str(o["_id"]) for o in orders]
-                self.update_to_created_status(project, order_ids, batch_id)
+                updates = self.update_to_created_status(project, order_ids, batch_id)
+                result["batch_id"] = batch_id
+                result["updated"] = sum(1 for status in updates.values() if status == "updated")
+                result["success"] = True
             else:
                 print(f"\n❌ Batch creation failed for sender: {sender_name}")
+                result["error"] = "Batch creation failed"
+
+        except Exception as e:
+            print(f"\n❌ Error processing sender {sender_name}: {e}")
+            result["error"] = str(e)
 
         finally:
-            if os.path.exists(excel_file):
-                try:
-                    os.remove(excel_file)
-                    print(f"\n🗑️  Temporary file removed: {excel_file}")
-                except Exception:
-                    pass
+            screenshots = [name for name in os.listdir(work_dir) if name.endswith(".png")] if os.path.isdir(work_dir) else []
+            if screenshots:
+                for name in os.listdir(work_dir):
+                    path = os.path.join(work_dir, name)
+                    if os.path.isdir(path):
+                        shutil.rmtree(path, ignore_errors=True)
+                    elif name not in screenshots:
+                        os.remove(path)
+                print(f"\n📸 {len(screenshots)} screenshot(s) kept in: {work_dir}")
+            else:
+                shutil.rmtree(work_dir, ignore_errors=True)
+                print(f"\n🗑️  Temporary files removed: {work_dir}")
+
+        return result
+
+    def _run_sender_groups(self, project, groups):
+        workers = min(self.workers, len(groups))
+        if workers <= 1:
+            return [self._process_sender_group(project, *group) for group in groups]
+
+        print(f"\n⚙️  Processing {len(groups)} sender group(s) with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._process_sender_group, project, *group) for group in groups]
+            return [future.result() for future in futures]
+
+    def _summarize_sync(self, results):
+        summary = {
+            "groups": len(results),
+            "succeeded": sum(1 for result in results if result["success"]),
+            "failed": sum(1 for result in results if not result["success"]),
+            "orders": sum(result["orders"] for result in results),
+            "updated": sum(result["updated"] for result in results),
+            "batches": [result["batch_id"] for result in results if result["batch_id"]],
+            "results": results
+        }
+
+        print(f"\n{'='*70}")
+        print("✅ SYNC COMPLETED")
+        print(f"   Sender groups: {summary['succeeded']}/{summary['groups']} succeeded")
+        print(f"   Orders updated: {summary['updated']}/{summary['orders']}")
+        if summary["batches"]:
+            print(f"   Batches: {', '.join(str(batch_id) for batch_id in summary['batches'])}")
+        for result in results:
+            if not result["success"]:
+                print(f"   ❌ Driver {result['driver_id']} / {result['sender_name']}: {result.get('error')}")
+        print(f"{'='*70}")
+
+        return summary
 
     def sync_assigned_orders(self, project, driver_ids=None):
         print(f"\n{'='*70}")
@@ -323,12 +566,19 @@ class PMSBlitzIntegration:
 
         print(f"\n📊 Orders grouped by {len(grouped_by_driver)} driver(s)")
 
+        drivers = self.get_drivers_info(project, grouped_by_driver.keys())
+
+        groups = []
         for driver_id, orders in grouped_by_driver.items():
             print(f"\n{'='*70}")
-            print(f"Processing Driver: {driver_id} ({len(orders)} orders)")
+            print(f"Driver: {driver_id} ({len(orders)} orders)")
             print(f"{'='*70}")
 
-            driver_info = self.get_driver_info(project, driver_id)
+            driver_info = drivers.get(str(driver_id))
+            if driver_info:
+                print(f"✅ Found driver: {driver_info.get('driver_name')}")
+            else:
+                print(f"⚠ Driver {driver_id} not found")
 
             grouped_by_sender = {}
             for order in orders:
@@ -337,32 +587,25 @@ class PMSBlitzIntegration:
                     grouped_by_sender[sender_name] = []
                 grouped_by_sender[sender_name].append(order)
 
-            unique_senders = list(grouped_by_sender.keys())
-
-            if len(unique_senders) == 1:
-                sender_name = unique_senders[0]
-                validation_entry = validation_map[sender_name]
-                self._process_sender_group(project, sender_name, orders, validation_entry, driver_id, driver_info)
-
-            else:
-                print(f"\n📦 Multiple senders detected: {len(unique_senders)}")
-                for sender_name in unique_senders:
-                    print(f"   - {sender_name}: {len(grouped_by_sender[sender_name])} orders")
-
+            if len(grouped_by_sender) > 1:
+                print(f"\n📦 Multiple senders detected: {len(grouped_by_sender)}")
                 for sender_name, sender_orders in grouped_by_sender.items():
-                    validation_entry = validation_map[sender_name]
-                    self._process_sender_group(project, sender_name, sender_orders, validation_entry, driver_id, driver_info)
+                    print(f"   - {sender_name}: {len(sender_orders)} orders")
 
-        print(f"\n{'='*70}")
-        print("✅ SYNC COMPLETED")
-        print(f"{'='*70}")
+            for sender_name, sender_orders in grouped_by_sender.items():
+                groups.append((sender_name, sender_orders, validation_map[sender_name], driver_id, driver_info))
+
+        results = self._run_sender_groups(project, groups)
+        return self._summarize_sync(results)
 
 
 def main():
     parser = argparse.ArgumentParser(description="PMS to Blitz Integration Sync")
     parser.add_argument("--project", type=str, default="mup", help="Project name")
     parser.add_argument("--drivers", type=str, help="Comma-separated driver IDs to sync")
-    parser.add_argument("--api-url", type=str, default="http://localhost:5000/api", help="PMS API URL")
+    parser.add_argument("--api-url", type=str, help="Deprecated and ignored: orders and drivers are read from MongoDB (MONGODB_URI)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_SYNC_WORKERS, help="Sender groups to process concurrently")
+    parser.add_argument("--driver-cache-ttl", type=int, default=DRIVER_CACHE_TTL, help="Seconds to reuse cached driver info across runs (0 disables)")
 
     args = parser.parse_args()
 
@@ -374,17 +617,22 @@ def main():
     print("PMS-BLITZ INTEGRATION SCRIPT")
     print(f"{'='*70}")
     print(f"Project: {args.project}")
-    print(f"PMS API: {args.api_url}")
+    if args.api_url:
+        print("⚠ --api-url is deprecated and ignored; reading from MongoDB")
+    print(f"Workers: {args.workers}")
     if driver_ids:
         print(f"Drivers: {', '.join(driver_ids)}")
     print(f"{'='*70}")
 
     try:
-        integration = PMSBlitzIntegration(pms_api_url=args.api_url)
+        integration = PMSBlitzIntegration(
+            workers=args.workers,
+            driver_cache=DriverCache(ttl=args.driver_cache_ttl)
+        )
         integration.sync_assigned_orders(args.project, driver_ids)
     except ValueError as e:
         print(f"\n❌ Configuration error: {e}")
-        print("Please ensure BLITZ_USERNAME and BLITZ_PASSWORD environment variables are set")
+        print("Please ensure BLITZ_USERNAME and BLITZ_PASSWORD environment variables are set and --workers is at least 1")
         sys.exit(1)
 
 
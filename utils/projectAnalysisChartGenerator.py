@@ -1,56 +1,64 @@
 import sys
-import json
-import os
 from datetime import datetime
 from collections import defaultdict
-import openpyxl
+from itertools import islice
+import numpy as np
+import pandas as pd
 from openpyxl.chart import BarChart, LineChart, Reference, PieChart
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 import re
+from reportStyles import Font, PatternFill, Alignment, Border, Side
+from reportGenerator import ReportGenerator, SheetStage, run_cli, validate_choice
+from reportInput import load_report_input
+from reportRawData import shipment_stratum
+from reportFormulas import DataRange, exact_criteria, literal_criteria
 
-class ProjectAnalysisChartGenerator:
-    def __init__(self, mode='static'):
+AGGREGATION_CHUNK_SIZE = 50000
+MODES = ['static', 'formula']
+
+class ProjectAnalysisChartGenerator(ReportGenerator):
+    static_stages = [
+        SheetStage('pre_aggregate_data', inputs=('data', 'period_type'), output='aggregated_data', sheet=False, slices={'data': ('shipmentData',)}, cache=True),
+        SheetStage('create_metadata_sheet', inputs=('data', 'period_type', 'aggregated_data'), parallel=True, slices={'data': ('metadata',)}),
+        SheetStage('create_analysis_summary_sheet', inputs=('aggregated_data', 'period_type'), parallel=True, slices={'aggregated_data': ('unique_mitras', 'unique_projects', 'unique_hubs', 'total_records', 'client_totals')}, cache=True),
+        SheetStage('create_data_analysis_division_sheet', inputs=('aggregated_data', 'period_type'), parallel=True, slices={'aggregated_data': ('project_period_map', 'period_totals')}, cache=True),
+        SheetStage('create_management_division_sheet', inputs=('aggregated_data', 'period_type'), parallel=True, slices={'aggregated_data': ('unique_mitras', 'unique_projects', 'unique_hubs', 'total_records', 'project_totals')}, cache=True),
+        SheetStage('create_operational_division_sheet', inputs=('aggregated_data', 'period_type'), parallel=True, slices={'aggregated_data': ('hub_totals',)}, cache=True),
+        SheetStage('create_visualization_sheet', inputs=('aggregated_data', 'period_type'), parallel=True, slices={'aggregated_data': ('period_totals',)}, cache=True),
+        SheetStage('create_insights_recommendations_sheet', inputs=('aggregated_data', 'period_type'), parallel=True),
+        SheetStage('create_raw_shipment_data_sheet', inputs=('data', 'period_type'), slices={'data': ('shipmentData',)})
+    ]
+    formula_stages = [
+        SheetStage('create_formula_ranges', output=('shipment_range', 'division_range'), sheet=False, slices={'data': ('shipmentData', 'projectAnalysis')}),
+        SheetStage('create_metadata_sheet_formula', inputs=('data', 'period_type'), slices={'data': ('metadata',)}),
+        SheetStage('create_raw_shipment_data_sheet', inputs=('data', 'period_type', 'shipment_range'), slices={'data': ('shipmentData',)}),
+        SheetStage('create_analysis_summary_sheet_formula', inputs=('period_type', 'data', 'shipment_range', 'division_range'), parallel=True, slices={'data': ('projectAnalysis',)}, cache=True),
+        SheetStage('create_data_analysis_division_sheet_formula', inputs=('data', 'period_type', 'shipment_range', 'division_range'), parallel=True, slices={'data': ('projectAnalysis',)}, cache=True),
+        SheetStage('create_management_division_sheet_formula', inputs=('period_type', 'data'), parallel=True, slices={'data': ('projectAnalysis',)}, cache=True),
+        SheetStage('create_operational_division_sheet_formula', inputs=('period_type', 'data', 'division_range'), parallel=True, slices={'data': ('projectAnalysis',)}, cache=True),
+        SheetStage('create_visualization_sheet_formula', inputs=('period_type', 'data', 'division_range'), parallel=True, slices={'data': ('projectAnalysis',)}, cache=True),
+        SheetStage('create_insights_recommendations_sheet_formula', inputs=('period_type',), parallel=True)
+    ]
+    active_sheet = 'Metadata'
+    config_attributes = ('mode',)
+    
+    def __init__(self, mode='static', engine=None):
+        super().__init__(engine)
         self.mode = mode
-        self.primary_color = "1E3A8A"
-        self.secondary_color = "3B82F6"
-        self.success_color = "10B981"
-        self.warning_color = "F59E0B"
-        self.danger_color = "EF4444"
-        self.light_bg = "F3F4F6"
-        self.header_bg = "1E40AF"
-        
-    def create_workbook_with_charts(self, data, output_path):
-        wb = openpyxl.Workbook()
-        
-        period_type = data.get('periodType', 'monthly')
-        
-        if self.mode == 'static':
-            aggregated_data = self.pre_aggregate_data(data, period_type)
-            self.create_metadata_sheet(wb, data, period_type, aggregated_data)
-            self.create_analysis_summary_sheet(wb, aggregated_data, period_type)
-            self.create_data_analysis_division_sheet(wb, aggregated_data, period_type)
-            self.create_management_division_sheet(wb, aggregated_data, period_type)
-            self.create_operational_division_sheet(wb, aggregated_data, period_type)
-            self.create_visualization_sheet(wb, aggregated_data, period_type)
-            self.create_insights_recommendations_sheet(wb, aggregated_data, period_type)
-            self.create_raw_shipment_data_sheet(wb, data, period_type)
-        else:
-            self.create_metadata_sheet_formula(wb, data, period_type)
-            self.create_raw_shipment_data_sheet(wb, data, period_type)
-            self.create_analysis_summary_sheet_formula(wb, period_type, data)
-            self.create_data_analysis_division_sheet_formula(wb, data, period_type)
-            self.create_management_division_sheet_formula(wb, period_type, data)
-            self.create_operational_division_sheet_formula(wb, period_type, data)
-            self.create_visualization_sheet_formula(wb, period_type, data)
-            self.create_insights_recommendations_sheet_formula(wb, period_type)
-        
-        if 'Sheet' in wb.sheetnames:
-            wb.remove(wb['Sheet'])
-        
-        wb.active = wb['Metadata']
-        wb.save(output_path)
-        return output_path
+        self.raw_data_defaults = {'mode': 'head', 'maxRows': 10000} if mode == 'static' else {}
+    
+    def pipeline(self):
+        return self.static_stages if self.mode == 'static' else self.formula_stages
+    
+    def prepare(self, data):
+        state = super().prepare(data)
+        if self.mode == 'formula' and self.raw_data.truncates(len(data.get('shipmentData', []))):
+            raise ValueError("Formula mode needs every shipment row in Raw Shipment Data; use static mode to sample or export raw data")
+        return state
+    
+    def create_formula_ranges(self, data):
+        return (DataRange("Raw Shipment Data", 3, len(data.get('shipmentData', []))),
+                DataRange("Data Analysis Division", 7, len(data.get('projectAnalysis', []))))
     
     def extract_week_info(self, weekly_str):
         if not weekly_str or weekly_str == '-':
@@ -71,6 +79,37 @@ class ProjectAnalysisChartGenerator:
         
         return month_index, week_num
     
+    def parse_delivery_date(self, delivery_date):
+        parts = delivery_date.split('/')
+        if len(parts) != 3:
+            return None
+        
+        day, month, year = int(parts[0]), int(parts[1]), int(parts[2])
+        return month, year
+    
+    def load_aggregation_frame(self, shipment_data):
+        columns = ['Mitra Name', 'Client Name', 'Hub', 'Delivery Date', 'Weekly']
+        records = iter(shipment_data)
+        frames = []
+        
+        while True:
+            chunk = list(islice(records, AGGREGATION_CHUNK_SIZE))
+            if not chunk:
+                break
+            
+            frame = pd.DataFrame(chunk, columns=columns)
+            missing_hubs = np.flatnonzero(frame['Hub'].isna().to_numpy())
+            if len(missing_hubs):
+                hub_values = frame['Hub'].to_numpy(dtype=object, copy=True)
+                hub_values[missing_hubs] = [chunk[i].get('Hub', '-') for i in missing_hubs]
+                frame['Hub'] = hub_values
+            frames.append(frame)
+        
+        if not frames:
+            return pd.DataFrame(columns=columns, dtype=object)
+        
+        return pd.concat(frames, ignore_index=True)
+    
     def pre_aggregate_data(self, data, period_type):
         shipment_data = data.get('shipmentData', [])
         
@@ -80,90 +119,125 @@ class ProjectAnalysisChartGenerator:
             'hub_totals': defaultdict(set),
             'client_totals': defaultdict(set),
             'period_totals': defaultdict(set),
-            'unique_mitras': set(),
-            'unique_projects': set(),
-            'unique_hubs': set(),
-            'unique_years': set(),
-            'total_records': 0
+            'unique_mitras': 0,
+            'unique_projects': 0,
+            'unique_hubs': 0,
+            'unique_years': 0,
+            'total_records': 0,
+            'shipment_count': len(shipment_data)
         }
         
         sys.stderr.write(f"Processing {len(shipment_data)} records for period_type: {period_type}\n")
         sys.stderr.flush()
         
-        for record in shipment_data:
-            mitra_name = record.get('Mitra Name', '-')
-            client_name = record.get('Client Name', '-')
-            hub = record.get('Hub', '-')
-            delivery_date = record.get('Delivery Date', '-')
-            weekly = record.get('Weekly', '-')
-            
-            if not mitra_name or mitra_name == '-' or not client_name or client_name == '-':
+        frame = self.load_aggregation_frame(shipment_data)
+        
+        mitra_codes, mitra_names = pd.factorize(frame['Mitra Name'])
+        client_codes, client_names = pd.factorize(frame['Client Name'])
+        hub_codes, hubs = pd.factorize(frame['Hub'])
+        date_codes, delivery_dates = pd.factorize(frame['Delivery Date'])
+        
+        hubs = list(hubs) + [None]
+        valid_mitras = np.array([bool(name) and name != '-' for name in mitra_names] + [False])
+        valid_clients = np.array([bool(name) and name != '-' for name in client_names] + [False])
+        valid_hubs = np.array([bool(hub) and hub != '-' for hub in hubs])
+        
+        records = valid_mitras[mitra_codes] & valid_clients[client_codes]
+        mitra_codes = mitra_codes[records]
+        client_codes = client_codes[records]
+        hub_codes = hub_codes[records]
+        date_codes = date_codes[records]
+        
+        aggregated['total_records'] = int(records.sum())
+        aggregated['unique_mitras'] = len(np.unique(mitra_codes))
+        aggregated['unique_projects'] = len(np.unique(client_codes))
+        aggregated['unique_hubs'] = int(valid_hubs[np.unique(hub_codes)].sum())
+        
+        month_names = ["", "January", "February", "March", "April", "May", "June",
+                       "July", "August", "September", "October", "November", "December"]
+        
+        years = []
+        year_index = {}
+        periods = []
+        period_index = {}
+        date_years = np.full(len(delivery_dates) + 1, -1, dtype=np.int64)
+        date_periods = np.full(len(delivery_dates) + 1, -1, dtype=np.int64)
+        
+        for code, delivery_date in enumerate(delivery_dates):
+            if not delivery_date or delivery_date == '-':
                 continue
             
-            aggregated['total_records'] += 1
-            aggregated['unique_mitras'].add(mitra_name)
-            aggregated['unique_projects'].add(client_name)
-            
-            if hub and hub != '-':
-                aggregated['unique_hubs'].add(hub)
-            
-            if delivery_date and delivery_date != '-':
-                try:
-                    parts = delivery_date.split('/')
-                    if len(parts) == 3:
-                        day, month, year = int(parts[0]), int(parts[1]), int(parts[2])
-                        aggregated['unique_years'].add(year)
-                        
-                        if period_type == 'monthly':
-                            month_names = ["", "January", "February", "March", "April", "May", "June",
-                                         "July", "August", "September", "October", "November", "December"]
-                            period = month_names[month]
-                            
-                            key = f"{client_name}|{hub}|{year}"
-                            aggregated['project_period_map'][key][period].add(mitra_name)
-                            aggregated['project_totals'][key].add(mitra_name)
-                            aggregated['hub_totals'][hub].add(mitra_name)
-                            aggregated['client_totals'][client_name].add(mitra_name)
-                            aggregated['period_totals'][period].add(mitra_name)
-                        
-                        elif period_type == 'weekly':
-                            if weekly and weekly != '-':
-                                period = weekly
-                                
-                                key = f"{client_name}|{hub}|{year}"
-                                aggregated['project_period_map'][key][period].add(mitra_name)
-                                aggregated['project_totals'][key].add(mitra_name)
-                                aggregated['hub_totals'][hub].add(mitra_name)
-                                aggregated['client_totals'][client_name].add(mitra_name)
-                                aggregated['period_totals'][period].add(mitra_name)
-                except Exception as e:
-                    sys.stderr.write(f"Error processing record: {e}\n")
-                    sys.stderr.flush()
+            try:
+                parsed = self.parse_delivery_date(delivery_date)
+                if parsed is None:
                     continue
+                
+                month, year = parsed
+                if year not in year_index:
+                    year_index[year] = len(years)
+                    years.append(year)
+                date_years[code] = year_index[year]
+                
+                if period_type == 'monthly':
+                    period = month_names[month]
+                    if period not in period_index:
+                        period_index[period] = len(periods)
+                        periods.append(period)
+                    date_periods[code] = period_index[period]
+            except Exception as e:
+                sys.stderr.write(f"Error processing record: {e}\n")
+                sys.stderr.flush()
+                continue
         
-        sys.stderr.write(f"Aggregation complete: unique_mitras={len(aggregated['unique_mitras'])}, unique_projects={len(aggregated['unique_projects'])}, unique_hubs={len(aggregated['unique_hubs'])}, total_records={aggregated['total_records']}, project_period_combinations={len(aggregated['project_period_map'])}\n")
-        sys.stderr.flush()
+        row_years = date_years[date_codes]
+        aggregated['unique_years'] = len(np.unique(row_years[row_years >= 0]))
+        
+        if period_type == 'monthly':
+            row_periods = date_periods[date_codes]
+        elif period_type == 'weekly':
+            weekly_codes, weekly_values = pd.factorize(frame['Weekly'])
+            weekly_codes = weekly_codes[records]
+            periods = list(weekly_values)
+            weekly_periods = np.array([code if period and period != '-' else -1 for code, period in enumerate(periods)] + [-1], dtype=np.int64)
+            row_periods = weekly_periods[weekly_codes]
+        else:
+            row_periods = np.full(len(row_years), -1, dtype=np.int64)
+        
+        mask = (row_years >= 0) & (row_periods >= 0)
+        columns = pd.DataFrame({
+            'mitra': mitra_codes[mask],
+            'client': client_codes[mask],
+            'hub': hub_codes[mask],
+            'year': row_years[mask],
+            'period': row_periods[mask]
+        })
         
-        aggregated['unique_mitras'] = len(aggregated['unique_mitras'])
-        aggregated['unique_projects'] = len(aggregated['unique_projects'])
-        aggregated['unique_hubs'] = len(aggregated['unique_hubs'])
-        aggregated['unique_years'] = len(aggregated['unique_years'])
+        project_groups = columns.groupby(['client', 'hub', 'year'], sort=False)
+        project_keys = [f"{client_names[client]}|{hubs[hub]}|{years[year]}" for client, hub, year in project_groups.size().index]
+        key_codes, project_keys = pd.factorize(pd.Series(project_keys, dtype=object))
+        columns['key'] = key_codes[project_groups.ngroup().to_numpy()]
         
-        for key in aggregated['project_totals']:
-            aggregated['project_totals'][key] = len(aggregated['project_totals'][key])
+        for (key, period), count in columns.groupby(['key', 'period'], sort=False)['mitra'].nunique().items():
+            aggregated['project_period_map'][project_keys[key]][periods[period]] = int(count)
         
-        for hub in aggregated['hub_totals']:
-            aggregated['hub_totals'][hub] = len(aggregated['hub_totals'][hub])
+        for key, count in columns.groupby('key', sort=False)['mitra'].nunique().items():
+            aggregated['project_totals'][project_keys[key]] = int(count)
         
-        for client in aggregated['client_totals']:
-            aggregated['client_totals'][client] = len(aggregated['client_totals'][client])
+        for hub, count in columns.groupby('hub', sort=False)['mitra'].nunique().items():
+            aggregated['hub_totals'][hubs[hub]] = int(count)
         
-        for period in aggregated['period_totals']:
-            aggregated['period_totals'][period] = len(aggregated['period_totals'][period])
+        for client, count in columns.groupby('client', sort=False)['mitra'].nunique().items():
+            aggregated['client_totals'][client_names[client]] = int(count)
         
-        for key in aggregated['project_period_map']:
-            for period in aggregated['project_period_map'][key]:
-                aggregated['project_period_map'][key][period] = len(aggregated['project_period_map'][key][period])
+        for period, count in columns.groupby('period', sort=False)['mitra'].nunique().items():
+            aggregated['period_totals'][periods[period]] = int(count)
+        
+        aggregated['project_period_map'] = {key: dict(period_data) for key, period_data in aggregated['project_period_map'].items()}
+        for name in ('project_totals', 'hub_totals', 'client_totals', 'period_totals'):
+            aggregated[name] = dict(aggregated[name])
+        
+        sys.stderr.write(f"Aggregation complete: unique_mitras={aggregated['unique_mitras']}, unique_projects={aggregated['unique_projects']}, unique_hubs={aggregated['unique_hubs']}, total_records={aggregated['total_records']}, project_period_combinations={len(aggregated['project_period_map'])}\n")
+        sys.stderr.flush()
         
         return aggregated
     
@@ -222,53 +296,68 @@ class ProjectAnalysisChartGenerator:
         sorted_periods = sorted(periods, key=parse_week)
         return sorted_periods
     
-    def create_raw_shipment_data_sheet(self, wb, data, period_type):
-        ws = wb.create_sheet("Raw Shipment Data")
+    def create_raw_shipment_data_sheet(self, wb, data, period_type, shipment_range=None):
+        ws = wb.create_stream_sheet("Raw Shipment Data")
         if self.mode == 'static':
             ws.sheet_state = 'hidden'
         
         shipment_data = data.get('shipmentData', [])
         
-        title = ws.cell(row=1, column=1, value=f"RAW SHIPMENT DATA - {period_type.upper()}")
-        title.font = Font(bold=True, size=14, color=self.primary_color)
+        ws.append([
+            ws.styled_cell(f"RAW SHIPMENT DATA - {period_type.upper()}", font=Font(bold=True, size=14, color=self.primary_color)),
+            None, None, None,
+            ws.styled_cell(f"Raw data: {self.raw_data.describe(len(shipment_data))}", font=Font(size=9, italic=True, color="6B7280"))
+        ])
         
         headers = ["Mitra Name", "Client Name", "Delivery Date", "Hub", "Drop Point", 
                    "Weekly", "Order Code", "Weight", "Distance (km)", "Cost", "SLA"]
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=2, column=col, value=header)
-            cell.font = Font(bold=True, size=9)
-        
-        max_rows = 10000 if self.mode == 'static' else len(shipment_data)
-        for row_idx, record in enumerate(shipment_data[:max_rows], 3):
-            ws.cell(row=row_idx, column=1, value=record.get('Mitra Name', '-'))
-            ws.cell(row=row_idx, column=2, value=record.get('Client Name', '-'))
-            ws.cell(row=row_idx, column=3, value=record.get('Delivery Date', '-'))
-            ws.cell(row=row_idx, column=4, value=record.get('Hub', '-'))
-            ws.cell(row=row_idx, column=5, value=record.get('Drop Point', '-'))
-            ws.cell(row=row_idx, column=6, value=record.get('Weekly', '-'))
-            ws.cell(row=row_idx, column=7, value=record.get('Order Code', '-'))
-            ws.cell(row=row_idx, column=8, value=record.get('Weight', '-'))
-            
-            distance = self.safe_float(record.get('Distance (km)', 0))
-            ws.cell(row=row_idx, column=9, value=distance).number_format = '0.00'
-            
-            cost = self.safe_float(record.get('Cost', 0))
-            ws.cell(row=row_idx, column=10, value=cost).number_format = '#,##0'
-            
-            ws.cell(row=row_idx, column=11, value=record.get('SLA', '-'))
-    
-    def safe_float(self, value, default=0.0):
-        try:
-            return float(value)
-        except (ValueError, TypeError):
-            return default
-    
-    def safe_int(self, value, default=0):
-        try:
-            return int(float(value))
-        except (ValueError, TypeError):
-            return default
+        if self.mode == 'formula':
+            headers += ["First Mitra", "Period", "Year", "Division Key", "First In Period"]
+        
+        header_font = Font(bold=True, size=9)
+        ws.append([ws.styled_cell(header, font=header_font) for header in headers])
+        
+        select = self.raw_data.selector(shipment_data, shipment_stratum(period_type, 'Hub', 'Delivery Date', 'Weekly'))
+        row = 3
+        with self.raw_data.sidecar(headers[:11], numeric=('Distance (km)', 'Cost')) as sidecar:
+            for index, record in enumerate(self.raw_data.scan(shipment_data)):
+                selected = select(index, record)
+                if not selected and sidecar is None:
+                    continue
+                
+                distance = self.safe_float(record.get('Distance (km)', 0))
+                cost = self.safe_float(record.get('Cost', 0))
+                
+                values = [
+                    record.get('Mitra Name', '-'),
+                    record.get('Client Name', '-'),
+                    record.get('Delivery Date', '-'),
+                    record.get('Hub', '-'),
+                    record.get('Drop Point', '-'),
+                    record.get('Weekly', '-'),
+                    record.get('Order Code', '-'),
+                    record.get('Weight', '-'),
+                    ws.styled_cell(distance, number_format='0.00'),
+                    ws.styled_cell(cost, number_format='#,##0'),
+                    record.get('SLA', '-')
+                ]
+                self.raw_data.write_row(sidecar, values)
+                if not selected:
+                    continue
+                
+                flags = []
+                if self.mode == 'formula':
+                    period = f'=IFERROR(MONTH(DATEVALUE(C{row})),"")' if period_type == 'monthly' else f'=F{row}'
+                    flags = [
+                        shipment_range.first_occurrence_flag('A', row, excluded=['-']),
+                        period,
+                        f'=IFERROR(YEAR(DATEVALUE(C{row})),"")',
+                        f'=IF(OR(A{row}="",A{row}="-",M{row}="",N{row}=""),"",A{row}&"|"&B{row}&"|"&D{row}&"|"&M{row}&"|"&N{row})',
+                        shipment_range.first_occurrence_flag('O', row)
+                    ]
+                
+                ws.append(values + flags)
+                row += 1
     
     def create_metadata_sheet(self, wb, data, period_type, aggregated_data):
         ws = wb.create_sheet("Metadata", 0)
@@ -301,7 +390,7 @@ class ProjectAnalysisChartGenerator:
             "✅ No volatile functions - instant file opening",
             "✅ Static values for display, formulas only for validation",
             "✅ Optimized for 30,000+ records - loads in < 5 seconds",
-            "✅ Raw data hidden and limited to 10,000 sample rows"
+            f"✅ Raw data hidden: {self.raw_data.describe(aggregated_data['shipment_count'])}"
         ]
         
         note_row = row + 4
@@ -394,11 +483,7 @@ class ProjectAnalysisChartGenerator:
         
         headers = ["Rank", "Project", "Total Unique Mitras"]
         header_row = row + 4
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=header_row, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, header_row, headers)
         
         sorted_clients = sorted(aggregated_data['client_totals'].items(), key=lambda x: x[1], reverse=True)[:10]
         
@@ -412,7 +497,7 @@ class ProjectAnalysisChartGenerator:
         for col in range(1, 7):
             ws.column_dimensions[get_column_letter(col)].width = 20
     
-    def create_analysis_summary_sheet_formula(self, wb, period_type, data):
+    def create_analysis_summary_sheet_formula(self, wb, period_type, data, shipment_range, division_range):
         ws = wb.create_sheet("Analysis Summary")
         
         title = ws.cell(row=1, column=1, value=f"ANALYSIS SUMMARY - {period_type.upper()} (FORMULA-BASED)")
@@ -429,10 +514,10 @@ class ProjectAnalysisChartGenerator:
         total_col_letter = get_column_letter(total_col_index)
         
         metrics = [
-            ("Total Projects", f"=SUMPRODUCT(1/COUNTIFS('Data Analysis Division'!A:A,'Data Analysis Division'!A7:A1000,'Data Analysis Division'!A7:A1000,\"<>\"))"),
-            ("Total Hubs", f"=SUMPRODUCT(1/COUNTIFS('Data Analysis Division'!B:B,'Data Analysis Division'!B7:B1000,'Data Analysis Division'!B7:B1000,\"<>\",\"<>-\"))"),
-            ("Total Unique Mitras", f"=SUMPRODUCT(1/COUNTIFS('Raw Shipment Data'!A:A,'Raw Shipment Data'!A3:A100000,'Raw Shipment Data'!A3:A100000,\"<>\",\"<>-\"))"),
-            ("Total Records", f"=COUNTA('Raw Shipment Data'!A3:A100000)"),
+            ("Total Projects", division_range.distinct_count(get_column_letter(total_col_index + 1))),
+            ("Total Hubs", division_range.distinct_count(get_column_letter(total_col_index + 2))),
+            ("Total Unique Mitras", shipment_range.distinct_count('L')),
+            ("Total Records", f"=COUNTA({shipment_range.column('A')})"),
             ("Avg Mitras per Project", f"=IFERROR(C8/C6,0)")
         ]
         
@@ -451,17 +536,13 @@ class ProjectAnalysisChartGenerator:
         
         headers = ["Rank", "Project", "Total Unique Mitras"]
         header_row = row + 4
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=header_row, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, header_row, headers)
         
         for i in range(10):
             project_row = header_row + 1 + i
             ws.cell(row=project_row, column=1, value=i + 1).alignment = Alignment(horizontal="center")
-            ws.cell(row=project_row, column=2, value=f"=IFERROR(INDEX('Data Analysis Division'!A:A,MATCH(LARGE('Data Analysis Division'!${total_col_letter}$7:${total_col_letter}$1000,{i+1}),'Data Analysis Division'!${total_col_letter}$7:${total_col_letter}$1000,0)+6),\"\")")
-            ws.cell(row=project_row, column=3, value=f"=IFERROR(LARGE('Data Analysis Division'!${total_col_letter}$7:${total_col_letter}$1000,{i+1}),\"\")").number_format = '0'
+            ws.cell(row=project_row, column=2, value=f"=IFERROR(INDEX({division_range.column('A')},MATCH(LARGE({division_range.column(total_col_letter)},{i+1}),{division_range.column(total_col_letter)},0)),\"\")")
+            ws.cell(row=project_row, column=3, value=f"=IFERROR(LARGE({division_range.column(total_col_letter)},{i+1}),\"\")").number_format = '0'
         
         for col in range(1, 7):
             ws.column_dimensions[get_column_letter(col)].width = 20
@@ -494,11 +575,7 @@ class ProjectAnalysisChartGenerator:
         
         headers = ['Project', 'Hub', 'Year'] + period_display + ['Total']
         
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=6, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=9)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 6, headers, size=9)
         
         row_idx = 7
         for key, period_data in sorted(aggregated_data['project_period_map'].items()):
@@ -530,7 +607,7 @@ class ProjectAnalysisChartGenerator:
         for col in range(4, len(headers) + 1):
             ws.column_dimensions[get_column_letter(col)].width = 7
     
-    def create_data_analysis_division_sheet_formula(self, wb, data, period_type):
+    def create_data_analysis_division_sheet_formula(self, wb, data, period_type, shipment_range, division_range):
         ws = wb.create_sheet("Data Analysis Division")
         
         period_columns = self.extract_period_columns(period_type, data=data)
@@ -539,7 +616,7 @@ class ProjectAnalysisChartGenerator:
         title.font = Font(bold=True, size=16, color=self.primary_color)
         ws.merge_cells("A1:P1")
         
-        subtitle = ws.cell(row=2, column=1, value="✅ All values calculated using Excel COUNTIFS formulas")
+        subtitle = ws.cell(row=2, column=1, value="✅ All values calculated using Excel SUMIFS formulas")
         subtitle.font = Font(size=11, color=self.success_color, italic=True)
         ws.merge_cells("A2:P2")
         
@@ -547,13 +624,13 @@ class ProjectAnalysisChartGenerator:
         
         headers = ['Project', 'Hub', 'Year'] + period_columns + ['Total']
         
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=6, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 6, headers)
         
         project_analysis = data.get('projectAnalysis', [])
+        project_flag_col = len(headers) + 1
+        hub_flag_col = len(headers) + 2
+        ws.cell(row=6, column=project_flag_col, value="First Project").font = Font(bold=True, size=9)
+        ws.cell(row=6, column=hub_flag_col, value="First Hub").font = Font(bold=True, size=9)
         
         for row_idx, project_data in enumerate(project_analysis, 7):
             ws.cell(row=row_idx, column=1, value=project_data.get('Project', ''))
@@ -561,13 +638,16 @@ class ProjectAnalysisChartGenerator:
             ws.cell(row=row_idx, column=3, value=project_data.get('Year', ''))
             
             for col_idx, period in enumerate(period_columns, 4):
-                col_letter = get_column_letter(col_idx)
                 if period_type == 'monthly':
-                    month_num = ['January', 'February', 'March', 'April', 'May', 'June',
-                                'July', 'August', 'September', 'October', 'November', 'December'].index(period) + 1
-                    formula = f'=SUMPRODUCT((\'Raw Shipment Data\'!$B$3:$B$100000=$A{row_idx})*(\'Raw Shipment Data\'!$D$3:$D$100000=$B{row_idx})*(MONTH(DATEVALUE(\'Raw Shipment Data\'!$C$3:$C$100000))={month_num})*(YEAR(DATEVALUE(\'Raw Shipment Data\'!$C$3:$C$100000))=$C{row_idx})/COUNTIFS(\'Raw Shipment Data\'!$A$3:$A$100000,\'Raw Shipment Data\'!$A$3:$A$100000,\'Raw Shipment Data\'!$B$3:$B$100000,$A{row_idx},\'Raw Shipment Data\'!$D$3:$D$100000,$B{row_idx}))'
+                    period_criteria = ['January', 'February', 'March', 'April', 'May', 'June',
+                                       'July', 'August', 'September', 'October', 'November', 'December'].index(period) + 1
                 else:
-                    formula = f'=SUMPRODUCT((\'Raw Shipment Data\'!$B$3:$B$100000=$A{row_idx})*(\'Raw Shipment Data\'!$D$3:$D$100000=$B{row_idx})*(\'Raw Shipment Data\'!$F$3:$F$100000="{period}")*(YEAR(DATEVALUE(\'Raw Shipment Data\'!$C$3:$C$100000))=$C{row_idx})/COUNTIFS(\'Raw Shipment Data\'!$A$3:$A$100000,\'Raw Shipment Data\'!$A$3:$A$100000,\'Raw Shipment Data\'!$B$3:$B$100000,$A{row_idx},\'Raw Shipment Data\'!$D$3:$D$100000,$B{row_idx},\'Raw Shipment Data\'!$F$3:$F$100000,"{period}"))'
+                    period_criteria = literal_criteria(period)
+                formula = (f'=SUMIFS({shipment_range.column("P")},'
+                           f'{shipment_range.column("B")},{exact_criteria(f"$A{row_idx}")},'
+                           f'{shipment_range.column("D")},{exact_criteria(f"$B{row_idx}")},'
+                           f'{shipment_range.column("M")},{period_criteria},'
+                           f'{shipment_range.column("N")},$C{row_idx})')
                 
                 cell = ws.cell(row=row_idx, column=col_idx, value=formula)
                 cell.number_format = '0'
@@ -578,6 +658,9 @@ class ProjectAnalysisChartGenerator:
             total_cell = ws.cell(row=row_idx, column=total_col, value=total_formula)
             total_cell.number_format = '0'
             total_cell.font = Font(bold=True)
+            
+            ws.cell(row=row_idx, column=project_flag_col, value=division_range.first_occurrence_flag('A', row_idx))
+            ws.cell(row=row_idx, column=hub_flag_col, value=division_range.first_occurrence_flag('B', row_idx, excluded=['-']))
         
         for col in range(1, len(headers) + 1):
             ws.column_dimensions[get_column_letter(col)].width = 12
@@ -619,11 +702,7 @@ class ProjectAnalysisChartGenerator:
         header_row = row + 4
         headers = ["Project", "Hub", "Year", "Total Unique Mitras", "Strategic Value", "Investment Priority", "Action Plan"]
         
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=header_row, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        self.write_header_row(ws, header_row, headers, wrap_text=True)
         
         data_row = header_row + 1
         for key, total in sorted(aggregated_data['project_totals'].items(), key=lambda x: x[1], reverse=True)[:20]:
@@ -697,11 +776,7 @@ class ProjectAnalysisChartGenerator:
         header_row = row + 4
         headers = ["Project", "Hub", "Year", "Total Unique Mitras", "Strategic Value", "Investment Priority", "Action Plan"]
         
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=header_row, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        self.write_header_row(ws, header_row, headers, wrap_text=True)
         
         period_columns = self.extract_period_columns(period_type, data=data)
         total_col_index = 3 + len(period_columns) + 1
@@ -737,11 +812,7 @@ class ProjectAnalysisChartGenerator:
         ws.cell(row=4, column=1, value="HUB PERFORMANCE ANALYSIS").font = Font(bold=True, size=12, color=self.primary_color)
         
         headers = ["Hub", "Total Unique Mitras"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=6, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 6, headers)
         
         sorted_hubs = sorted(aggregated_data['hub_totals'].items(), key=lambda x: x[1], reverse=True)
         
@@ -784,7 +855,7 @@ class ProjectAnalysisChartGenerator:
         for col in range(1, 6):
             ws.column_dimensions[get_column_letter(col)].width = 20
     
-    def create_operational_division_sheet_formula(self, wb, period_type, data):
+    def create_operational_division_sheet_formula(self, wb, period_type, data, division_range):
         ws = wb.create_sheet("Operational Division")
         
         title = ws.cell(row=1, column=1, value=f"OPERATIONAL DIVISION - {period_type.upper()}")
@@ -798,11 +869,7 @@ class ProjectAnalysisChartGenerator:
         ws.cell(row=4, column=1, value="HUB PERFORMANCE ANALYSIS").font = Font(bold=True, size=12, color=self.primary_color)
         
         headers = ["Hub", "Total Unique Mitras"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=6, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 6, headers)
         
         period_columns = self.extract_period_columns(period_type, data=data)
         total_col_index = 3 + len(period_columns) + 1
@@ -818,7 +885,7 @@ class ProjectAnalysisChartGenerator:
         
         for i, hub in enumerate(sorted_unique_hubs[:20], 7):
             ws.cell(row=i, column=1, value=hub)
-            ws.cell(row=i, column=2, value=f'=SUMIF(\'Data Analysis Division\'!$B$7:$B$1000,A{i},\'Data Analysis Division\'!${total_col_letter}$7:${total_col_letter}$1000)').number_format = '0'
+            ws.cell(row=i, column=2, value=f"=SUMIF({division_range.column('B')},A{i},{division_range.column(total_col_letter)})").number_format = '0'
         
         insights_row = 7 + min(len(sorted_unique_hubs), 20) + 3
         ws.cell(row=insights_row, column=1, value="OPERATIONAL INSIGHTS").font = Font(bold=True, size=12, color=self.primary_color)
@@ -853,11 +920,7 @@ class ProjectAnalysisChartGenerator:
         ws.cell(row=3, column=1, value="TREND DATA").font = Font(bold=True, size=12, color=self.primary_color)
         
         headers = ["Period", "Unique Mitras"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=5, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 5, headers)
         
         if period_type == 'weekly':
             sorted_periods = self.sort_weekly_periods(list(aggregated_data['period_totals'].keys()))
@@ -898,7 +961,7 @@ class ProjectAnalysisChartGenerator:
         ws.column_dimensions['C'].width = 15
         ws.column_dimensions['D'].width = 15
     
-    def create_visualization_sheet_formula(self, wb, period_type, data):
+    def create_visualization_sheet_formula(self, wb, period_type, data, division_range):
         ws = wb.create_sheet("Visualization")
         
         title = ws.cell(row=1, column=1, value=f"VISUALIZATION DATA - {period_type.upper()}")
@@ -908,18 +971,14 @@ class ProjectAnalysisChartGenerator:
         ws.cell(row=3, column=1, value="TREND DATA").font = Font(bold=True, size=12, color=self.primary_color)
         
         headers = ["Period", "Unique Mitras"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=5, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF", size=10)
-            cell.fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
-            cell.alignment = Alignment(horizontal="center", vertical="center")
+        self.write_header_row(ws, 5, headers)
         
         period_columns = self.extract_period_columns(period_type, data=data)
         
         for idx, period in enumerate(period_columns[:60], 6):
             ws.cell(row=idx, column=1, value=period).font = Font(size=10)
             col_letter = get_column_letter(4 + (idx - 6))
-            ws.cell(row=idx, column=2, value=f"=IFERROR(SUM('Data Analysis Division'!{col_letter}7:{col_letter}1000),0)").number_format = '0'
+            ws.cell(row=idx, column=2, value=f"=IFERROR(SUM({division_range.column(col_letter)}),0)").number_format = '0'
         
         if len(period_columns) >= 2:
             chart = LineChart()
@@ -967,7 +1026,7 @@ class ProjectAnalysisChartGenerator:
             "✅ No volatile functions - instant file opening",
             "✅ Static values for display, formulas only for validation",
             "✅ Optimized for 30,000+ records - loads in < 5 seconds",
-            "✅ Raw data hidden - only 10,000 sample rows stored"
+            f"✅ Raw data hidden - {self.raw_data.describe(aggregated_data['shipment_count'])}"
         ]
         
         for feature in optimization_features:
@@ -1039,7 +1098,7 @@ class ProjectAnalysisChartGenerator:
         architecture_notes = [
             "✅ Python Pre-Aggregation: All unique counts calculated before Excel export",
             "✅ No Heavy Formulas: Static values for instant display",
-            "✅ Hidden Raw Data: Limited to 10,000 sample rows to reduce file size",
+            f"✅ Hidden Raw Data: {self.raw_data.describe(aggregated_data['shipment_count'])} to reduce file size",
             "✅ Optimized Structure: Separate sheets for different stakeholder needs",
             "✅ Fast Load Time: < 5 seconds even with 30,000+ source records",
             "✅ No Performance Degradation: Scales linearly with data growth",
@@ -1102,7 +1161,7 @@ class ProjectAnalysisChartGenerator:
         current_row += 2
         
         data_actions = [
-            "• Period-specific counting using COUNTIFS with date conditions",
+            "• Period-specific counting using SUMIFS over first-occurrence flags",
             f"• {period_type.capitalize()}-level analysis with Excel formulas",
             "• Dynamic unique mitra calculation per project/hub/period",
             "• Automatic recalculation when raw data changes",
@@ -1162,7 +1221,7 @@ class ProjectAnalysisChartGenerator:
             "✅ SUMIFS: Conditional summation across periods",
             "✅ INDEX-MATCH: Dynamic data lookup and sorting",
             "✅ IF Statements: Strategic categorization logic",
-            "✅ SUMPRODUCT: Complex multi-condition aggregation",
+            "✅ SUMIFS: Multi-condition aggregation over helper flags",
             "✅ DATEVALUE: Date parsing for monthly/weekly analysis",
             "✅ Cross-Sheet References: Linked calculations across divisions",
             "✅ Array Formulas: Efficient bulk calculations",
@@ -1182,83 +1241,70 @@ class ProjectAnalysisChartGenerator:
         for col in range(1, 9):
             ws.column_dimensions[get_column_letter(col)].width = 25
 
-def main():
-    try:
-        if len(sys.argv) < 3:
-            raise ValueError("Usage: python projectAnalysisChartGenerator.py <input_json> <output_excel> [mode]")
-        
-        input_path = sys.argv[1]
-        output_path = sys.argv[2]
-        mode = sys.argv[3] if len(sys.argv) > 3 else 'static'
-        
-        if mode not in ['static', 'formula']:
-            raise ValueError("Mode must be either 'static' or 'formula'")
-        
-        if not os.path.exists(input_path):
-            raise FileNotFoundError(f"Input file not found: {input_path}")
-        
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        generator = ProjectAnalysisChartGenerator(mode=mode)
-        result_path = generator.create_workbook_with_charts(data, output_path)
-        
-        result_data = {
-            "success": True,
-            "output_path": result_path,
-            "message": f"{'Optimized' if mode == 'static' else 'Formula-based'} project analysis created successfully",
-            "mode": mode,
-            "period_type": data.get('periodType', 'monthly')
-        }
-        
-        if mode == 'static':
-            result_data["optimization"] = {
-                "technique": "Python Pre-Aggregation",
-                "performance": "Instant calculation - no Excel formula overhead",
-                "data_processing": "All unique counts calculated in Python",
-                "excel_role": "Display only - static values",
-                "load_time": "< 5 seconds for 30,000+ records",
-                "no_volatile_functions": True,
-                "scalable": "Linear performance - no degradation with data growth",
-                "raw_data_handling": "Hidden sheet with 10,000 sample rows"
-            }
-            result_data["validation"] = {
-                "all_values_pre_calculated": True,
-                "no_heavy_formulas": True,
-                "static_display_values": True,
-                "instant_file_opening": True,
-                "memory_efficient": True,
-                "no_recalculation_needed": True,
-                "optimization_status": "Production Ready - Static Mode"
-            }
-        else:
-            result_data["optimization"] = {
-                "technique": "Excel Formulas",
-                "performance": "Dynamic calculation with formulas",
-                "data_processing": "All values calculated by Excel",
-                "excel_role": "Full calculation engine",
-                "recalculation": "Automatic on data changes",
-                "formulas_used": ["COUNTIFS", "SUMIFS", "IF", "INDEX", "MATCH", "LARGE", "SUMPRODUCT", "DATEVALUE"],
-                "optimization_status": "Production Ready - Formula Mode"
-            }
-            result_data["validation"] = {
-                "all_values_formula_based": True,
-                "dynamic_recalculation": True,
-                "no_static_values": True,
-                "fully_auditable": True,
-                "real_time_updates": True,
-                "mode": "FORMULA"
-            }
-        
-        print(json.dumps(result_data))
+def create_report(data, output_path, mode='static', engine=None):
+    validate_choice(mode, MODES)
     
-    except Exception as e:
-        error_data = {
-            "success": False,
-            "error": str(e)
+    generator = ProjectAnalysisChartGenerator(mode=mode, engine=engine)
+    result_path = generator.create_workbook(data, output_path)
+    
+    result_data = {
+        "success": True,
+        "output_path": result_path,
+        "message": f"{'Optimized' if mode == 'static' else 'Formula-based'} project analysis created successfully",
+        "mode": mode,
+        "period_type": data.get('periodType', 'monthly'),
+        "sheet_cache": {"hits": generator.stage_cache.hits, "misses": generator.stage_cache.misses},
+        "raw_data": generator.raw_data.summary(len(data.get('shipmentData', [])), result_path)
+    }
+    
+    if mode == 'static':
+        result_data["optimization"] = {
+            "technique": "Python Pre-Aggregation",
+            "performance": "Instant calculation - no Excel formula overhead",
+            "data_processing": "All unique counts calculated in Python",
+            "excel_role": "Display only - static values",
+            "load_time": "< 5 seconds for 30,000+ records",
+            "no_volatile_functions": True,
+            "scalable": "Linear performance - no degradation with data growth",
+            "raw_data_handling": f"Hidden sheet with {generator.raw_data.describe(len(data.get('shipmentData', [])))}"
+        }
+        result_data["validation"] = {
+            "all_values_pre_calculated": True,
+            "no_heavy_formulas": True,
+            "static_display_values": True,
+            "instant_file_opening": True,
+            "memory_efficient": True,
+            "no_recalculation_needed": True,
+            "optimization_status": "Production Ready - Static Mode"
+        }
+    else:
+        result_data["optimization"] = {
+            "technique": "Excel Formulas",
+            "performance": "Dynamic calculation with formulas",
+            "data_processing": "All values calculated by Excel",
+            "excel_role": "Full calculation engine",
+            "recalculation": "Automatic on data changes",
+            "formulas_used": ["COUNTIFS", "SUMIFS", "IF", "INDEX", "MATCH", "LARGE", "DATEVALUE"],
+            "optimization_status": "Production Ready - Formula Mode"
+        }
+        result_data["validation"] = {
+            "all_values_formula_based": True,
+            "dynamic_recalculation": True,
+            "no_static_values": True,
+            "fully_auditable": True,
+            "real_time_updates": True,
+            "mode": "FORMULA"
         }
-        print(json.dumps(error_data))
-        sys.exit(1)
+    
+    return result_data
+
+def generate_report(input_path, output_path, mode='static', engine=None):
+    data = load_report_input(input_path)
+    
+    return create_report(data, output_path, mode, engine)
+
+def main():
+    run_cli("projectAnalysisChartGenerator.py", generate_report, MODES)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,282 @@
+import os
+import ast
+import json
+import pickle
+import shutil
+import hashlib
+import tempfile
+from functools import lru_cache
+from reportInput import StreamedRecords, load_report_input, shared_report_inputs
+from reportMetrics import current_metrics
+from reportRawData import RawDataPolicy
+from reportWorkbook import DEFAULT_ENGINE
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'report-cache'))
+DEFAULT_STAGE_CACHE_DIR = os.environ.get('REPORT_STAGE_CACHE_DIR', '')
+DEFAULT_MAX_BYTES = int(os.environ.get('REPORT_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+DEFAULT_STAGE_MAX_BYTES = int(os.environ.get('REPORT_STAGE_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+VOLATILE_KEYS = {'generatedAt', 'exportedAt', 'requestedAt'}
+
+def _state_value(value):
+    return vars(value) if hasattr(value, '__dict__') else str(value)
+
+def _canonical(value, default=str):
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=default).encode('utf-8')
+
+def _plain(value):
+    if isinstance(value, dict):
+        if all(type(key) is str for key in value):
+            return {key: _plain(item) for key, item in value.items()}
+        return sorted(([_plain(key), _plain(item)] for key, item in value.items()), key=repr)
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_plain(item) for item in value), key=repr)
+    if hasattr(value, '__dict__'):
+        return _plain(vars(value))
+    return value
+
+def value_digest(value):
+    if isinstance(value, StreamedRecords):
+        return value.digest
+
+    digest = hashlib.sha256()
+    if hasattr(value, '__iter__') and not isinstance(value, (str, dict, set, frozenset)):
+        digest.update(b'[')
+        for item in value:
+            digest.update(_canonical(item))
+            digest.update(b',')
+    else:
+        digest.update(_canonical(_plain(value)))
+    return digest.hexdigest()
+
+def partition_digests(records, partition):
+    digests = {}
+    for record in records:
+        key = partition(record)
+        digest = digests.get(key)
+        if digest is None:
+            digest = digests[key] = hashlib.sha256(b'[')
+        digest.update(repr(record).encode('utf-8'))
+        digest.update(b',')
+    return {key: digest.hexdigest() for key, digest in digests.items()}
+
+def payload_digest(payload):
+    data = payload if isinstance(payload, dict) else load_report_input(payload)
+    digests = [(key, value_digest(value)) for key, value in data.items() if key not in VOLATILE_KEYS]
+    return hashlib.sha256(_canonical(sorted(digests))).hexdigest()
+
+def local_imports(path):
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read(), path)
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+
+    directory = os.path.dirname(path)
+    return [module for module in (os.path.join(directory, f"{name}.py") for name in names) if os.path.isfile(module)]
+
+def source_modules(generator_file):
+    generator_file = os.path.abspath(generator_file)
+    seen = {generator_file}
+    pending = [generator_file]
+    while pending:
+        for module in local_imports(pending.pop()):
+            if module not in seen:
+                seen.add(module)
+                pending.append(module)
+
+    return [generator_file] + sorted(seen - {generator_file})
+
+@lru_cache(maxsize=None)
+def generator_version(generator_file):
+    digest = hashlib.sha256(str(CACHE_VERSION).encode('utf-8'))
+
+    for path in source_modules(generator_file):
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def cacheable(result):
+    return isinstance(result, dict) and result.get('success') and not result.get('raw_data', {}).get('path')
+
+class ReportCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self):
+        return bool(self.directory) and self.max_bytes > 0
+
+    def key(self, generator_file, payload, args=(), engine=None):
+        data = payload if isinstance(payload, dict) else load_report_input(payload)
+        parts = {
+            'generator': os.path.basename(generator_file),
+            'version': generator_version(generator_file),
+            'args': list(args),
+            'engine': engine or DEFAULT_ENGINE,
+            'raw_data': RawDataPolicy.from_options(data.get('rawData'), '').cache_key(),
+            'payload': payload_digest(data)
+        }
+        return hashlib.sha256(_canonical(parts)).hexdigest()
+
+    def _paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.xlsx', base + '.json'
+
+    def _write(self, path, write):
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def fetch(self, key, output_path):
+        report_path, result_path = self._paths(key)
+
+        try:
+            with open(result_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            shutil.copyfile(report_path, output_path)
+            os.utime(report_path)
+        except (OSError, ValueError):
+            return None
+
+        cached_path = entry['output_path']
+        return {name: output_path if value == cached_path else value for name, value in entry['result'].items()}
+
+    def store(self, key, output_path, result):
+        report_path, result_path = self._paths(key)
+        entry = json.dumps({'output_path': output_path, 'result': result}).encode('utf-8')
+
+        try:
+            with open(output_path, 'rb') as source:
+                self._write(report_path, lambda f: shutil.copyfileobj(source, f))
+            self._write(result_path, lambda f: f.write(entry))
+            self.evict()
+        except OSError:
+            return False
+
+        return True
+
+    def evict(self):
+        entries = {}
+
+        for entry in os.scandir(self.directory):
+            key, extension = os.path.splitext(entry.name)
+            if extension == '.tmp' or not entry.is_file():
+                continue
+
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            size, mtime, paths = entries.get(key, (0, 0, []))
+            entries[key] = (size + stat.st_size, max(mtime, stat.st_mtime), paths + [entry.path])
+
+        total = sum(size for size, _, _ in entries.values())
+        for size, _, paths in sorted(entries.values(), key=lambda entry: entry[1]):
+            if total <= self.max_bytes:
+                break
+
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+    def run(self, generator_file, payload, output_path, build, args=(), engine=None):
+        if not self.enabled:
+            return build()
+
+        with shared_report_inputs():
+            return self._run(generator_file, payload, output_path, build, args, engine)
+
+    def _run(self, generator_file, payload, output_path, build, args, engine):
+        metrics = current_metrics()
+        if not isinstance(payload, dict):
+            try:
+                load_report_input(payload)
+            except (OSError, ValueError):
+                pass
+
+        with metrics.timer('cache'):
+            try:
+                key = self.key(generator_file, payload, args, engine)
+            except (OSError, ValueError):
+                key = None
+
+            result = self.fetch(key, output_path) if key else None
+        if key is None:
+            return build()
+
+        if result is not None:
+            result['cache'] = {'status': 'hit', 'key': key}
+            return result
+
+        result = build()
+        if cacheable(result):
+            with metrics.timer('cache'):
+                self.store(key, output_path, result)
+            result['cache'] = {'status': 'miss', 'key': key}
+
+        return result
+
+class StageCache(ReportCache):
+    def __init__(self, directory=DEFAULT_STAGE_CACHE_DIR, max_bytes=DEFAULT_STAGE_MAX_BYTES):
+        super().__init__(directory, max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, generator_file, stage, config, inputs):
+        parts = {
+            'generator': os.path.basename(generator_file),
+            'version': generator_version(generator_file),
+            'stage': stage,
+            'config': config,
+            'inputs': inputs
+        }
+        return hashlib.sha256(_canonical(parts, _state_value)).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.pkl')
+
+    def fetch(self, key):
+        path = self._path(key)
+
+        try:
+            with open(path, 'rb') as f:
+                rendered = pickle.load(f)
+            os.utime(path)
+        except Exception:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return rendered
+
+    def store(self, key, rendered):
+        try:
+            self._write(self._path(key), lambda f: pickle.dump(rendered, f, protocol=pickle.HIGHEST_PROTOCOL))
+            self.evict()
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            return False
+
+        return True
+
+def run_cached(generator_file, payload, output_path, build, args=(), engine=None):
+    return ReportCache().run(generator_file, payload, output_path, build, args, engine)
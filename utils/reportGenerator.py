@@ -0,0 +1,310 @@
+import os
+import sys
+import json
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from collections import defaultdict
+from reportStyles import Font, PatternFill, Alignment
+from reportWorkbook import ReportWorkbook, StageWorkbook, parse_engine_args
+from reportCache import StageCache, run_cached, value_digest, partition_digests
+from reportMetrics import current_metrics, run_instrumented, reset_peak_rss, peak_rss_mb
+from reportRawData import RawDataPolicy
+
+ENGINE_USAGE = "[--engine openpyxl|streaming|xlsxwriter]"
+DEFAULT_WORKERS = int(os.environ.get('REPORT_SHEET_WORKERS', '1'))
+
+_parallel_job = None
+
+def _render_stage(index):
+    generator, stages, state = _parallel_job
+    reset_peak_rss()
+    rendered, seconds = generator.timed_render(stages[index], state)
+    return rendered, seconds, peak_rss_mb()
+
+class SheetStage:
+    def __init__(self, builder, inputs=('data',), output=None, when=None, sheet=True, parallel=False, slices=None, cache=False):
+        self.builder = builder
+        self.inputs = inputs
+        self.output = output
+        self.when = when
+        self.sheet = sheet
+        self.parallel = parallel
+        self.slices = slices or {}
+        self.cache = cache
+
+class ReportGenerator:
+    stages = []
+    active_sheet = None
+    raw_data_defaults = {}
+    config_attributes = ()
+
+    def __init__(self, engine=None, workers=None, stage_cache=None):
+        self.engine = engine
+        self.workers = DEFAULT_WORKERS if workers is None else workers
+        self.stage_cache = StageCache() if stage_cache is None else stage_cache
+        self.digests = {}
+        self.raw_data = RawDataPolicy()
+        self.primary_color = "1E3A8A"
+        self.secondary_color = "3B82F6"
+        self.success_color = "10B981"
+        self.warning_color = "F59E0B"
+        self.danger_color = "EF4444"
+        self.light_bg = "F3F4F6"
+        self.header_bg = "1E40AF"
+
+    def pipeline(self):
+        return self.stages
+
+    def prepare(self, data):
+        return {
+            'data': data,
+            'period_type': data.get('periodType', 'monthly')
+        }
+
+    def active_sheet_title(self, state):
+        return self.active_sheet
+
+    def stage_inputs(self, stage, state):
+        args = []
+        for name in stage.inputs:
+            value = state[name]
+            keys = stage.slices.get(name)
+            if keys is not None and isinstance(value, dict):
+                value = {key: value[key] for key in keys if key in value}
+            args.append(value)
+        return args
+
+    def input_digest(self, stage, name, state):
+        keys = stage.slices.get(name)
+        if keys is None and name == 'data':
+            keys = sorted(state['data'])
+
+        if keys is not None:
+            digests = []
+            for key in keys:
+                if (name, key) not in self.digests:
+                    value = state[name]
+                    value = value.get(key) if isinstance(value, dict) else getattr(value, key, None)
+                    self.digests[(name, key)] = value_digest(value)
+                digests.append([key, self.digests[(name, key)]])
+            return digests
+
+        if isinstance(self.digests.get(name), SheetStage):
+            self.digests[name] = self.stage_key(self.digests[name], state)
+        if name in self.digests:
+            return self.digests[name]
+        return value_digest(state[name])
+
+    def stage_config(self):
+        config = {name: getattr(self, name) for name in self.config_attributes}
+        config['raw_data'] = self.raw_data.cache_key()
+        return config
+
+    def stage_key(self, stage, state):
+        config = self.stage_config()
+        inputs = [self.input_digest(stage, name, state) for name in stage.inputs]
+        return self.stage_cache.key(sys.modules[type(self).__module__].__file__, stage.builder, config, inputs)
+
+    def cached_partitions(self, builder, records, partition, build, inputs=()):
+        if not self.stage_cache.enabled:
+            return [build(records)]
+
+        generator_file = sys.modules[type(self).__module__].__file__
+        digests = partition_digests(records, partition)
+        keys = {part: self.stage_cache.key(generator_file, builder, {}, [repr(part), digest] + list(inputs)) for part, digest in digests.items()}
+        results = {part: self.stage_cache.fetch(key) for part, key in keys.items()}
+
+        pending = defaultdict(list)
+        if None in results.values():
+            for record in records:
+                part = partition(record)
+                if results[part] is None:
+                    pending[part].append(record)
+        for part, items in pending.items():
+            results[part] = build(items)
+            self.stage_cache.store(keys[part], results[part])
+
+        return [results[part] for part in sorted(results, key=repr)]
+
+    def cached(self, stage):
+        return stage.cache and self.stage_cache.enabled
+
+    def run_stage(self, wb, stage, state):
+        builder = getattr(self, stage.builder)
+        args = self.stage_inputs(stage, state)
+        return builder(wb, *args) if stage.sheet else builder(*args)
+
+    def render_stage(self, stage, state):
+        wb = StageWorkbook()
+        result = self.run_stage(wb, stage, state)
+        return wb.created, wb._wb, result
+
+    def timed_render(self, stage, state):
+        started = time.perf_counter()
+        rendered = self.render_stage(stage, state)
+        return rendered, time.perf_counter() - started
+
+    def store_output(self, stage, state, result, key=None):
+        if stage.output is None:
+            return
+
+        outputs = stage.output if isinstance(stage.output, tuple) else (stage.output,)
+        results = result if isinstance(stage.output, tuple) else (result,)
+        for name, value in zip(outputs, results):
+            state[name] = value
+            self.digests[name] = key or stage
+
+    def render_parallel(self, stages, state):
+        global _parallel_job
+        _parallel_job = (self, stages, state)
+
+        try:
+            context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(stages)), mp_context=context) as pool:
+                results = list(pool.map(_render_stage, range(len(stages))))
+        finally:
+            _parallel_job = None
+
+        metrics = current_metrics()
+        for _, _, peak in results:
+            metrics.record_worker_peak(peak)
+        return [(rendered, seconds) for rendered, seconds, _ in results]
+
+    def run_isolated(self, wb, stages, state):
+        metrics = current_metrics()
+        keys, rendered, seconds = [], [], []
+        for stage in stages:
+            started = time.perf_counter()
+            keys.append(self.stage_key(stage, state) if self.cached(stage) else None)
+            rendered.append(self.stage_cache.fetch(keys[-1]) if keys[-1] else None)
+            seconds.append(time.perf_counter() - started)
+        pending = [index for index, item in enumerate(rendered) if item is None]
+
+        if self.workers > 1 and len(pending) > 1:
+            results = self.render_parallel([stages[index] for index in pending], state)
+        else:
+            results = [self.timed_render(stages[index], state) for index in pending]
+
+        for index, (item, elapsed) in zip(pending, results):
+            rendered[index] = item
+            seconds[index] += elapsed
+            if keys[index]:
+                self.stage_cache.store(keys[index], item)
+
+        for index, (stage, key, (created, stage_wb, result)) in enumerate(zip(stages, keys, rendered)):
+            started = time.perf_counter()
+            for title, position in created:
+                wb.adopt_sheet(stage_wb[title], position)
+            self.store_output(stage, state, result, key)
+
+            sheets = [title for title, _ in created] if stage.sheet else None
+            metrics.record_stage(stage.builder, seconds[index] + time.perf_counter() - started, sheets, index not in pending)
+
+    def run_inline(self, wb, stage, state):
+        metrics = current_metrics()
+        existing = set(wb.sheetnames)
+        started = time.perf_counter()
+        self.store_output(stage, state, self.run_stage(wb, stage, state))
+
+        sheets = [title for title in wb.sheetnames if title not in existing] if stage.sheet else None
+        metrics.record_stage(stage.builder, time.perf_counter() - started, sheets)
+
+    def create_workbook(self, data, output_path):
+        metrics = current_metrics()
+        wb = ReportWorkbook(self.engine)
+        self.raw_data = RawDataPolicy.from_options(data.get('rawData'), output_path, self.raw_data_defaults)
+        with metrics.timer('aggregate'):
+            state = self.prepare(data)
+        self.digests = {}
+
+        for parallel, group in groupby(self.pipeline(), key=lambda stage: stage.parallel and self.workers > 1):
+            group = [stage for stage in group if stage.when is None or stage.when(state)]
+            if parallel and len(group) > 1:
+                self.run_isolated(wb, group, state)
+                continue
+
+            for stage in group:
+                if self.cached(stage):
+                    self.run_isolated(wb, [stage], state)
+                else:
+                    self.run_inline(wb, stage, state)
+
+        if 'Sheet' in wb.sheetnames:
+            wb.remove(wb['Sheet'])
+
+        title = self.active_sheet_title(state)
+        if title is not None:
+            wb.active = wb[title]
+
+        metrics.record_workbook(wb)
+        with metrics.timer('save'):
+            wb.save(output_path)
+            self.raw_data.finalize(output_path, len(data.get('shipmentData', [])))
+        return output_path
+
+    def write_header_row(self, ws, row, headers, size=10, wrap_text=False):
+        font = Font(bold=True, color="FFFFFF", size=size)
+        fill = PatternFill(start_color=self.header_bg, end_color=self.header_bg, fill_type="solid")
+        if wrap_text:
+            alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        else:
+            alignment = Alignment(horizontal="center", vertical="center")
+
+        for col, header in enumerate(headers, 1):
+            cell = ws.cell(row=row, column=col, value=header)
+            cell.font = font
+            cell.fill = fill
+            cell.alignment = alignment
+
+    def safe_float(self, value, default=0.0):
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return default
+
+    def safe_int(self, value, default=0):
+        try:
+            return int(float(value))
+        except (ValueError, TypeError):
+            return default
+
+def validate_choice(value, choices, label='Mode'):
+    if value not in choices:
+        raise ValueError(f"{label} must be either {' or '.join(repr(choice) for choice in choices)}")
+
+def run_cli(script_name, generate_report, choices=None, label='Mode'):
+    try:
+        args, engine = parse_engine_args(sys.argv[1:])
+
+        choice_usage = f" [{'|'.join(choices)}]" if choices else ""
+        if len(args) not in ([2, 3] if choices else [2]):
+            raise ValueError(f"Usage: python {script_name} <input_json> <output_excel>{choice_usage} {ENGINE_USAGE}")
+
+        extra = []
+        if choices:
+            choice = args[2] if len(args) > 2 else choices[0]
+            validate_choice(choice, choices, label)
+            extra.append(choice)
+
+        generator_file = sys.modules[generate_report.__module__].__file__
+        result_data = run_instrumented(
+            lambda: run_cached(
+                generator_file, args[0], args[1],
+                lambda: generate_report(args[0], args[1], *extra, engine=engine),
+                extra, engine
+            ),
+            args[1], os.path.splitext(script_name)[0]
+        )
+        print(json.dumps(result_data))
+
+        if not result_data.get("success"):
+            sys.exit(1)
+
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "error": str(e)
+        }))
+        sys.exit(1)
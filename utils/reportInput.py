@@ -0,0 +1,169 @@
+import io
+import os
+import re
+import json
+import hashlib
+from contextlib import contextmanager
+from reportMetrics import current_metrics
+
+STREAMED_KEYS = ['shipmentData']
+CHUNK_SIZE = 1024 * 1024
+WHITESPACE = re.compile(r'\s*')
+
+_shared_inputs = None
+
+class JsonStreamReader:
+    def __init__(self, f):
+        self.f = f
+        self.buf = ''
+        self.pos = 0
+        self.consumed = 0
+        self.keys = {}
+        self.decoder = json.JSONDecoder(object_pairs_hook=self._build_object)
+
+    def _build_object(self, pairs):
+        keys = self.keys
+        return {keys.setdefault(key, key): value for key, value in pairs}
+
+    def _fill(self):
+        chunk = self.f.read(max(CHUNK_SIZE, len(self.buf) - self.pos))
+        if not chunk:
+            return False
+
+        self.consumed += len(self.buf[:self.pos].encode('utf-8'))
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def offset(self):
+        return self.consumed + len(self.buf[:self.pos].encode('utf-8'))
+
+    def peek(self):
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON input: expected '{char}' but found '{found or 'end of file'}'")
+        self.pos += 1
+
+    def value(self, raw=False):
+        self.peek()
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+
+            if end == len(self.buf) and self._fill():
+                continue
+
+            text = self.buf[self.pos:end] if raw else None
+            self.pos = end
+            return (value, text) if raw else value
+
+    def iter_array(self, raw=False):
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            yield self.value(raw)
+
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Invalid JSON input: expected ',' or ']' but found '{separator or 'end of file'}'")
+
+    def iter_object(self):
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Invalid JSON input: expected ',' or '}}' but found '{separator or 'end of file'}'")
+
+class StreamedRecords:
+    def __init__(self, input_path, offset, count, digest):
+        self.input_path = input_path
+        self.offset = offset
+        self.count = count
+        self.digest = digest
+
+    @classmethod
+    def scan(cls, input_path, reader):
+        reader.peek()
+        offset = reader.offset()
+        digest = hashlib.sha256()
+        count = 0
+        for _, text in reader.iter_array(raw=True):
+            digest.update(text.encode('utf-8'))
+            digest.update(b',')
+            count += 1
+        return cls(input_path, offset, count, digest.hexdigest())
+
+    def __iter__(self):
+        with open(self.input_path, 'rb') as raw:
+            raw.seek(self.offset)
+            with io.TextIOWrapper(raw, encoding='utf-8') as f:
+                yield from JsonStreamReader(f).iter_array()
+
+    def __len__(self):
+        return self.count
+
+@contextmanager
+def shared_report_inputs():
+    global _shared_inputs
+    if _shared_inputs is not None:
+        yield
+        return
+
+    _shared_inputs = {}
+    try:
+        yield
+    finally:
+        _shared_inputs = None
+
+def load_report_input(input_path, streamed_keys=None):
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+
+    streamed_keys = STREAMED_KEYS if streamed_keys is None else streamed_keys
+    stat = os.stat(input_path)
+    shared_key = (os.path.abspath(input_path), stat.st_mtime_ns, stat.st_size, tuple(streamed_keys))
+    if _shared_inputs is not None and shared_key in _shared_inputs:
+        return _shared_inputs[shared_key]
+
+    data = {}
+    with current_metrics().timer('load'), open(input_path, 'r', encoding='utf-8') as f:
+        reader = JsonStreamReader(f)
+        for key in reader.iter_object():
+            if key in streamed_keys and reader.peek() == '[':
+                data[key] = StreamedRecords.scan(os.path.abspath(input_path), reader)
+            else:
+                data[key] = reader.value()
+
+    if _shared_inputs is not None:
+        _shared_inputs[shared_key] = data
+    return data
@@ -0,0 +1,164 @@
+import os
+import sys
+import time
+import cProfile
+import resource
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILERS = ['cprofile', 'tracemalloc']
+DEFAULT_PROFILE = os.environ.get('REPORT_PROFILE', '')
+DEFAULT_PROFILE_DIR = os.environ.get('REPORT_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'report-profiles'))
+TRACEMALLOC_TOP = 50
+
+_current = None
+
+def parse_profilers(value):
+    profilers = [name.strip().lower() for name in (value or '').split(',') if name.strip()]
+    for name in profilers:
+        if name not in PROFILERS:
+            raise ValueError(f"REPORT_PROFILE must be a comma separated list of: {', '.join(PROFILERS)}")
+    return profilers
+
+def reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def _status_kb(field):
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def peak_rss_mb():
+    peak_kb = _status_kb('VmHWM')
+    if peak_kb is None:
+        scale = 1024 if sys.platform == 'darwin' else 1
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    return round(peak_kb / 1024, 1)
+
+class ReportMetrics:
+    def __init__(self, profile=DEFAULT_PROFILE, profile_dir=DEFAULT_PROFILE_DIR):
+        self.profilers = parse_profilers(profile)
+        self.profile_dir = profile_dir
+        self.seconds = {}
+        self.stages = []
+        self.cells = None
+        self.sheets = None
+        self.profiles = {}
+        self.tracemalloc_peak_mb = None
+        self.peak_scope = 'process'
+        self.worker_peak_rss_mb = None
+
+    def add_time(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def record_stage(self, name, seconds, sheets=None, cached=False):
+        self.add_time('aggregate' if sheets is None else 'sheets', seconds)
+        self.stages.append({
+            'stage': name,
+            'sheets': sheets or [],
+            'seconds': round(seconds, 4),
+            'cached': cached
+        })
+
+    def record_worker_peak(self, peak_mb):
+        self.worker_peak_rss_mb = max(self.worker_peak_rss_mb or 0.0, peak_mb)
+
+    def record_workbook(self, wb):
+        self.sheets = len(wb.sheetnames)
+        self.cells = wb.cell_count()
+
+    def _profile_path(self, label, extension):
+        os.makedirs(self.profile_dir, mode=0o700, exist_ok=True)
+        name = f"{label}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.{extension}"
+        return os.path.join(self.profile_dir, name)
+
+    def _dump_profile(self, profiler, label):
+        path = self._profile_path(label, 'prof')
+        profiler.dump_stats(path)
+        self.profiles['cprofile'] = path
+
+    def _dump_tracemalloc(self, snapshot, label):
+        path = self._profile_path(label, 'txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            for stat in snapshot.statistics('lineno')[:TRACEMALLOC_TOP]:
+                f.write(f"{stat}\n")
+        self.profiles['tracemalloc'] = path
+
+    def run(self, build, label='report'):
+        profiler = cProfile.Profile() if 'cprofile' in self.profilers else None
+        tracing = 'tracemalloc' in self.profilers and not tracemalloc.is_tracing()
+
+        if tracing:
+            tracemalloc.start()
+        if profiler is not None:
+            profiler.enable()
+
+        self.peak_scope = 'job' if reset_peak_rss() else 'process'
+        started = time.perf_counter()
+        try:
+            return build()
+        finally:
+            self.seconds['total'] = time.perf_counter() - started
+
+            if profiler is not None:
+                profiler.disable()
+                self._dump_profile(profiler, label)
+            if tracing:
+                self.tracemalloc_peak_mb = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+                self._dump_tracemalloc(tracemalloc.take_snapshot(), label)
+                tracemalloc.stop()
+
+    def summary(self, output_path=None):
+        summary = {
+            'seconds': {name: round(value, 4) for name, value in self.seconds.items()},
+            'stages': self.stages,
+            'sheets': self.sheets,
+            'cells': self.cells,
+            'output_bytes': os.path.getsize(output_path) if output_path and os.path.exists(output_path) else None,
+            'peak_rss_mb': peak_rss_mb(),
+            'peak_rss_scope': self.peak_scope
+        }
+
+        if self.worker_peak_rss_mb is not None:
+            summary['worker_peak_rss_mb'] = self.worker_peak_rss_mb
+        if self.tracemalloc_peak_mb is not None:
+            summary['tracemalloc_peak_mb'] = self.tracemalloc_peak_mb
+        if self.profiles:
+            summary['profiles'] = self.profiles
+        return summary
+
+def current_metrics():
+    return _current if _current is not None else ReportMetrics('')
+
+def run_instrumented(build, output_path, label='report'):
+    global _current
+    metrics = ReportMetrics()
+    previous, _current = _current, metrics
+
+    try:
+        result = metrics.run(build, label)
+    finally:
+        _current = previous
+
+    if isinstance(result, dict):
+        result['metrics'] = metrics.summary(output_path)
+    return result
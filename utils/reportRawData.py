@@ -0,0 +1,257 @@
+import os
+import csv
+import gzip
+import json
+import zipfile
+from collections import Counter
+from itertools import islice
+from contextlib import contextmanager
+
+RAW_DATA_MODES = ['full', 'head', 'stratified', 'external']
+RAW_DATA_FORMATS = ['csv.gz', 'csv', 'parquet']
+DEFAULT_MAX_ROWS = int(os.environ.get('REPORT_RAW_MAX_ROWS', '10000'))
+DEFAULT_FORMAT = os.environ.get('REPORT_RAW_FORMAT', 'csv.gz')
+PARQUET_CHUNK_ROWS = 50000
+MANIFEST_VERSION = 1
+CONTENT_TYPES = {
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv',
+    'csv.gz': 'application/gzip',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+def allocate_quotas(sizes, max_rows):
+    total = sum(sizes.values())
+    if total <= max_rows:
+        return dict(sizes)
+
+    base = 1 if len(sizes) <= max_rows else 0
+    budget = max_rows - base * len(sizes)
+    remaining = total - base * len(sizes)
+
+    quotas = {}
+    remainders = []
+    for key, size in sizes.items():
+        share = (size - base) * budget
+        quotas[key] = base + (share // remaining if remaining else 0)
+        remainders.append((-(share % remaining) if remaining else 0, str(key), key))
+
+    for _, _, key in sorted(remainders)[:max_rows - sum(quotas.values())]:
+        quotas[key] += 1
+    return quotas
+
+def shipment_stratum(period_type, hub_key, date_key, week_key):
+    if period_type == 'weekly':
+        return lambda record: (record.get(hub_key), record.get(week_key))
+    return lambda record: (record.get(hub_key), str(record.get(date_key) or '')[3:])
+
+def plain_value(value):
+    return getattr(value, 'value', value)
+
+class CsvSidecar:
+    def __init__(self, path, headers, compressed):
+        if compressed:
+            self.file = gzip.open(path, 'wt', newline='', encoding='utf-8', compresslevel=6)
+        else:
+            self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(headers)
+        self.rows = 0
+
+    def write(self, values):
+        self.writer.writerow(values)
+        self.rows += 1
+
+    def close(self):
+        self.file.close()
+
+class ParquetSidecar:
+    def __init__(self, path, headers, numeric):
+        try:
+            import pandas as pd
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet raw data export requires pandas and pyarrow")
+
+        self.pd = pd
+        self.pa = pa
+        self.headers = list(headers)
+        self.numeric = set(numeric)
+        self.schema = pa.schema([(name, pa.float64() if name in self.numeric else pa.string()) for name in self.headers])
+        self.writer = pq.ParquetWriter(path, self.schema, compression='snappy')
+        self.chunk = []
+        self.rows = 0
+
+    def write(self, values):
+        self.chunk.append(values)
+        self.rows += 1
+        if len(self.chunk) >= PARQUET_CHUNK_ROWS:
+            self.flush()
+
+    def flush(self):
+        frame = self.pd.DataFrame(self.chunk, columns=self.headers)
+        for name in self.headers:
+            if name in self.numeric:
+                frame[name] = self.pd.to_numeric(frame[name], errors='coerce')
+            else:
+                frame[name] = frame[name].map(lambda value: None if value is None else str(value))
+
+        self.writer.write_table(self.pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False))
+        self.chunk = []
+
+    def close(self):
+        if self.chunk or not self.rows:
+            self.flush()
+        self.writer.close()
+
+class RawDataPolicy:
+    def __init__(self, mode='full', max_rows=DEFAULT_MAX_ROWS, path=None, format=DEFAULT_FORMAT, bundle=False):
+        if mode not in RAW_DATA_MODES:
+            raise ValueError(f"Raw data mode must be one of: {', '.join(RAW_DATA_MODES)}")
+        if isinstance(max_rows, bool) or not isinstance(max_rows, int) or max_rows < 0:
+            raise ValueError("Raw data maxRows must be a non-negative integer")
+        if format not in RAW_DATA_FORMATS:
+            raise ValueError(f"Raw data format must be one of: {', '.join(RAW_DATA_FORMATS)}")
+
+        self.mode = mode
+        self.max_rows = max_rows
+        self.path = path if mode == 'external' else None
+        self.format = format if mode == 'external' else None
+        self.bundle = bool(bundle) and mode == 'external'
+
+    @classmethod
+    def from_options(cls, options, output_path, defaults=None):
+        if options is not None and not isinstance(options, dict):
+            raise ValueError("rawData must be an object")
+
+        options = dict(defaults or {}, **(options or {}))
+        mode = options.get('mode', 'full')
+        format = options.get('format', DEFAULT_FORMAT)
+        path = options.get('path')
+        if mode == 'external' and not path:
+            path = f"{os.path.splitext(output_path)[0]}-raw.{format}"
+
+        return cls(mode, options.get('maxRows', DEFAULT_MAX_ROWS), path, format, options.get('bundle', False))
+
+    def cache_key(self):
+        return [self.mode, self.max_rows, self.format]
+
+    def truncates(self, total):
+        return self.mode == 'external' or (self.mode != 'full' and total > self.max_rows)
+
+    def rows_written(self, total):
+        if self.mode == 'external':
+            return 0
+        return min(total, self.max_rows) if self.truncates(total) else total
+
+    def scan(self, records):
+        if self.mode == 'head' and self.truncates(len(records)):
+            return islice(records, self.max_rows)
+        return records
+
+    def selector(self, records, stratum=None):
+        if not self.truncates(len(records)):
+            return lambda index, record: True
+        if self.mode == 'external':
+            return lambda index, record: False
+        if self.mode == 'head' or stratum is None:
+            return lambda index, record: index < self.max_rows
+
+        sizes = Counter(stratum(record) for record in records)
+        quotas = allocate_quotas(sizes, self.max_rows)
+        seen = Counter()
+
+        def select(index, record):
+            key = stratum(record)
+            position = seen[key]
+            seen[key] += 1
+            return (position + 1) * quotas[key] // sizes[key] > position * quotas[key] // sizes[key]
+
+        return select
+
+    @contextmanager
+    def sidecar(self, headers, numeric=()):
+        if self.mode != 'external':
+            yield None
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        if self.format == 'parquet':
+            writer = ParquetSidecar(self.path, headers, numeric)
+        else:
+            writer = CsvSidecar(self.path, headers, self.format == 'csv.gz')
+
+        try:
+            yield writer
+        finally:
+            writer.close()
+
+    def write_row(self, sidecar, values):
+        if sidecar is not None:
+            sidecar.write([plain_value(value) for value in values])
+
+    def manifest_path(self, output_path):
+        return f"{os.path.splitext(output_path)[0]}-manifest.json"
+
+    def bundle_path(self, output_path):
+        return f"{os.path.splitext(output_path)[0]}.zip"
+
+    def manifest(self, output_path, total):
+        return {
+            'version': MANIFEST_VERSION,
+            'workbook': {
+                'name': os.path.basename(output_path),
+                'content_type': CONTENT_TYPES['xlsx'],
+                'bytes': os.path.getsize(output_path)
+            },
+            'raw_data': {
+                'name': os.path.basename(self.path),
+                'format': self.format,
+                'content_type': CONTENT_TYPES[self.format],
+                'rows': total,
+                'bytes': os.path.getsize(self.path)
+            }
+        }
+
+    def finalize(self, output_path, total):
+        if self.mode != 'external' or not os.path.exists(self.path):
+            return
+
+        manifest_path = self.manifest_path(output_path)
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest(output_path, total), f, indent=2)
+
+        if self.bundle:
+            with zipfile.ZipFile(self.bundle_path(output_path), 'w', zipfile.ZIP_STORED) as bundle:
+                bundle.write(manifest_path, 'manifest.json')
+                bundle.write(output_path, os.path.basename(output_path))
+                bundle.write(self.path, os.path.basename(self.path))
+
+    def describe(self, total):
+        written = self.rows_written(total)
+        if self.mode == 'external':
+            return f"all {total:,} rows exported to {os.path.basename(self.path)}"
+        if not self.truncates(total):
+            return f"all {total:,} rows"
+        if self.mode == 'head':
+            return f"first {written:,} of {total:,} rows (head sample)"
+        return f"{written:,} of {total:,} rows (stratified sample by hub and period)"
+
+    def summary(self, total, output_path=None):
+        summary = {
+            'mode': self.mode,
+            'max_rows': self.max_rows,
+            'total_rows': total,
+            'rows_written': self.rows_written(total),
+            'sampled': self.truncates(total)
+        }
+        if self.path:
+            summary['path'] = self.path
+            summary['format'] = self.format
+            if output_path:
+                summary['manifest_path'] = self.manifest_path(output_path)
+                if self.bundle:
+                    summary['bundle_path'] = self.bundle_path(output_path)
+        return summary
@@ -0,0 +1,24 @@
+from functools import lru_cache
+from openpyxl import styles
+
+@lru_cache(maxsize=None)
+def _interned(style_class, items):
+    return style_class(**dict(items))
+
+def _style(style_class, kwargs):
+    return _interned(style_class, tuple(sorted(kwargs.items())))
+
+def Font(**kwargs):
+    return _style(styles.Font, kwargs)
+
+def PatternFill(**kwargs):
+    return _style(styles.PatternFill, kwargs)
+
+def Alignment(**kwargs):
+    return _style(styles.Alignment, kwargs)
+
+def Side(**kwargs):
+    return _style(styles.Side, kwargs)
+
+def Border(**kwargs):
+    return _style(styles.Border, kwargs)
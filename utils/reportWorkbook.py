@@ -0,0 +1,640 @@
+import os
+import copyreg
+from copy import copy
+import openpyxl
+import xlsxwriter
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles.cell_style import StyleArray
+from openpyxl.styles.numbers import BUILTIN_FORMATS_MAX_SIZE
+from openpyxl.utils import column_index_from_string
+from openpyxl.utils.cell import coordinate_to_tuple, range_boundaries
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+from openpyxl.worksheet.dimensions import DimensionHolder
+from xlsxwriter.worksheet import Worksheet, re_dynamic_function
+
+ENGINES = ['openpyxl', 'streaming', 'xlsxwriter']
+DEFAULT_ENGINE = os.environ.get('REPORT_ENGINE', 'openpyxl')
+
+BORDER_STYLES = {
+    'thin': 1, 'medium': 2, 'dashed': 3, 'dotted': 4, 'thick': 5, 'double': 6, 'hair': 7,
+    'mediumDashed': 8, 'dashDot': 9, 'mediumDashDot': 10, 'dashDotDot': 11,
+    'mediumDashDotDot': 12, 'slantDashDot': 13
+}
+
+FILL_PATTERNS = [
+    'none', 'solid', 'mediumGray', 'darkGray', 'lightGray', 'darkHorizontal', 'darkVertical',
+    'darkDown', 'darkUp', 'darkGrid', 'darkTrellis', 'lightHorizontal', 'lightVertical',
+    'lightDown', 'lightUp', 'lightGrid', 'lightTrellis', 'gray125', 'gray0625'
+]
+
+HORIZONTAL_ALIGNMENTS = {
+    'left': 'left', 'center': 'center', 'right': 'right', 'fill': 'fill', 'justify': 'justify',
+    'centerContinuous': 'center_across', 'distributed': 'distributed'
+}
+
+VERTICAL_ALIGNMENTS = {
+    'top': 'top', 'center': 'vcenter', 'bottom': 'bottom', 'justify': 'vjustify',
+    'distributed': 'vdistributed'
+}
+
+UNDERLINES = {'single': 1, 'double': 2, 'singleAccounting': 33, 'doubleAccounting': 34}
+
+CHART_TYPES = {
+    'lineChart': 'line', 'pieChart': 'pie', 'doughnutChart': 'doughnut', 'areaChart': 'area',
+    'radarChart': 'radar', 'scatterChart': 'scatter'
+}
+
+CM_TO_PIXELS = 360000 / 9525
+EMU_PER_POINT = 12700
+
+def parse_engine_args(argv):
+    args = []
+    engine = None
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg == '--engine' and i + 1 < len(argv):
+            engine = argv[i + 1]
+            i += 2
+            continue
+        if arg.startswith('--engine='):
+            engine = arg.split('=', 1)[1]
+        else:
+            args.append(arg)
+        i += 1
+
+    return args, engine
+
+def color_to_hex(color):
+    if color is None or getattr(color, 'type', None) != 'rgb' or not isinstance(color.rgb, str):
+        return None
+    return '#' + color.rgb[-6:]
+
+def style_to_format_properties(font=None, fill=None, border=None, alignment=None, number_format=None):
+    props = {}
+
+    if font is not None:
+        if font.name:
+            props['font_name'] = font.name
+        if font.sz:
+            props['font_size'] = font.sz
+        if font.b:
+            props['bold'] = True
+        if font.i:
+            props['italic'] = True
+        if font.strike:
+            props['font_strikeout'] = True
+        if font.u in UNDERLINES:
+            props['underline'] = UNDERLINES[font.u]
+        if font.vertAlign == 'superscript':
+            props['font_script'] = 1
+        elif font.vertAlign == 'subscript':
+            props['font_script'] = 2
+        font_color = color_to_hex(font.color)
+        if font_color:
+            props['font_color'] = font_color
+
+    if fill is not None and getattr(fill, 'fill_type', None) in FILL_PATTERNS[1:]:
+        props['pattern'] = FILL_PATTERNS.index(fill.fill_type)
+        fg_color = color_to_hex(fill.fgColor)
+        bg_color = color_to_hex(fill.bgColor)
+        if fill.fill_type == 'solid':
+            if fg_color:
+                props['bg_color'] = fg_color
+        else:
+            if fg_color:
+                props['fg_color'] = fg_color
+            if bg_color:
+                props['bg_color'] = bg_color
+
+    if border is not None:
+        for side in ['left', 'right', 'top', 'bottom']:
+            edge = getattr(border, side)
+            if edge is not None and edge.style in BORDER_STYLES:
+                props[side] = BORDER_STYLES[edge.style]
+                edge_color = color_to_hex(edge.color)
+                if edge_color:
+                    props[f'{side}_color'] = edge_color
+
+    if alignment is not None:
+        if alignment.horizontal in HORIZONTAL_ALIGNMENTS:
+            props['align'] = HORIZONTAL_ALIGNMENTS[alignment.horizontal]
+        if alignment.vertical in VERTICAL_ALIGNMENTS:
+            props['valign'] = VERTICAL_ALIGNMENTS[alignment.vertical]
+        if alignment.wrap_text:
+            props['text_wrap'] = True
+        if alignment.shrink_to_fit:
+            props['shrink'] = True
+        if alignment.indent:
+            props['indent'] = int(alignment.indent)
+        if alignment.text_rotation:
+            props['rotation'] = int(alignment.text_rotation)
+
+    if number_format and number_format != 'General':
+        props['num_format'] = number_format
+
+    return props
+
+def remap_style(style, source, target):
+    remapped = StyleArray(style)
+    remapped.fontId = target._fonts.add(source._fonts[style.fontId])
+    remapped.fillId = target._fills.add(source._fills[style.fillId])
+    remapped.borderId = target._borders.add(source._borders[style.borderId])
+    remapped.protectionId = target._protections.add(source._protections[style.protectionId])
+    remapped.alignmentId = target._alignments.add(source._alignments[style.alignmentId])
+    if style.numFmtId >= BUILTIN_FORMATS_MAX_SIZE:
+        number_format = source._number_formats[style.numFmtId - BUILTIN_FORMATS_MAX_SIZE]
+        remapped.numFmtId = target._number_formats.add(number_format) + BUILTIN_FORMATS_MAX_SIZE
+    return remapped
+
+def reduce_dimension_holder(holder):
+    return DimensionHolder, (holder.worksheet, holder.reference, holder.default_factory), vars(holder), None, iter(holder.items())
+
+copyreg.pickle(DimensionHolder, reduce_dimension_holder)
+
+def rich_text(title):
+    if title is None or title.tx is None or title.tx.rich is None:
+        return None
+
+    parts = []
+    for paragraph in title.tx.rich.p:
+        for run in paragraph.r or []:
+            parts.append(run.t)
+    return ''.join(parts)
+
+class ReportWorksheet(Worksheet):
+    def _prepare_formula(self, formula, expand_future_functions=False):
+        if self.use_future_functions or expand_future_functions or re_dynamic_function.search(formula):
+            return super()._prepare_formula(formula, expand_future_functions)
+
+        if formula.startswith('{'):
+            formula = formula[1:]
+        if formula.startswith('='):
+            formula = formula[1:]
+        if formula.endswith('}'):
+            formula = formula[:-1]
+        return formula
+
+    def merge_range(self, first_row, first_col, last_row, last_col, data, cell_format=None):
+        if not self.constant_memory or first_row == last_row:
+            return super().merge_range(first_row, first_col, last_row, last_col, data, cell_format)
+
+        self.merge.append([first_row, first_col, last_row, last_col])
+        return self.write(first_row, first_col, data, cell_format)
+
+class StyledValue:
+    def __init__(self, value, cell_format):
+        self.value = value
+        self.cell_format = cell_format
+
+class StreamSheet:
+    def __init__(self, ws):
+        self.ws = ws
+        self.row_count = 0
+        self.cell_count = 0
+
+    @property
+    def title(self):
+        return self.ws.title
+
+    @property
+    def sheet_state(self):
+        return self.ws.sheet_state
+
+    @sheet_state.setter
+    def sheet_state(self, value):
+        self.ws.sheet_state = value
+
+    def set_column_width(self, column_letter, width):
+        self.ws.column_dimensions[column_letter].width = width
+
+    def styled_cell(self, value, font=None, fill=None, alignment=None, number_format=None):
+        cell = WriteOnlyCell(self.ws, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if alignment is not None:
+            cell.alignment = alignment
+        if number_format is not None:
+            cell.number_format = number_format
+        return cell
+
+    def append(self, values):
+        self.ws.append(values)
+        self.row_count += 1
+        self.cell_count += len(values)
+
+    def merge_cells(self, range_string):
+        if isinstance(self.ws, WriteOnlyWorksheet):
+            self.ws.merged_cells.add(range_string)
+        else:
+            self.ws.merge_cells(range_string)
+
+class XlsxStreamSheet(StreamSheet):
+    def __init__(self, ws, workbook):
+        super().__init__(ws)
+        self.workbook = workbook
+        self.sheet_state = 'visible'
+        self._last_row = {}
+
+    @property
+    def title(self):
+        return self.ws.name
+
+    @property
+    def sheet_state(self):
+        return self._sheet_state
+
+    @sheet_state.setter
+    def sheet_state(self, value):
+        self._sheet_state = value
+
+    def set_column_width(self, column_letter, width):
+        col = column_index_from_string(column_letter) - 1
+        self.ws.set_column(col, col, width)
+
+    def styled_cell(self, value, font=None, fill=None, alignment=None, number_format=None):
+        key = (font, fill, alignment, number_format)
+        if key not in self.workbook._stream_formats:
+            self.workbook._stream_formats[key] = self.workbook._xlsx_format(style_to_format_properties(
+                font=font, fill=fill, alignment=alignment, number_format=number_format))
+        return StyledValue(value, self.workbook._stream_formats[key])
+
+    def append(self, values):
+        row = self.row_count
+        self._last_row = {}
+
+        for col, value in enumerate(values):
+            cell_format = None
+            if isinstance(value, StyledValue):
+                value, cell_format = value.value, value.cell_format
+            elif value is None:
+                continue
+
+            if type(value) is str and value:
+                if value[0] == '=':
+                    self.ws.write_formula(row, col, value, cell_format)
+                else:
+                    self.ws.write_string(row, col, value, cell_format)
+            else:
+                self.ws.write(row, col, value, cell_format)
+            self._last_row[col] = (value, cell_format)
+
+        self.row_count += 1
+        self.cell_count += len(self._last_row)
+
+    def merge_cells(self, range_string):
+        min_col, min_row, max_col, max_row = range_boundaries(range_string)
+        value, cell_format = self._last_row.get(min_col - 1, (None, None)) if min_row == self.row_count else (None, None)
+        self.ws.merge_range(min_row - 1, min_col - 1, max_row - 1, max_col - 1, value, cell_format)
+
+class ReportWorkbook:
+    def __init__(self, engine=None):
+        engine = engine or DEFAULT_ENGINE
+        if engine not in ENGINES:
+            raise ValueError(f"Engine must be one of: {', '.join(ENGINES)}")
+
+        self.engine = engine
+        self._sheets = []
+        self._active = None
+
+        if engine == 'openpyxl':
+            self._wb = openpyxl.Workbook()
+            return
+
+        self._scratch = openpyxl.Workbook()
+        self._scratch.remove(self._scratch.active)
+
+        if engine == 'streaming':
+            self._wb = openpyxl.Workbook(write_only=True)
+        else:
+            self._wb = xlsxwriter.Workbook(options={
+                'constant_memory': True,
+                'strings_to_urls': False,
+                'nan_inf_to_errors': True
+            })
+            self._formats = {}
+            self._style_formats = {}
+            self._stream_formats = {}
+
+    @property
+    def sheetnames(self):
+        if self.engine == 'openpyxl':
+            return self._wb.sheetnames
+        return [ws.title for ws in self._sheets]
+
+    def __getitem__(self, title):
+        if self.engine == 'openpyxl':
+            return self._wb[title]
+
+        for ws in self._sheets:
+            if ws.title == title:
+                return ws
+        raise KeyError(f"Worksheet {title} does not exist.")
+
+    def _add_sheet(self, ws, index):
+        if index is None:
+            self._sheets.append(ws)
+        else:
+            self._sheets.insert(index, ws)
+        return ws
+
+    def create_sheet(self, title, index=None):
+        if self.engine == 'openpyxl':
+            return self._wb.create_sheet(title, index)
+        return self._add_sheet(self._scratch.create_sheet(title), index)
+
+    def create_stream_sheet(self, title, index=None):
+        if self.engine == 'openpyxl':
+            return StreamSheet(self._wb.create_sheet(title, index))
+        if self.engine == 'streaming':
+            return self._add_sheet(StreamSheet(self._wb.create_sheet(title)), index)
+        return self._add_sheet(XlsxStreamSheet(self._wb.add_worksheet(title, ReportWorksheet), self), index)
+
+    def adopt_sheet(self, ws, index=None):
+        source = ws.parent
+        target = self._wb if self.engine == 'openpyxl' else self._scratch
+
+        styles = {}
+        styled = [cell for cell in ws._cells.values() if cell.has_style]
+        styled += [dim for dim in list(ws.column_dimensions.values()) + list(ws.row_dimensions.values()) if dim.has_style]
+        for item in styled:
+            key = tuple(item._style)
+            if key not in styles:
+                styles[key] = remap_style(item._style, source, target)
+            item._style = copy(styles[key])
+
+        source._sheets.remove(ws)
+        ws._parent = target
+
+        if self.engine == 'openpyxl':
+            target._sheets.insert(len(target._sheets) if index is None else index, ws)
+            return ws
+
+        target._sheets.append(ws)
+        return self._add_sheet(ws, index)
+
+    def remove(self, ws):
+        if self.engine == 'openpyxl':
+            self._wb.remove(ws.ws if isinstance(ws, StreamSheet) else ws)
+            return
+
+        self._sheets.remove(ws)
+        if isinstance(ws, XlsxStreamSheet):
+            self._wb.worksheets_objs.remove(ws.ws)
+            del self._wb.sheetnames[ws.title]
+        elif isinstance(ws, StreamSheet):
+            self._wb._sheets.remove(ws.ws)
+        else:
+            self._scratch.remove(ws)
+
+    @property
+    def active(self):
+        if self.engine == 'openpyxl':
+            return self._wb.active
+        return self._active
+
+    @active.setter
+    def active(self, ws):
+        if self.engine == 'openpyxl':
+            self._wb.active = ws.ws if isinstance(ws, StreamSheet) else ws
+        else:
+            self._active = ws
+
+    def cell_count(self):
+        if self.engine == 'openpyxl':
+            return sum(len(ws._cells) for ws in self._wb.worksheets)
+        return sum(ws.cell_count if isinstance(ws, StreamSheet) else len(ws._cells) for ws in self._sheets)
+
+    def save(self, output_path):
+        if self.engine == 'openpyxl':
+            self._wb.save(output_path)
+        elif self.engine == 'streaming':
+            self._save_write_only(output_path)
+        else:
+            self._save_xlsxwriter(output_path)
+        return output_path
+
+    def _save_write_only(self, output_path):
+        ordered = []
+        for ws in self._sheets:
+            if isinstance(ws, StreamSheet):
+                ordered.append(ws.ws)
+            else:
+                ordered.append(self._copy_to_write_only(ws))
+
+        self._wb._sheets = ordered
+        if self._active is not None:
+            self._wb.active = self._sheets.index(self._active)
+
+        self._wb.save(output_path)
+
+    def _copy_to_write_only(self, src):
+        dst = self._wb.create_sheet(src.title)
+        dst.sheet_state = src.sheet_state
+        dst.sheet_view.showGridLines = src.sheet_view.showGridLines
+        if src.freeze_panes:
+            dst.freeze_panes = src.freeze_panes
+
+        for key, dim in src.column_dimensions.items():
+            if dim.customWidth:
+                dst.column_dimensions[key].width = dim.width
+            if dim.hidden:
+                dst.column_dimensions[key].hidden = True
+
+        for key, dim in src.row_dimensions.items():
+            if dim.ht is not None:
+                dst.row_dimensions[key].height = dim.ht
+
+        for merged in src.merged_cells.ranges:
+            dst.merged_cells.add(str(merged))
+
+        for chart in src._charts:
+            dst.add_chart(chart)
+
+        styles = {}
+        for row in src.iter_rows():
+            values = []
+            for cell in row:
+                if not cell.has_style:
+                    values.append(cell.value)
+                    continue
+
+                key = tuple(cell._style)
+                style = styles.get(key)
+                if style is None:
+                    styled = WriteOnlyCell(dst)
+                    styled.font = copy(cell.font)
+                    styled.fill = copy(cell.fill)
+                    styled.border = copy(cell.border)
+                    styled.alignment = copy(cell.alignment)
+                    styled.number_format = cell.number_format
+                    styled.protection = copy(cell.protection)
+                    style = styles[key] = styled._style
+
+                out = WriteOnlyCell(dst, value=cell.value)
+                out._style = copy(style)
+                values.append(out)
+            dst.append(values)
+
+        return dst
+
+    def _xlsx_format(self, props):
+        if not props:
+            return None
+
+        key = tuple(sorted(props.items()))
+        cell_format = self._formats.get(key)
+        if cell_format is None:
+            cell_format = self._formats[key] = self._wb.add_format(props)
+        return cell_format
+
+    def _cell_format(self, cell):
+        if not cell.has_style:
+            return None
+
+        key = tuple(cell._style)
+        if key not in self._style_formats:
+            self._style_formats[key] = self._xlsx_format(style_to_format_properties(
+                font=cell.font, fill=cell.fill, border=cell.border,
+                alignment=cell.alignment, number_format=cell.number_format))
+        return self._style_formats[key]
+
+    def _save_xlsxwriter(self, output_path):
+        ordered = []
+        for sheet in self._sheets:
+            if isinstance(sheet, XlsxStreamSheet):
+                ordered.append(sheet.ws)
+                if sheet.sheet_state != 'visible':
+                    sheet.ws.hide()
+            else:
+                ordered.append(self._copy_to_xlsxwriter(sheet))
+
+        self._wb.worksheets_objs = ordered
+        for index, ws in enumerate(ordered):
+            ws.index = index
+
+        if self._active is not None:
+            ordered[self._sheets.index(self._active)].activate()
+
+        self._wb.filename = output_path
+        self._wb.close()
+
+    def _copy_to_xlsxwriter(self, src):
+        dst = self._wb.add_worksheet(src.title, ReportWorksheet)
+
+        if src.sheet_state != 'visible':
+            dst.hide()
+        if src.sheet_view.showGridLines is False:
+            dst.hide_gridlines(2)
+        if src.freeze_panes:
+            dst.freeze_panes(*[n - 1 for n in coordinate_to_tuple(src.freeze_panes)])
+
+        for key, dim in src.column_dimensions.items():
+            if dim.customWidth or dim.hidden:
+                first = (dim.min or column_index_from_string(key)) - 1
+                last = max((dim.max or 0) - 1, first)
+                dst.set_column(first, last, dim.width if dim.customWidth else None, None, {'hidden': True} if dim.hidden else None)
+
+        merges = {}
+        for merged in src.merged_cells.ranges:
+            merges.setdefault(merged.min_row, []).append(merged)
+
+        for row in src.iter_rows():
+            if not row:
+                continue
+
+            row_idx = row[0].row
+            height = src.row_dimensions[row_idx].ht if row_idx in src.row_dimensions else None
+            if height is not None:
+                dst.set_row(row_idx - 1, height)
+
+            for cell in row:
+                cell_format = self._cell_format(cell)
+                if cell.value is None:
+                    if cell_format is not None:
+                        dst.write_blank(row_idx - 1, cell.column - 1, None, cell_format)
+                    continue
+                dst.write(row_idx - 1, cell.column - 1, cell.value, cell_format)
+
+            for merged in merges.get(row_idx, []):
+                first = src.cell(row=merged.min_row, column=merged.min_col)
+                dst.merge_range(merged.min_row - 1, merged.min_col - 1, merged.max_row - 1, merged.max_col - 1,
+                                first.value, self._cell_format(first))
+
+        for chart in src._charts:
+            self._copy_chart(dst, chart)
+
+        return dst
+
+    def _copy_chart(self, dst, chart):
+        chart_type = {'type': CHART_TYPES.get(chart.tagname, 'column')}
+        if chart.tagname == 'barChart':
+            chart_type['type'] = 'bar' if chart.type == 'bar' else 'column'
+            if chart.grouping in ['stacked', 'percentStacked']:
+                chart_type['subtype'] = 'stacked' if chart.grouping == 'stacked' else 'percent_stacked'
+
+        out = self._wb.add_chart(chart_type)
+
+        for series in chart.series:
+            options = {}
+            if series.val is not None and series.val.numRef is not None:
+                options['values'] = '=' + series.val.numRef.f
+            if series.cat is not None:
+                ref = series.cat.numRef or series.cat.strRef
+                if ref is not None:
+                    options['categories'] = '=' + ref.f
+            if series.tx is not None and series.tx.strRef is not None:
+                options['name'] = '=' + series.tx.strRef.f
+
+            properties = series.graphicalProperties
+            if properties is not None:
+                if properties.solidFill is not None and properties.solidFill.srgbClr is not None:
+                    options['fill'] = {'color': '#' + str(properties.solidFill.srgbClr)}
+                if properties.line is not None:
+                    line = {}
+                    if properties.line.solidFill is not None and properties.line.solidFill.srgbClr is not None:
+                        line['color'] = '#' + str(properties.line.solidFill.srgbClr)
+                    if properties.line.w:
+                        line['width'] = properties.line.w / EMU_PER_POINT
+                    if line:
+                        options['line'] = line
+
+            out.add_series(options)
+
+        title = rich_text(chart.title)
+        if title:
+            out.set_title({'name': title})
+
+        if chart.tagname not in ['pieChart', 'doughnutChart']:
+            x_title = rich_text(chart.x_axis.title)
+            y_title = rich_text(chart.y_axis.title)
+            if x_title:
+                out.set_x_axis({'name': x_title})
+            if y_title:
+                out.set_y_axis({'name': y_title})
+
+        if chart.legend is None:
+            out.set_legend({'none': True})
+        if chart.style:
+            out.set_style(chart.style)
+
+        out.set_size({'width': round(chart.width * CM_TO_PIXELS), 'height': round(chart.height * CM_TO_PIXELS)})
+
+        anchor = chart.anchor if isinstance(chart.anchor, str) else 'E15'
+        dst.insert_chart(anchor, out)
+
+class StageWorkbook(ReportWorkbook):
+    def __init__(self):
+        super().__init__('openpyxl')
+        self._wb.remove(self._wb.active)
+        self.created = []
+
+    def create_sheet(self, title, index=None):
+        self.created.append((title, index))
+        return self._wb.create_sheet(title)
+
+    def create_stream_sheet(self, title, index=None):
+        raise ValueError(f"Stream sheet {title} cannot be rendered in a parallel stage")
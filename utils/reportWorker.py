@@ -0,0 +1,144 @@
+import sys
+import os
+import json
+import gc
+import socketserver
+from contextlib import redirect_stdout
+from reportCache import run_cached
+from reportMetrics import run_instrumented
+
+import chart_generator
+import taskAnalyticsChartGenerator
+import mitraPerformanceChartGeneratorFormula
+import mitraAnalysisChartGenerator
+import projectAnalysisChartGenerator
+import allMitraPerformanceChartGenerator
+import mitraStatusDashboardExporter
+
+GENERATORS = {
+    "chart_generator.py": chart_generator,
+    "taskAnalyticsChartGenerator.py": taskAnalyticsChartGenerator,
+    "mitraPerformanceChartGeneratorFormula.py": mitraPerformanceChartGeneratorFormula,
+    "mitraAnalysisChartGenerator.py": mitraAnalysisChartGenerator,
+    "projectAnalysisChartGenerator.py": projectAnalysisChartGenerator,
+    "allMitraPerformanceChartGenerator.py": allMitraPerformanceChartGenerator,
+    "mitraStatusDashboardExporter.py": mitraStatusDashboardExporter
+}
+
+def resolve_generator(name):
+    name = os.path.basename(name or "")
+    if not name.endswith(".py"):
+        name = f"{name}.py"
+
+    module = GENERATORS.get(name)
+    if module is None:
+        raise ValueError(f"Unknown generator: {name}")
+
+    return module
+
+def run_job(job):
+    module = resolve_generator(job.get("generator"))
+    output_path = job.get("output_path")
+    args = job.get("args", [])
+    kwargs = {"engine": job["engine"]} if job.get("engine") else {}
+
+    if not output_path:
+        raise ValueError("output_path is required")
+
+    if "data" in job:
+        payload = job["data"]
+        build = lambda: module.create_report(payload, output_path, *args, **kwargs)
+    elif job.get("input_path"):
+        payload = job["input_path"]
+        build = lambda: module.generate_report(payload, output_path, *args, **kwargs)
+    else:
+        raise ValueError("Either input_path or data is required")
+
+    label = os.path.splitext(os.path.basename(module.__file__))[0]
+    with redirect_stdout(sys.stderr):
+        return run_instrumented(
+            lambda: run_cached(module.__file__, payload, output_path, build, args, job.get("engine")),
+            output_path, label
+        )
+
+def handle_line(line):
+    job_id = None
+
+    try:
+        job = json.loads(line)
+        job_id = job.get("id")
+        result = run_job(job)
+    except Exception as e:
+        result = {
+            "success": False,
+            "error": str(e)
+        }
+    finally:
+        gc.collect()
+
+    return json.dumps({"id": job_id, "result": result})
+
+def serve_stdin(max_jobs=0):
+    print(json.dumps({"ready": True, "generators": sorted(GENERATORS)}), flush=True)
+
+    processed = 0
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        print(handle_line(line), flush=True)
+
+        processed += 1
+        if max_jobs and processed >= max_jobs:
+            break
+
+class ReportJobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw in self.rfile:
+            line = raw.decode('utf-8').strip()
+            if not line:
+                continue
+
+            self.wfile.write((handle_line(line) + "\n").encode('utf-8'))
+            self.wfile.flush()
+
+class ReportWorkerServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    allow_reuse_address = True
+
+def serve_socket(socket_path):
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    with ReportWorkerServer(socket_path, ReportJobHandler) as server:
+        print(json.dumps({"ready": True, "socket": socket_path, "generators": sorted(GENERATORS)}), flush=True)
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+def main():
+    try:
+        args = sys.argv[1:]
+
+        if len(args) >= 2 and args[0] == "--socket":
+            serve_socket(args[1])
+        elif len(args) >= 2 and args[0] == "--max-jobs":
+            serve_stdin(int(args[1]))
+        elif len(args) == 0:
+            serve_stdin()
+        else:
+            raise ValueError("Usage: python reportWorker.py [--socket <path> | --max-jobs <n>]")
+
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "error": str(e)
+        }))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,22 @@
-import sys
-import json
-import os
 from datetime import datetime
-import openpyxl
 from openpyxl.chart import BarChart, PieChart, Reference
-from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
 from openpyxl.utils import get_column_letter
+from reportStyles import Font, PatternFill, Border, Side, Alignment
+from reportGenerator import ReportGenerator, SheetStage, run_cli
+from reportInput import load_report_input
 
-class TaskAnalyticsChartGenerator:
-    def __init__(self):
-        self.primary_color = "1E3A8A"
-        self.secondary_color = "3B82F6"
-        self.success_color = "10B981"
-        self.warning_color = "F59E0B"
-        self.danger_color = "EF4444"
+class TaskAnalyticsChartGenerator(ReportGenerator):
+    stages = [
+        SheetStage('create_cover_sheet'),
+        SheetStage('create_executive_summary'),
+        SheetStage('create_performance_sheet'),
+        SheetStage('create_insights_sheet'),
+        SheetStage('create_recommendations_sheet')
+    ]
+    
+    def __init__(self, engine=None):
+        super().__init__(engine)
         self.purple_color = "8B5CF6"
-        self.light_bg = "F3F4F6"
-        self.header_bg = "1E40AF"
-        
-    def create_workbook_with_charts(self, data, output_path):
-        wb = openpyxl.Workbook()
-        self.create_cover_sheet(wb, data)
-        self.create_executive_summary(wb, data)
-        self.create_performance_sheet(wb, data)
-        self.create_insights_sheet(wb, data)
-        self.create_recommendations_sheet(wb, data)
-        
-        if 'Sheet' in wb.sheetnames:
-            wb.remove(wb['Sheet'])
-        
-        wb.save(output_path)
-        return output_path
     
     def create_cover_sheet(self, wb, data):
         ws = wb.create_sheet("Dashboard Overview", 0)
@@ -706,35 +692,23 @@ class TaskAnalyticsChartGenerator:
         ws.column_dimensions['E'].width = 20
         ws.column_dimensions['F'].width = 20
 
-def main():
-    try:
-        if len(sys.argv) != 3:
-            raise ValueError("Usage: python taskAnalyticsChartGenerator.py <input_json_path> <output_excel_path>")
-        
-        input_path = sys.argv[1]
-        output_path = sys.argv[2]
-        
-        if not os.path.exists(input_path):
-            raise FileNotFoundError(f"Input file not found: {input_path}")
-        
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        generator = TaskAnalyticsChartGenerator()
-        result_path = generator.create_workbook_with_charts(data, output_path)
-        
-        print(json.dumps({
-            "success": True,
-            "output_path": result_path,
-            "message": "Task performance analytics dashboard created successfully"
-        }))
+def create_report(data, output_path, engine=None):
+    generator = TaskAnalyticsChartGenerator(engine=engine)
+    result_path = generator.create_workbook(data, output_path)
+    
+    return {
+        "success": True,
+        "output_path": result_path,
+        "message": "Task performance analytics dashboard created successfully"
+    }
+
+def generate_report(input_path, output_path, engine=None):
+    data = load_report_input(input_path)
     
-    except Exception as e:
-        print(json.dumps({
-            "success": False,
-            "error": str(e)
-        }))
-        sys.exit(1)
+    return create_report(data, output_path, engine)
+
+def main():
+    run_cli("taskAnalyticsChartGenerator.py", generate_report)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file